@@ -1 +1,10 @@
-from .database import create_connection, execute_query, fetch_results
\ No newline at end of file
+from .database import (
+    create_connection, create_read_connection, execute_query, fetch_results, fetch_iter,
+    get_pool, get_backend, dispose_pools, pool_stats, replica_stats, use_primary, read_your_writes,
+    request_scope, ReadYourWritesMiddleware,
+    execute_many, bulk_insert, bulk_upsert, transaction, get_transaction, Transaction,
+)
+from .async_database import (
+    execute_query as async_execute_query, fetch_results as async_fetch_results,
+    transaction as async_transaction, read_session as async_read_session,
+)
@@ -0,0 +1,320 @@
+"""
+Async counterpart of ``app.database.database`` for ``async def`` route handlers.
+
+Uses a native asyncio MySQL pool (aiomysql) when the driver is installed.
+Without it, queries run through the synchronous connection pool on a
+dedicated thread executor sized to the pool, so database waits never occupy
+FastAPI's shared request threadpool.
+"""
+
+import asyncio
+import contextvars
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from app.database import database, instrumentation
+from app.database.instrumentation import track
+from app.database.pool import PoolTimeout
+
+try:
+    import aiomysql
+except Exception:
+    aiomysql = None
+
+
+# Connections one request may hold at once when it runs independent queries concurrently
+DB_REQUEST_CONCURRENCY = int(os.getenv("DB_REQUEST_CONCURRENCY", "2"))
+
+_async_pools = {}
+_async_pools_loop = None
+_async_pool_lock = None
+_executor = None
+
+
+def _use_native_driver():
+    # The SQLite backend has no native async driver; it always goes through the thread executor
+    return (
+        aiomysql is not None
+        and os.getenv("DB_ASYNC_DRIVER", "aiomysql").lower() == "aiomysql"
+        and database.get_backend() == "mysql"
+    )
+
+
+async def get_async_pool(target="primary"):
+    """Return the aiomysql pool for ``target`` bound to the running event loop, creating it on first use."""
+    global _async_pools_loop, _async_pool_lock
+    loop = asyncio.get_running_loop()
+    if _async_pools_loop is not loop:
+        _async_pools.clear()
+        _async_pool_lock = asyncio.Lock()
+        _async_pools_loop = loop
+    pool = _async_pools.get(target)
+    if pool is not None:
+        return pool
+    async with _async_pool_lock:
+        if target not in _async_pools:
+            cfg = database._target_config(target)
+            pool_cfg = database._get_pool_config()
+            _async_pools[target] = await aiomysql.create_pool(
+                host=cfg.get("host"),
+                port=int(cfg.get("port") or 3306),
+                user=cfg.get("user"),
+                password=cfg.get("password") or "",
+                db=cfg.get("database"),
+                minsize=1,
+                maxsize=pool_cfg["size"] + pool_cfg["max_overflow"],
+                pool_recycle=pool_cfg["recycle"] or -1,
+                connect_timeout=cfg.get("connect_timeout") or 10,
+            )
+        return _async_pools[target]
+
+
+async def _discard_pool(name):
+    """Take ``name``'s pool out of use and close its connections (in-use ones close on release)."""
+    pool = _async_pools.pop(name, None)
+    if pool is not None:
+        pool.close()
+        # Waiting for borrowed connections must not hold up this read's fallback
+        asyncio.ensure_future(pool.wait_closed())
+
+
+async def _acquire(pool):
+    """``pool.acquire()`` bounded by DB_POOL_TIMEOUT; raises ``PoolTimeout`` like the sync pool."""
+    timeout = database._get_pool_config()["timeout"]
+    try:
+        return await asyncio.wait_for(pool.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise PoolTimeout(f"Async connection pool exhausted (timeout {timeout}s)") from None
+
+
+async def _acquire_for_read():
+    """Return (pool, connection) for a read, preferring a healthy replica.
+
+    Mirrors ``database.create_read_connection``: replicas that fail are taken
+    out of rotation and the read falls back to the primary.
+    """
+    router = database.get_replica_router()
+    if router is not None and not database._reads_on_primary():
+        for name in router.candidates():
+            try:
+                pool = await get_async_pool(name)
+                conn = await _acquire(pool)
+            except PoolTimeout:
+                # Saturated, not broken: try the next replica
+                continue
+            except Exception as e:
+                print(f"Replica {name} unavailable, falling back: {e}")
+                router.mark_down(name, e)
+                await _discard_pool(name)
+                continue
+            router.record_read(name)
+            return pool, conn
+        router.record_fallback()
+    pool = await get_async_pool()
+    return pool, await _acquire(pool)
+
+
+async def close_async_pool():
+    """Close the async pools (call from the application shutdown hook)."""
+    pools = list(_async_pools.values())
+    _async_pools.clear()
+    for pool in pools:
+        pool.close()
+        await pool.wait_closed()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        cfg = database._get_pool_config()
+        _executor = ThreadPoolExecutor(
+            max_workers=cfg["size"] + cfg["max_overflow"], thread_name_prefix="db"
+        )
+    return _executor
+
+
+# A "%" that does not start a placeholder is literal; the sync driver sends it
+# unchanged, so PyMySQL (which interpolates with "%") must see it doubled
+_LITERAL_PERCENT_RE = re.compile(r"%(?!s)")
+_LITERAL_PERCENT_MAPPING_RE = re.compile(r"%(?!\([^)]+\)s)")
+
+
+def _escape_literal_percents(query, values):
+    """Make PyMySQL send ``query`` as mysql.connector would, e.g. DATE_FORMAT('%Y-%m') or LIKE 'a%%'.
+
+    Only ``%s`` (``%(name)s`` with mapping values) are placeholders; every
+    other ``%``, including each one of a ``%%``, is doubled.
+    """
+    if values is None:
+        return query
+    pattern = _LITERAL_PERCENT_MAPPING_RE if isinstance(values, dict) else _LITERAL_PERCENT_RE
+    return pattern.sub("%%", query)
+
+
+async def _run_sync(func, *args):
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context so per-request query counting sees these statements
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_get_executor(), ctx.run, func, *args)
+
+
+async def execute_query(query, values=None):
+    """Execute a modifying query and return the last inserted id (if any)."""
+    if not _use_native_driver():
+        return await _run_sync(database.execute_query, query, values)
+    # Later reads in this request must see this write, so keep them on the primary
+    database._mark_write()
+    pool = await get_async_pool()
+    start = time.perf_counter()
+    try:
+        conn = await _acquire(pool)
+        instrumentation.record_acquire(time.perf_counter() - start)
+        try:
+            async with conn.cursor() as cursor:
+                with track(query) as t:
+                    await cursor.execute(_escape_literal_percents(query, values), values)
+                    t.rows = cursor.rowcount
+                await conn.commit()
+                return cursor.lastrowid
+        finally:
+            pool.release(conn)
+    except aiomysql.Error as e:
+        print(f"Query execution error: {e}")
+        raise
+
+
+async def fetch_results(query, values=None):
+    """Execute a select query and return rows as list of dictionaries."""
+    if not _use_native_driver():
+        return await _run_sync(database.fetch_results, query, values)
+    start = time.perf_counter()
+    try:
+        pool, conn = await _acquire_for_read()
+        instrumentation.record_acquire(time.perf_counter() - start)
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                with track(query) as t:
+                    await cursor.execute(_escape_literal_percents(query, values), values)
+                    rows = await cursor.fetchall()
+                    t.rows = len(rows)
+        finally:
+            # Close the implicit read transaction (or the failed one) before the connection goes back to the pool.
+            try:
+                await conn.rollback()
+            except Exception:
+                conn.close()
+            pool.release(conn)
+        return list(rows)
+    except aiomysql.Error as e:
+        print(f"Error fetching results: {e}")
+        raise
+
+
+async def gather_queries(*queries, limit=None):
+    """``asyncio.gather`` for one request's independent queries, running at most
+    ``limit`` (DB_REQUEST_CONCURRENCY) at a time so a single request cannot drain the pool."""
+    semaphore = asyncio.Semaphore(max(1, limit or DB_REQUEST_CONCURRENCY))
+
+    async def run(query):
+        async with semaphore:
+            return await query
+
+    return await asyncio.gather(*(run(q) for q in queries))
+
+
+class AsyncTransaction:
+    """Async unit of work on one connection; see ``transaction()``."""
+
+    def __init__(self, conn=None, sync_tx=None):
+        self._conn = conn
+        self._sync_tx = sync_tx
+
+    async def execute(self, query, values=None):
+        """Execute a modifying query and return the last inserted id (if any)."""
+        if self._sync_tx is not None:
+            return await _run_sync(self._sync_tx.execute, query, values)
+        async with self._conn.cursor() as cursor:
+            with track(query) as t:
+                await cursor.execute(_escape_literal_percents(query, values), values)
+                t.rows = cursor.rowcount
+            return cursor.lastrowid
+
+    async def fetch(self, query, values=None):
+        """Execute a select query and return rows as list of dictionaries."""
+        if self._sync_tx is not None:
+            return await _run_sync(self._sync_tx.fetch, query, values)
+        async with self._conn.cursor(aiomysql.DictCursor) as cursor:
+            with track(query) as t:
+                await cursor.execute(_escape_literal_percents(query, values), values)
+                rows = list(await cursor.fetchall())
+                t.rows = len(rows)
+            return rows
+
+
+@asynccontextmanager
+async def read_session():
+    """Run several read-only queries on one connection.
+
+    The connection is chosen like ``fetch_results`` picks one (a healthy
+    replica when configured, unless this request already wrote), the request
+    is not marked as having written and nothing is committed: the implicit
+    read transaction is rolled back before the connection goes back to the
+    pool. Use ``transaction()`` for anything that writes.
+    """
+    if not _use_native_driver():
+        conn = await _run_sync(database.create_read_connection)
+        try:
+            yield AsyncTransaction(sync_tx=database.Transaction(conn))
+        finally:
+            try:
+                await _run_sync(conn.rollback)
+            finally:
+                await _run_sync(conn.close)
+        return
+    start = time.perf_counter()
+    pool, conn = await _acquire_for_read()
+    instrumentation.record_acquire(time.perf_counter() - start)
+    try:
+        yield AsyncTransaction(conn=conn)
+    finally:
+        try:
+            await conn.rollback()
+        except Exception:
+            conn.close()
+        pool.release(conn)
+
+
+@asynccontextmanager
+async def transaction():
+    """Async counterpart of ``database.transaction()``.
+
+    Statements issued through the yielded ``AsyncTransaction`` share one
+    connection and are committed once on exit (rolled back on error).
+    """
+    database._mark_write()
+    if not _use_native_driver():
+        conn = await _run_sync(database.create_connection)
+        try:
+            yield AsyncTransaction(sync_tx=database.Transaction(conn))
+            await _run_sync(conn.commit)
+        except BaseException:
+            await _run_sync(conn.rollback)
+            raise
+        finally:
+            await _run_sync(conn.close)
+        return
+    pool = await get_async_pool()
+    start = time.perf_counter()
+    conn = await _acquire(pool)
+    instrumentation.record_acquire(time.perf_counter() - start)
+    try:
+        yield AsyncTransaction(conn=conn)
+        await conn.commit()
+    except BaseException:
+        await conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
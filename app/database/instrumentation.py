@@ -0,0 +1,199 @@
+"""
+Query instrumentation for the HR Management database layer.
+
+Records per-statement latency and row counts grouped by a normalized query
+fingerprint, connection-acquire time, a slow-query log, and a per-request
+query counter that flags handlers issuing too many statements (N+1 patterns).
+Aggregates are exposed through ``snapshot()`` for the admin endpoint.
+"""
+
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("app.database.queries")
+
+# Statements slower than this many milliseconds are written to the slow-query log
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# Requests issuing more than this many statements are flagged as possible N+1 patterns
+QUERY_COUNT_WARN = int(os.getenv("DB_QUERY_COUNT_WARN", "5"))
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\([A-Za-z_]\w*\)s")
+_ROW_GROUP = r"\(\s*\?(?:\s*,\s*\?)*\s*\)"
+_MULTI_ROW_RE = re.compile(rf"({_ROW_GROUP})(?:\s*,\s*{_ROW_GROUP})+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(query):
+    """Normalize a statement so executions differing only in literals group together.
+
+    Literals and placeholders become ``?``, IN-lists collapse to ``IN (?)``
+    and multi-row VALUES lists collapse to a single row.
+    """
+    fp = _STRING_RE.sub("?", query)
+    fp = _PLACEHOLDER_RE.sub("?", fp)
+    fp = _NUMBER_RE.sub("?", fp)
+    fp = _SPACE_RE.sub(" ", fp).strip().rstrip(";").strip()
+    fp = _IN_LIST_RE.sub("IN (?)", fp)
+    fp = _MULTI_ROW_RE.sub(r"\1", fp)
+    return fp
+
+
+class QueryStats:
+    """Thread-safe aggregates of statement timings, connection acquires and flagged requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}
+            self._acquire = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            self._flagged = {}
+            self._slow = 0
+
+    def record_query(self, query, elapsed_ms, rows=None, error=False):
+        fp = fingerprint(query)
+        with self._lock:
+            entry = self._queries.get(fp)
+            if entry is None:
+                entry = self._queries[fp] = {
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "errors": 0, "slow": 0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += rows or 0
+            if error:
+                entry["errors"] += 1
+            if elapsed_ms >= SLOW_QUERY_MS:
+                entry["slow"] += 1
+                self._slow += 1
+        return fp
+
+    def record_acquire(self, elapsed_ms):
+        with self._lock:
+            self._acquire["count"] += 1
+            self._acquire["total_ms"] += elapsed_ms
+            self._acquire["max_ms"] = max(self._acquire["max_ms"], elapsed_ms)
+
+    def record_request(self, handler, queries):
+        with self._lock:
+            entry = self._flagged.setdefault(handler, {"requests": 0, "max_queries": 0, "total_queries": 0})
+            entry["requests"] += 1
+            entry["total_queries"] += queries
+            entry["max_queries"] = max(entry["max_queries"], queries)
+
+    def snapshot(self, top=None, order_by="total_ms"):
+        """Return aggregates; queries sorted by ``order_by`` (descending), limited to ``top``."""
+        with self._lock:
+            queries = [
+                {"fingerprint": fp, **entry, "avg_ms": entry["total_ms"] / entry["count"]}
+                for fp, entry in self._queries.items()
+            ]
+            acquire = dict(self._acquire)
+            flagged = {handler: dict(entry) for handler, entry in self._flagged.items()}
+            slow = self._slow
+        queries.sort(key=lambda q: q.get(order_by, 0), reverse=True)
+        if top is not None:
+            queries = queries[:top]
+        acquire["avg_ms"] = acquire["total_ms"] / acquire["count"] if acquire["count"] else 0.0
+        return {
+            "slow_query_ms": SLOW_QUERY_MS,
+            "query_count_warn": QUERY_COUNT_WARN,
+            "slow_queries": slow,
+            "connection_acquire": acquire,
+            "queries": queries,
+            "flagged_handlers": flagged,
+        }
+
+
+stats = QueryStats()
+
+# Per-request query counter, set by QueryCountMiddleware
+_request_counter = contextvars.ContextVar("db_request_counter", default=None)
+
+
+class _RequestCounter:
+    __slots__ = ("queries",)
+
+    def __init__(self):
+        self.queries = 0
+
+
+class _Tracker:
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = None
+
+
+@contextmanager
+def track(query):
+    """Time one statement; set ``.rows`` on the yielded tracker to record rows returned/affected."""
+    tracker = _Tracker()
+    counter = _request_counter.get()
+    if counter is not None:
+        counter.queries += 1
+    start = time.perf_counter()
+    error = False
+    try:
+        yield tracker
+    except BaseException:
+        error = True
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        fp = stats.record_query(query, elapsed_ms, tracker.rows, error)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms, rows=%s): %s", elapsed_ms, tracker.rows, fp)
+
+
+def record_acquire(elapsed_seconds):
+    """Record how long checking out a connection took."""
+    stats.record_acquire(elapsed_seconds * 1000)
+
+
+def snapshot(top=None, order_by="total_ms"):
+    return stats.snapshot(top=top, order_by=order_by)
+
+
+def reset():
+    stats.reset()
+
+
+class QueryCountMiddleware:
+    """ASGI middleware counting statements per HTTP request.
+
+    Requests issuing more than ``QUERY_COUNT_WARN`` statements are logged and
+    aggregated per route in ``snapshot()["flagged_handlers"]``. Statements run
+    while a streaming response body is being sent are included.
+    """
+
+    def __init__(self, app, threshold=None):
+        self.app = app
+        self.threshold = QUERY_COUNT_WARN if threshold is None else threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = _RequestCounter()
+        token = _request_counter.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_counter.reset(token)
+            if counter.queries > self.threshold:
+                route = scope.get("route")
+                handler = f"{scope.get('method')} {getattr(route, 'path', scope.get('path'))}"
+                stats.record_request(handler, counter.queries)
+                logger.warning("%s issued %d queries (threshold %d)", handler, counter.queries, self.threshold)
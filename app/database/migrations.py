@@ -0,0 +1,189 @@
+"""
+Versioned schema migrations for the HR Management database.
+
+Each migration is a numbered list of statements. Applied versions are
+recorded in the ``schema_migrations`` table so ``migrate()`` only runs
+pending ones. ``explain_hot_queries()`` runs EXPLAIN on the queries the
+routers issue most often and reports any that fall back to a full table scan.
+Run both through ``scripts/migrate.py``.
+"""
+
+import datetime
+
+import mysql.connector
+
+# MySQL error raised when an index with the same name already exists
+ER_DUP_KEYNAME = 1061
+
+
+class MigrationError(Exception):
+    """Raised when a migration statement fails."""
+
+
+MIGRATIONS = [
+    (
+        1,
+        "Covering indexes for hot router queries",
+        [
+            # get_current_user / login: SELECT * FROM users WHERE email = %s
+            "CREATE INDEX idx_users_email ON users (email)",
+            # read_users_me: SELECT id, role, email FROM employee WHERE email = %s
+            "CREATE INDEX idx_employee_email_role ON employee (email, role)",
+            # get_manager_team / team analytics: WHERE e.manager_id = %s
+            "CREATE INDEX idx_employee_manager ON employee (manager_id)",
+            # get_feedback_for_employee: WHERE employee_id = %s ORDER BY feedback_date DESC
+            "CREATE INDEX idx_feedback_employee_date ON feedback (employee_id, feedback_date)",
+            # analytics monthly feedback: date-range filter + AVG(sentiment_score)
+            "CREATE INDEX idx_feedback_date_score ON feedback (feedback_date, sentiment_score)",
+            # analytics active/upcoming trainings: start_date / end_date ranges
+            "CREATE INDEX idx_training_dates ON training (start_date, end_date)",
+            # ML skill resolution: WHERE preferred_label IN (...)
+            "CREATE INDEX idx_skill_label ON skill (preferred_label)",
+            # suggested-skills: WHERE employee_id = %s ORDER BY recommendation_score DESC
+            "CREATE INDEX idx_skill_need_employee_score ON skill_need (employee_id, recommendation_score)",
+            # employee skills / recommender proficiency lookup
+            "CREATE INDEX idx_employee_skill_cover ON employee_skill (employee_id, skill_id, proficiency_level)",
+            # employee trainings and participants-per-training counts
+            "CREATE INDEX idx_employee_training_employee ON employee_training (employee_id, training_id)",
+            "CREATE INDEX idx_employee_training_training ON employee_training (training_id, employee_id)",
+        ],
+    ),
+    (
+        2,
+        "Shared token revocation counters",
+        [
+            # app.token_revocation: one row per revoked subject, '*' holds the global epoch
+            "CREATE TABLE IF NOT EXISTS token_revocation ("
+            "subject VARCHAR(255) PRIMARY KEY, version INT NOT NULL DEFAULT 0)",
+        ],
+    ),
+]
+
+
+# (name, query, params) for the statements routers issue on hot paths
+HOT_QUERIES = [
+    ("auth.get_current_user", "SELECT * FROM users WHERE email = %s", ("probe@example.com",)),
+    ("auth.read_users_me", "SELECT id, role, email FROM employee WHERE email = %s", ("probe@example.com",)),
+    ("manager.get_manager_team", "SELECT * FROM employee WHERE manager_id = %s", (1,)),
+    (
+        "feedback.get_feedback_for_employee",
+        "SELECT * FROM feedback WHERE employee_id = %s ORDER BY feedback_date DESC",
+        (1,),
+    ),
+    (
+        "employee.get_suggested_skills",
+        "SELECT s.id, s.preferred_label, s.skill_type, sn.recommendation_score FROM skill_need sn "
+        "JOIN skill s ON sn.skill_id = s.id WHERE sn.employee_id = %s ORDER BY sn.recommendation_score DESC",
+        (1,),
+    ),
+    (
+        "employee.get_employee_skills",
+        "SELECT s.id, s.preferred_label, es.proficiency_level FROM employee_skill es "
+        "JOIN skill s ON es.skill_id = s.id WHERE es.employee_id = %s",
+        (1,),
+    ),
+    (
+        "training.get_employee_training",
+        "SELECT t.id, t.title, t.start_date, t.end_date, t.category FROM training t "
+        "INNER JOIN employee_training et ON t.id = et.training_id WHERE et.employee_id = %s",
+        (1,),
+    ),
+    (
+        "analytics.active_trainings",
+        "SELECT COUNT(*) AS count FROM training WHERE start_date <= CURDATE() AND end_date >= CURDATE()",
+        None,
+    ),
+    ("employee.skill_label_lookup", "SELECT id, preferred_label FROM skill WHERE preferred_label IN (%s, %s)", ("a", "b")),
+]
+
+
+def ensure_version_table(conn):
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255),
+            applied_at DATETIME
+        )
+        """
+    )
+    conn.commit()
+    cursor.close()
+
+
+def applied_versions(conn):
+    """Return the set of migration versions already applied."""
+    ensure_version_table(conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    return versions
+
+
+def pending_migrations(conn, target=None):
+    done = applied_versions(conn)
+    return [
+        m for m in sorted(MIGRATIONS, key=lambda m: m[0])
+        if m[0] not in done and (target is None or m[0] <= target)
+    ]
+
+
+def migrate(conn, target=None, log=print):
+    """Apply pending migrations (up to ``target``) in order; return the applied versions.
+
+    An index that already exists (e.g. added by hand) is treated as applied.
+    Any other failure stops the run with ``MigrationError`` before the version
+    is recorded, so the migration is retried next time.
+    """
+    applied = []
+    for version, description, statements in pending_migrations(conn, target):
+        log(f"Applying migration {version}: {description}")
+        cursor = conn.cursor()
+        try:
+            for sql in statements:
+                try:
+                    cursor.execute(sql)
+                except mysql.connector.Error as e:
+                    if getattr(e, "errno", None) == ER_DUP_KEYNAME:
+                        log(f"  already present, skipping: {sql}")
+                        continue
+                    raise MigrationError(f"Migration {version} failed on {sql!r}: {e}") from e
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (%s, %s, %s)",
+                (version, description, datetime.datetime.utcnow()),
+            )
+            conn.commit()
+        finally:
+            cursor.close()
+        applied.append(version)
+    return applied
+
+
+def explain_hot_queries(conn, strict=False):
+    """EXPLAIN every hot query and return the plan rows that scan a whole table.
+
+    A row with access ``type`` ``ALL`` and no ``possible_keys`` means no index
+    can serve the query. With ``strict=True`` any ``ALL`` row is reported, even
+    when the optimizer skipped an available index (common on tiny tables).
+    """
+    problems = []
+    cursor = conn.cursor(dictionary=True)
+    try:
+        for name, query, params in HOT_QUERIES:
+            cursor.execute(f"EXPLAIN {query}", params)
+            for row in cursor.fetchall():
+                row = {k.lower(): v for k, v in row.items()}
+                if row.get("type") != "ALL":
+                    continue
+                if strict or not row.get("possible_keys"):
+                    problems.append({
+                        "query": name,
+                        "table": row.get("table"),
+                        "possible_keys": row.get("possible_keys"),
+                        "rows": row.get("rows"),
+                    })
+    finally:
+        cursor.close()
+    return problems
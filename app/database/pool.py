@@ -0,0 +1,223 @@
+"""
+Process-wide connection pool for the HR Management database layer.
+
+Connections are opened lazily up to ``size`` (plus ``max_overflow`` temporary
+connections under bursts), health-checked on checkout, recycled after
+``recycle`` seconds and handed out wrapped in a ``PooledConnection`` whose
+``close()`` returns the connection to the pool instead of closing the socket.
+"""
+
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class PoolTimeout(mysql.connector.errors.PoolError):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class PooledConnection:
+    """Thin proxy around a driver connection; ``close()`` releases it to the pool."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise mysql.connector.errors.InterfaceError("Connection already returned to the pool")
+        return getattr(raw, name)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Safety net for call sites that forget to close: never leak a slot.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of database connections.
+
+    Args:
+        connect: zero-argument callable returning a new driver connection.
+        size: number of idle connections kept open between requests.
+        max_overflow: extra connections allowed beyond ``size`` under load;
+            they are closed instead of kept once released.
+        timeout: seconds to wait for a free connection before raising ``PoolTimeout``.
+        recycle: maximum connection lifetime in seconds (``0`` disables).
+        pre_ping: check that an idle connection is still alive before handing it out.
+    """
+
+    def __init__(self, connect, size=5, max_overflow=10, timeout=30.0, recycle=1800, pre_ping=True):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max(0, max_overflow)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self._idle = deque()
+        self._open = 0
+        self._checked_out = 0
+        self._cond = threading.Condition()
+        # Set by dispose(): connections released afterwards are closed, not kept idle
+        self._disposed = False
+        self._counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+        }
+
+    # --- checkout / release ---
+    def acquire(self, timeout=None):
+        """Check out a connection, opening a new one if the pool has room."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            raw, created_at = self._checkout_slot(deadline)
+            if raw is None:
+                raw, created_at = self._open_new()
+            elif not self._is_usable(raw, created_at):
+                self._discard(raw)
+                raw, created_at = self._open_new()
+            if raw is not None:
+                with self._cond:
+                    self._counters["checkouts"] += 1
+                return PooledConnection(self, raw, created_at)
+
+    def _checkout_slot(self, deadline):
+        """Reserve a slot; return an idle connection or (None, None) to open a new one."""
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    self._checked_out += 1
+                    return raw, created_at
+                if self._open < self.size + self.max_overflow:
+                    self._open += 1
+                    self._checked_out += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"Connection pool exhausted ({self._open} open, timeout {self.timeout}s)"
+                    )
+                self._counters["waits"] += 1
+                self._cond.wait(remaining)
+
+    def _open_new(self):
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["connections_created"] += 1
+        return raw, time.monotonic()
+
+    def _is_usable(self, raw, created_at):
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._cond:
+                self._counters["recycled"] += 1
+            return False
+        if self.pre_ping:
+            try:
+                alive = raw.is_connected()
+            except Exception:
+                alive = False
+            if not alive:
+                with self._cond:
+                    self._counters["ping_failures"] += 1
+                return False
+        return True
+
+    def _discard(self, raw):
+        """Close a connection that is leaving the pool but keep its slot reserved."""
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._counters["connections_closed"] += 1
+
+    def _release(self, raw, created_at):
+        # End any open transaction so the next borrower starts from a clean snapshot.
+        healthy = True
+        try:
+            raw.rollback()
+        except Exception:
+            healthy = False
+        expired = bool(self.recycle) and time.monotonic() - created_at > self.recycle
+        with self._cond:
+            self._checked_out -= 1
+            if healthy and not expired and not self._disposed and len(self._idle) < self.size:
+                self._idle.append((raw, created_at))
+                self._cond.notify()
+                return
+            self._open -= 1
+            self._counters["connections_closed"] += 1
+            self._cond.notify()
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # --- maintenance ---
+    def dispose(self):
+        """Close every idle connection; checked-out connections close on release."""
+        with self._cond:
+            self._disposed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._counters["connections_closed"] += len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        """Return a snapshot of pool configuration, occupancy and counters."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "timeout": self.timeout,
+                "recycle": self.recycle,
+                "open": self._open,
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "overflow": max(0, self._open - self.size),
+                **self._counters,
+            }
@@ -0,0 +1,86 @@
+"""
+Read-replica selection for the HR Management database layer.
+
+``ReplicaRouter`` orders healthy replicas for each read (round-robin or
+least-loaded), takes replicas that fail to connect out of rotation for a
+cooldown period, and keeps per-replica counters for the admin stats.
+"""
+
+import itertools
+import threading
+import time
+
+
+class ReplicaRouter:
+    """Chooses which replica serves a read.
+
+    Args:
+        names: replica target names (``replica-0``, ``replica-1``, ...).
+        strategy: ``round_robin`` or ``least_loaded``.
+        cooldown: seconds a failed replica stays out of rotation.
+        load: callable ``name -> int`` returning in-flight connections, used by ``least_loaded``.
+    """
+
+    STRATEGIES = ("round_robin", "least_loaded")
+
+    def __init__(self, names, strategy="round_robin", cooldown=30.0, load=None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}; use one of {self.STRATEGIES}")
+        self.names = list(names)
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self._load = load
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._down_until = {}
+        self._reads = {name: 0 for name in self.names}
+        self._failures = {name: 0 for name in self.names}
+        self._last_error = {}
+        self._fallbacks = 0
+
+    def candidates(self):
+        """Return healthy replicas in the order they should be tried."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [n for n in self.names if self._down_until.get(n, 0) <= now]
+        if not healthy:
+            return []
+        if self.strategy == "least_loaded" and self._load is not None:
+            return sorted(healthy, key=self._load)
+        start = next(self._next) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def record_read(self, name):
+        with self._lock:
+            self._reads[name] += 1
+            self._down_until.pop(name, None)
+
+    def mark_down(self, name, error=None):
+        """Take a replica out of rotation for ``cooldown`` seconds."""
+        with self._lock:
+            self._failures[name] += 1
+            self._down_until[name] = time.monotonic() + self.cooldown
+            if error is not None:
+                self._last_error[name] = str(error)
+
+    def record_fallback(self):
+        """Count a read that went to the primary because no replica was available."""
+        with self._lock:
+            self._fallbacks += 1
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "primary_fallbacks": self._fallbacks,
+                "replicas": {
+                    name: {
+                        "healthy": self._down_until.get(name, 0) <= now,
+                        "reads": self._reads[name],
+                        "failures": self._failures[name],
+                        "last_error": self._last_error.get(name),
+                    }
+                    for name in self.names
+                },
+            }
@@ -0,0 +1,357 @@
+"""
+Embedded SQLite backend for the HR Management database layer.
+
+Lets the whole API run in-process against a local SQLite file (for example
+``DATABASE_URL=sqlite:///data/hr_bench.db``) for profiling and regression
+benchmarks without a MySQL server. Connections and cursors mimic the parts
+of the mysql.connector API the app uses (``cursor(dictionary=True)``, ``%s``
+placeholders, ``lastrowid``, ``fetchmany``) and raise mysql.connector error
+types so existing ``except mysql.connector.Error`` handlers keep working.
+
+Queries are translated from the MySQL dialect on the fly: ``%s`` placeholders,
+``CURDATE()``/``NOW()``, ``DATE_FORMAT``, ``CONCAT``, ``GROUP_CONCAT(... ORDER BY)``,
+``INSERT IGNORE`` and ``ON DUPLICATE KEY UPDATE``.
+"""
+
+import datetime
+import decimal
+import re
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+
+import mysql.connector
+
+# ORDER BY inside aggregate calls is only understood by SQLite >= 3.44
+_AGGREGATE_ORDER_BY = sqlite3.sqlite_version_info >= (3, 44, 0)
+
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+
+# --- dialect translation ---
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_TOKEN_RE = re.compile("\x00(\\d+)\x00")
+_FUNC_RE = re.compile(r"\b(CONCAT|DATE_FORMAT|GROUP_CONCAT|CURDATE|NOW)\s*\(", re.IGNORECASE)
+_ON_DUPLICATE_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$", re.IGNORECASE | re.DOTALL)
+_VALUES_FUNC_RE = re.compile(r"\bVALUES\s*\(\s*(\w+)\s*\)", re.IGNORECASE)
+_INSERT_IGNORE_RE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+_ORDER_BY_RE = re.compile(r"\s+ORDER\s+BY\s+.*$", re.IGNORECASE | re.DOTALL)
+_SEPARATOR_RE = re.compile(r"\s+SEPARATOR\s+(\x00\d+\x00)\s*$", re.IGNORECASE)
+
+# MySQL DATE_FORMAT specifiers -> SQLite strftime specifiers
+_DATE_FORMAT_MAP = {"%i": "%M", "%s": "%S", "%e": "%d", "%c": "%m", "%k": "%H", "%T": "%H:%M:%S"}
+
+
+def _split_args(text):
+    """Split a call's argument text on top-level commas (string literals are already masked)."""
+    args, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return [a for a in args if a] if len(args) == 1 else args
+
+
+def _matching_paren(text, open_idx):
+    depth = 0
+    for i in range(open_idx, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise mysql.connector.errors.ProgrammingError(msg="Unbalanced parentheses in query")
+
+
+def _rewrite_call(name, args, literals):
+    name = name.upper()
+    if name == "CURDATE":
+        return "DATE('now', 'localtime')"
+    if name == "NOW":
+        return "DATETIME('now', 'localtime')"
+    if name == "CONCAT":
+        return "(" + " || ".join(args) + ")"
+    if name == "DATE_FORMAT":
+        fmt_token = _TOKEN_RE.fullmatch(args[1])
+        if fmt_token:
+            idx = int(fmt_token.group(1))
+            fmt = literals[idx]
+            for mysql_spec, sqlite_spec in _DATE_FORMAT_MAP.items():
+                fmt = fmt.replace(mysql_spec, sqlite_spec)
+            literals[idx] = fmt
+        return f"strftime({args[1]}, {args[0]})"
+    # GROUP_CONCAT([DISTINCT] expr [ORDER BY ...] [SEPARATOR 'x'])
+    expr = ", ".join(args)
+    separator = _SEPARATOR_RE.search(expr)
+    if separator:
+        expr = expr[:separator.start()]
+    if not _AGGREGATE_ORDER_BY:
+        expr = _ORDER_BY_RE.sub("", expr)
+    if separator:
+        expr = f"{expr}, {separator.group(1)}"
+    return f"group_concat({expr})"
+
+
+@lru_cache(maxsize=1024)
+def translate(query):
+    """Translate a MySQL-dialect statement with ``%s`` placeholders into SQLite SQL."""
+    literals = []
+
+    def mask(m):
+        literals.append(m.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    sql = _STRING_RE.sub(mask, query)
+    sql = sql.replace("%s", "?")
+    # Rewrite calls right to left so nested calls are handled before their parents
+    for m in reversed(list(_FUNC_RE.finditer(sql))):
+        open_idx = m.end() - 1
+        close_idx = _matching_paren(sql, open_idx)
+        args = _split_args(sql[open_idx + 1:close_idx])
+        sql = sql[:m.start()] + _rewrite_call(m.group(1), args, literals) + sql[close_idx + 1:]
+    sql = _INSERT_IGNORE_RE.sub("INSERT OR IGNORE", sql)
+    dup = _ON_DUPLICATE_RE.search(sql)
+    if dup:
+        updates = _VALUES_FUNC_RE.sub(r"excluded.\1", dup.group(1))
+        sql = sql[:dup.start()] + "ON CONFLICT DO UPDATE SET" + updates
+    return _TOKEN_RE.sub(lambda m: literals[int(m.group(1))], sql)
+
+
+# --- connection / cursor adapters ---
+@contextmanager
+def _mysql_errors():
+    """Re-raise sqlite3 errors as the matching mysql.connector error types."""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        raise mysql.connector.errors.IntegrityError(msg=str(e)) from e
+    except sqlite3.OperationalError as e:
+        raise mysql.connector.errors.OperationalError(msg=str(e)) from e
+    except sqlite3.ProgrammingError as e:
+        raise mysql.connector.errors.ProgrammingError(msg=str(e)) from e
+    except sqlite3.Error as e:
+        raise mysql.connector.errors.DatabaseError(msg=str(e)) from e
+
+
+def _params(values):
+    if values is None:
+        return ()
+    return tuple(values) if isinstance(values, list) else values
+
+
+class SQLiteCursor:
+    """Cursor returning tuples, or dictionaries when created with ``dictionary=True``."""
+
+    def __init__(self, conn, dictionary=False):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self._cursor.description or ())
+
+    def execute(self, query, values=None):
+        with _mysql_errors():
+            self._cursor.execute(translate(query), _params(values))
+
+    def executemany(self, query, rows):
+        with _mysql_errors():
+            self._cursor.executemany(translate(query), [_params(r) for r in rows])
+
+    def _convert(self, rows):
+        if not self._dictionary:
+            return rows
+        names = self.column_names
+        return [dict(zip(names, row)) for row in rows]
+
+    def fetchone(self):
+        with _mysql_errors():
+            row = self._cursor.fetchone()
+        return None if row is None else self._convert([row])[0]
+
+    def fetchmany(self, size=1):
+        with _mysql_errors():
+            return self._convert(self._cursor.fetchmany(size))
+
+    def fetchall(self):
+        with _mysql_errors():
+            return self._convert(self._cursor.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Subset of the mysql.connector connection API backed by sqlite3."""
+
+    def __init__(self, path, timeout=30.0):
+        with _mysql_errors():
+            self._conn = sqlite3.connect(
+                path,
+                timeout=timeout,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                check_same_thread=False,  # pooled connections move between threads
+                uri=path.startswith("file:"),
+            )
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._closed = False
+
+    def cursor(self, dictionary=False, buffered=None, **kwargs):
+        # sqlite3 cursors already stream rows lazily, so ``buffered`` is ignored
+        return SQLiteCursor(self._conn, dictionary=dictionary)
+
+    def commit(self):
+        with _mysql_errors():
+            self._conn.commit()
+
+    def rollback(self):
+        with _mysql_errors():
+            self._conn.rollback()
+
+    def is_connected(self):
+        return not self._closed
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._conn.close()
+
+
+def connect(path):
+    """Open a SQLite database file (or ``file:`` URI) as a mysql.connector-like connection."""
+    return SQLiteConnection(path)
+
+
+# Tables and indexes the app expects, in SQLite syntax (mirrors the MySQL schema and migrations)
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT,
+        hashed_password TEXT,
+        role TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS employee (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name TEXT,
+        last_name TEXT,
+        email TEXT,
+        hire_date DATE,
+        department TEXT,
+        job_title TEXT,
+        details TEXT,
+        hashed_password TEXT,
+        role TEXT DEFAULT 'employee',
+        manager_id INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS skill (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        preferred_label TEXT,
+        skill_type TEXT,
+        reuse_level TEXT,
+        alt_labels TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS employee_skill (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        skill_id INTEGER REFERENCES skill(id) ON DELETE CASCADE,
+        proficiency_level TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS skill_need (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        skill_id INTEGER REFERENCES skill(id) ON DELETE CASCADE,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        recommendation_score INTEGER DEFAULT 0,
+        UNIQUE (skill_id, employee_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS skill_feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        skill_id INTEGER REFERENCES skill(id) ON DELETE CASCADE,
+        vote TEXT,
+        feedback_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS training (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        description TEXT,
+        start_date DATE,
+        end_date DATE,
+        category TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS employee_training (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        training_id INTEGER REFERENCES training(id) ON DELETE CASCADE,
+        status TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS trainer_training (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        trainer_id INTEGER,
+        training_id INTEGER REFERENCES training(id) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS training_need (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        recommended_training_id INTEGER REFERENCES training(id) ON DELETE CASCADE,
+        recommendation_level INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER REFERENCES employee(id) ON DELETE CASCADE,
+        feedback_date DATE,
+        sentiment_score REAL,
+        comments TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS token_revocation (
+        subject TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)",
+    "CREATE INDEX IF NOT EXISTS idx_employee_email_role ON employee (email, role)",
+    "CREATE INDEX IF NOT EXISTS idx_employee_manager ON employee (manager_id)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_employee_date ON feedback (employee_id, feedback_date)",
+    "CREATE INDEX IF NOT EXISTS idx_feedback_date_score ON feedback (feedback_date, sentiment_score)",
+    "CREATE INDEX IF NOT EXISTS idx_training_dates ON training (start_date, end_date)",
+    "CREATE INDEX IF NOT EXISTS idx_skill_label ON skill (preferred_label)",
+    "CREATE INDEX IF NOT EXISTS idx_skill_need_employee_score ON skill_need (employee_id, recommendation_score)",
+    "CREATE INDEX IF NOT EXISTS idx_employee_skill_cover ON employee_skill (employee_id, skill_id, proficiency_level)",
+    "CREATE INDEX IF NOT EXISTS idx_employee_training_employee ON employee_training (employee_id, training_id)",
+    "CREATE INDEX IF NOT EXISTS idx_employee_training_training ON employee_training (training_id, employee_id)",
+]
+
+
+def create_schema(conn):
+    """Create all application tables and indexes on a SQLiteConnection."""
+    cursor = conn.cursor()
+    for sql in SCHEMA:
+        cursor.execute(sql)
+    conn.commit()
+    cursor.close()
@@ -0,0 +1,197 @@
+"""
+Streaming bulk import of employees from CSV or JSON Lines.
+
+The request body is consumed as it arrives and split into records, which are
+validated against the ``Employee`` model in chunks of ``IMPORT_CHUNK_SIZE``.
+Each chunk's default passwords are hashed in parallel in the bcrypt process
+pool and the valid rows are written with one multi-row INSERT inside a
+transaction, so only one chunk is ever held in memory. Rows that fail
+validation, repeat an email, or belong to a chunk whose hashing or insert
+failed are reported individually, and the import carries on with the next chunk.
+"""
+
+import codecs
+import csv
+import json
+import os
+
+import mysql.connector
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.database import bulk_insert, fetch_results, transaction
+from app.models.auth import hash_passwords
+from app.hashing_pool import HashingOverloaded
+
+# Rows validated, hashed and inserted together (one transaction per chunk)
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+# Per-row errors kept in the response; the counts are always complete
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+DEFAULT_PASSWORD = "1234"
+EMPLOYEE_COLUMNS = (
+    "first_name", "last_name", "email", "hire_date", "department", "job_title", "details", "hashed_password",
+)
+
+
+async def _lines(chunks):
+    """Decode an async stream of byte chunks into text lines (newline kept)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _csv_records(lines):
+    """Group lines into CSV records; a quoted field may span several lines."""
+    record = ""
+    quotes = 0
+    async for line in lines:
+        record += line
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield record
+            record, quotes = "", 0
+    if record:
+        yield record
+
+
+async def parse_rows(chunks, fmt):
+    """Yield ``(row_number, dict_or_error)`` for each record in a CSV or JSONL body.
+
+    CSV needs a header line naming the ``Employee`` fields. Row numbers are
+    1-based and count data rows only; blank lines are skipped.
+    """
+    lines = _lines(chunks)
+    if fmt == "jsonl":
+        number = 0
+        async for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+                yield number, row if isinstance(row, dict) else ValueError("expected a JSON object")
+            except ValueError as e:
+                yield number, e
+        return
+    header = None
+    number = 0
+    async for record in _csv_records(lines):
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield number, ValueError(f"expected {len(header)} columns, got {len(values)}")
+        else:
+            yield number, dict(zip(header, values))
+
+
+class ImportReport:
+    """Counts and per-row errors for one import."""
+
+    def __init__(self, max_errors=IMPORT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _existing_emails(emails):
+    if not emails:
+        return set()
+    placeholders = ", ".join(["%s"] * len(emails))
+    rows = fetch_results(f"SELECT email FROM employee WHERE email IN ({placeholders})", tuple(emails))
+    return {r["email"] for r in rows}
+
+
+def _import_chunk(chunk, seen_emails, report, employee_model):
+    """Validate, hash and insert one chunk of ``(row_number, dict_or_error)``."""
+    valid = []
+    for number, row in chunk:
+        if isinstance(row, Exception):
+            report.error(number, str(row))
+            continue
+        try:
+            employee = employee_model(**row)
+        except ValidationError as e:
+            report.error(number, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        email = employee.email.strip().lower()
+        if email in seen_emails:
+            report.error(number, f"duplicate email {employee.email} in file")
+            continue
+        seen_emails.add(email)
+        valid.append((number, employee))
+
+    existing = {e.lower() for e in _existing_emails([e.email for _, e in valid])}
+    rows = []
+    for number, employee in valid:
+        if employee.email.lower() in existing:
+            report.error(number, f"employee with email {employee.email} already exists")
+        else:
+            rows.append((number, employee))
+    if not rows:
+        return
+
+    try:
+        hashes = hash_passwords([DEFAULT_PASSWORD] * len(rows))
+    except HashingOverloaded as e:
+        # Earlier chunks are already committed; fail just these rows so they can be resubmitted
+        for number, _ in rows:
+            report.error(number, f"password hashing failed: {e}")
+        return
+    values = [
+        (e.first_name, e.last_name, e.email, e.hire_date, e.department, e.job_title, e.details, hashed)
+        for (_, e), hashed in zip(rows, hashes)
+    ]
+    try:
+        with transaction():
+            bulk_insert("employee", EMPLOYEE_COLUMNS, values, chunk_size=len(values))
+    except mysql.connector.Error as e:
+        for number, _ in rows:
+            report.error(number, f"insert failed: {e}")
+        return
+    report.imported += len(rows)
+
+
+async def import_employees(chunks, fmt, employee_model, chunk_size=None):
+    """Import employees from an async stream of body chunks; return an ImportReport."""
+    chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+    report = ImportReport()
+    seen_emails = set()
+    chunk = []
+    async for number, row in parse_rows(chunks, fmt):
+        report.rows += 1
+        chunk.append((number, row))
+        if len(chunk) >= chunk_size:
+            await run_in_threadpool(_import_chunk, chunk, seen_emails, report, employee_model)
+            chunk = []
+    if chunk:
+        await run_in_threadpool(_import_chunk, chunk, seen_emails, report, employee_model)
+    return report
@@ -0,0 +1,227 @@
+"""
+Dedicated process pool for bcrypt work in the HR Management API.
+
+bcrypt hashing and verification cost tens of milliseconds of CPU each. Run
+inline they occupy request threads and compete with I/O-bound endpoints, so
+login storms slow everything down. ``hashing_pool.hash_password`` and
+``hashing_pool.check_password`` run bcrypt in a small, size-limited process
+pool instead. Admission control caps how many calls may be queued or running
+at once; callers that cannot get a slot within ``BCRYPT_ADMISSION_TIMEOUT``
+seconds get ``HashingOverloaded`` (served as HTTP 503) rather than piling up
+behind the pool. Bulk callers (``map`` / ``hash_passwords``, e.g. employee
+imports) additionally go through their own smaller semaphore, so they never
+hold more than ``BCRYPT_BULK_SLOTS`` admission slots and logins keep the rest.
+If a worker dies (OOM-kill, segfault) the executor is broken for good, so the
+pool replaces it and retries the affected call once.
+
+Environment:
+  BCRYPT_WORKERS: worker processes (default min(2, CPUs)); 0 runs bcrypt inline
+  BCRYPT_MAX_QUEUE: calls allowed to wait for a worker (default 32)
+  BCRYPT_ADMISSION_TIMEOUT: seconds to wait for admission (default 2)
+  BCRYPT_BULK_SLOTS: admission slots bulk calls may hold at once (default: workers)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+
+class HashingOverloaded(Exception):
+    """Raised when the bcrypt pool has no capacity for another call."""
+
+
+def _hashpw(password: bytes) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt()).decode("utf-8")
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class HashingPool:
+    """Size-limited process pool with admission control and queue-depth metrics.
+
+    Args:
+        workers: worker processes; 0 runs calls inline in the caller's thread.
+        max_queue: calls allowed to wait on top of the ones running.
+        admission_timeout: seconds a caller waits for a slot before ``HashingOverloaded``.
+        bulk_slots: admission slots ``map`` may hold at once (default: workers); always
+            leaves at least one slot for single calls.
+    """
+
+    def __init__(self, workers=2, max_queue=32, admission_timeout=2.0, bulk_slots=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.admission_timeout = admission_timeout
+        total = max(1, workers) + max_queue
+        self.bulk_slots = max(1, min(bulk_slots or max(1, workers), total - 1))
+        self._slots = threading.BoundedSemaphore(total)
+        self._bulk_slots = threading.BoundedSemaphore(self.bulk_slots)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._recycled = 0
+        self._wait_ms = 0.0
+        self._run_ms = 0.0
+
+    def _get_executor(self):
+        # Rebuild after a fork so workers never share a parent's pipes
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(os.getenv("BCRYPT_POOL_START_METHOD", "spawn")),
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _replace_executor(self, broken):
+        """Drop ``broken`` so the next call starts a fresh executor."""
+        with self._lock:
+            if self._executor is not broken:
+                return  # another caller already replaced it
+            self._executor = None
+            self._recycled += 1
+        print("[WARNING] bcrypt worker died; restarting the hashing pool")
+        broken.shutdown(wait=False)
+
+    def _admit(self):
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.admission_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise HashingOverloaded("Password hashing is overloaded, retry shortly")
+        admitted = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            self._wait_ms += (admitted - start) * 1000
+        return admitted
+
+    def _finish(self, admitted, failed):
+        self._slots.release()
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._failed += failed
+            self._run_ms += (time.perf_counter() - admitted) * 1000
+
+    def _submit(self, executor, fn, *args):
+        admitted = self._admit()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._finish(admitted, True)
+            raise
+        future.add_done_callback(lambda f: self._finish(admitted, f.cancelled() or f.exception() is not None))
+        return future
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` in the pool and return its result (blocking the caller)."""
+        if self.workers > 0:
+            executor = self._get_executor()
+            try:
+                return self._submit(executor, fn, *args).result()
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                return self._submit(self._get_executor(), fn, *args).result()
+        admitted = self._admit()
+        failed = True
+        try:
+            result = fn(*args)
+            failed = False
+            return result
+        finally:
+            self._finish(admitted, failed)
+
+    def map(self, fn, arg_tuples):
+        """Run ``fn`` over ``arg_tuples`` concurrently and return results in order.
+
+        Submission blocks while ``bulk_slots`` calls of bulk work are outstanding,
+        so a large batch never takes the admission slots single calls (logins) need.
+        """
+        if self.workers <= 0:
+            return [self.run(fn, *args) for args in arg_tuples]
+        executor = self._get_executor()
+        futures = []
+        for args in arg_tuples:
+            self._bulk_slots.acquire()
+            try:
+                future = self._submit(executor, fn, *args)
+            except BrokenProcessPool:
+                # Resubmitted one by one below once the executor is replaced
+                self._bulk_slots.release()
+                future = None
+            except BaseException:
+                self._bulk_slots.release()
+                raise
+            else:
+                future.add_done_callback(lambda f: self._bulk_slots.release())
+            futures.append((future, args))
+        results = []
+        for future, args in futures:
+            try:
+                if future is None:
+                    raise BrokenProcessPool("executor broke before submission")
+                results.append(future.result())
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                results.append(self._submit(self._get_executor(), fn, *args).result())
+        return results
+
+    def hash_password(self, password: bytes) -> str:
+        return self.run(_hashpw, password)
+
+    def check_password(self, password: bytes, hashed: bytes) -> bool:
+        return self.run(_checkpw, password, hashed)
+
+    def hash_passwords(self, passwords):
+        """Hash many passwords in parallel across the worker processes."""
+        return self.map(_hashpw, [(p,) for p in passwords])
+
+    def stats(self):
+        with self._lock:
+            running = min(self._in_flight, max(1, self.workers))
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "admission_timeout": self.admission_timeout,
+                "bulk_slots": self.bulk_slots,
+                "in_flight": self._in_flight,
+                "queue_depth": self._in_flight - running,
+                "max_in_flight": self._max_in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "recycled": self._recycled,
+                "avg_admission_wait_ms": self._wait_ms / self._submitted if self._submitted else 0.0,
+                "avg_run_ms": self._run_ms / self._completed if self._completed else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    workers=int(os.getenv("BCRYPT_WORKERS", str(min(2, os.cpu_count() or 1)))),
+    max_queue=int(os.getenv("BCRYPT_MAX_QUEUE", "32")),
+    admission_timeout=float(os.getenv("BCRYPT_ADMISSION_TIMEOUT", "2")),
+    bulk_slots=int(os.getenv("BCRYPT_BULK_SLOTS", "0")) or None,
+)
@@ -1,10 +1,134 @@
 """
 ML retraining logic for feedback events.
 This module provides a function to retrain or update the ML recommender for a specific employee after feedback is received.
+
+A full retrain records the training set and a watermark (the highest
+``skill_feedback.id`` it read) in ``esco_training_state.pkl``.
+``retrain_recommender_incremental`` reads only the votes past the watermark,
+refits the binary estimators of the skill labels whose job-title assignments
+changed against the frozen TF-IDF vocabulary, and falls back to a full
+retrain when new job titles bring too many unseen terms.
 """
-from app.ml_recommender import HybridRecommender
+import os
+
+from app.ml_recommender import HybridRecommender, LinearSkillScorer
 from app.database import fetch_results
+from app.skill_catalog import skill_catalog
+from app.model_registry import (
+    model_registry, dump_atomic, write_manifest, new_version, publish_lock,
+    DATA_DIR, MODEL_PATH, VECTORIZER_PATH, MLB_PATH, WEIGHTS_PATH, ARTIFACTS_DIR, MANIFEST_PATH, TRAINING_STATE_PATH,
+    ML_SCORER_INT8, ML_SCORER_MIN_AGREEMENT,
+)
+from app.mmap_artifacts import write_artifacts, prune_artifacts
+from app.parallel_training import fit_one_vs_rest, fit_label_estimators
+
+# Training rows checked against sklearn's ranking before the compiled scorer is exported
+SCORER_VALIDATION_ROWS = 2000
+# Unseen terms in new job titles, as a fraction of the vocabulary, above which an
+# incremental retrain falls back to a full one
+RETRAIN_MAX_VOCAB_DRIFT = float(os.getenv("RETRAIN_MAX_VOCAB_DRIFT", "0.05"))
+
+FEEDBACK_QUERY = (
+    "SELECT sf.id, sf.employee_id, sf.skill_id, sf.vote, e.job_title "
+    "FROM skill_feedback sf JOIN employee e ON sf.employee_id = e.id"
+)
+
+
+def compile_linear_scorer(clf, X_check, topn=10, quantize=ML_SCORER_INT8):
+    """
+    Stack the classifier's coefficients into a LinearSkillScorer for export.
+    The scorer's top-k ranking is checked against clf.predict_proba on ``X_check`` first;
+    returns (None, info) when it disagrees, and drops the int8 copy when only that does.
+    ``info`` is a summary for the manifest.
+    """
+    try:
+        scorer = LinearSkillScorer.from_estimator(clf)
+    except (TypeError, ValueError) as e:
+        print(f"[Retrain] ⚠ Linear scorer not exported: {e}")
+        return None, {"exported": False}
+    agreement = scorer.ranking_agreement(clf, X_check, topn)
+    info = {"exported": False, "agreement": agreement}
+    if agreement < ML_SCORER_MIN_AGREEMENT:
+        print(f"[Retrain] ⚠ Linear scorer ranking agreement {agreement:.4f} below {ML_SCORER_MIN_AGREEMENT}; not exported")
+        return None, info
+    if quantize:
+        info["int8_agreement"] = scorer.quantized().ranking_agreement(clf, X_check, topn)
+        if info["int8_agreement"] < ML_SCORER_MIN_AGREEMENT:
+            print(f"[Retrain] ⚠ int8 scorer agreement {info['int8_agreement']:.4f} too low; exporting float32 only")
+            quantize = False
+    info.update(exported=True, int8=quantize)
+    return scorer, info
+
+
+def _count_votes(feedback_rows, skill_map, vote_counts=None):
+    """
+    Add feedback rows to ``vote_counts`` ({(job_title_norm, skill_label): [up, down]}).
+    Returns (vote_counts, number of votes used); rows without a job title or known skill are skipped.
+    """
+    vote_counts = {} if vote_counts is None else vote_counts
+    used = 0
+    for row in feedback_rows:
+        job_title = row['job_title'].lower().strip() if row['job_title'] else None
+        skill_label = skill_map.get(row['skill_id'])
+        if job_title and skill_label:
+            counts = vote_counts.setdefault((job_title, skill_label), [0, 0])
+            if row['vote'] == 'up':
+                counts[0] += 1
+            elif row['vote'] == 'down':
+                counts[1] += 1
+            used += 1
+    return vote_counts, used
+
+
+def _skill_weights(vote_counts):
+    """
+    skill_label -> weight. Base weight = 1.0, +0.2 per upvote, -0.2 per downvote, min 0.2.
+    Weights are per skill, so the last job title (alphabetically) with votes for it wins.
+    """
+    skill_weights = {}
+    for (_, skill), (up_count, down_count) in sorted(vote_counts.items()):
+        skill_weights[skill] = max(0.2, 1.0 + (0.2 * up_count) - (0.2 * down_count))
+    return skill_weights
+
+
+def _publish(clf, vectorizer, mlb, skill_weights, X, state, topn, **manifest_extra):
+    """Save the model artifacts and training state, export the scorer, write the manifest and swap the model in."""
+    # Concurrent retrains publish one after the other, so a manifest never mixes their files
+    with publish_lock(MANIFEST_PATH):
+        manifest = _write_artifacts(clf, vectorizer, mlb, skill_weights, X, state, topn, **manifest_extra)
+    # Swap the new model in for this process right away
+    model_registry.reload()
+    return manifest
+
+
+def _write_artifacts(clf, vectorizer, mlb, skill_weights, X, state, topn, **manifest_extra):
+    print("[Retrain] Saving model artifacts...")
+    # Each file is renamed into place; the manifest is written last so serving
+    # processes only switch once the full set is on disk
+    dump_atomic(clf, MODEL_PATH)
+    dump_atomic(vectorizer, VECTORIZER_PATH)
+    dump_atomic(mlb, MLB_PATH)
+    dump_atomic(skill_weights, WEIGHTS_PATH)
+    dump_atomic(state, TRAINING_STATE_PATH)
 
+    # Export the compiled scorer and tables in the memory-mapped format
+    version = new_version()
+    scorer, scorer_info = compile_linear_scorer(clf, X[:SCORER_VALIDATION_ROWS], topn=topn)
+    if scorer is not None:
+        try:
+            write_artifacts(os.path.join(ARTIFACTS_DIR, version), version, vectorizer, mlb.classes_,
+                            skill_weights, scorer, quantize=scorer_info["int8"])
+            # Keep the previous version for workers that have not switched yet
+            prune_artifacts(ARTIFACTS_DIR, keep={version, model_registry.stats()["version"]})
+            print(f"[Retrain] ✓ Wrote memory-mapped artifacts ({scorer.n_features} features x {scorer.n_labels} labels)")
+        except (OSError, ValueError) as e:
+            print(f"[Retrain] ⚠ Memory-mapped artifacts not written: {e}")
+            scorer_info["exported"] = False
+        del scorer
+    manifest = write_manifest(version, path=MANIFEST_PATH, n_labels=len(mlb.classes_), scorer=scorer_info,
+                              feedback_watermark=state["watermark"], **manifest_extra)
+    print(f"[Retrain] ✓ Saved model artifacts to {DATA_DIR}, version {manifest['version']}")
+    return manifest
 
 
 def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
@@ -23,13 +147,10 @@ def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
         3. For each employee: infer skills and upsert into skill_need table
     """
     import pandas as pd
-    import joblib
-    import os
     import time
     import gc
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.preprocessing import MultiLabelBinarizer
-    from sklearn.multiclass import OneVsRestClassifier
     from sklearn.linear_model import LogisticRegression
 
     start_time = time.time()
@@ -37,11 +158,8 @@ def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
 
     # --- 1. Load ESCO data ---
     print("[Retrain] Loading ESCO CSV data...")
-    BASE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data')
+    BASE_PATH = DATA_DIR
     DATA_PATH = os.path.join(BASE_PATH, 'occupationSkillRelations_en.csv')
-    MODEL_PATH = os.path.join(BASE_PATH, 'esco_skill_recommender.pkl')
-    VECTORIZER_PATH = os.path.join(BASE_PATH, 'esco_jobtitle_vectorizer.pkl')
-    MLB_PATH = os.path.join(BASE_PATH, 'esco_skill_binarizer.pkl')
     # Load only needed columns to reduce memory
     df = pd.read_csv(DATA_PATH, usecols=['occupationLabel', 'skillLabel'])
     df['job_title_norm'] = df['occupationLabel'].str.lower().str.strip()
@@ -54,46 +172,22 @@ def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
     # --- 2. Aggregate user feedback from skill_feedback table ---
     print("[Retrain] Aggregating user feedback...")
     # Get all feedback (not just for this employee, so model learns from all users)
-    feedback_rows = fetch_results("SELECT sf.employee_id, sf.skill_id, sf.vote, e.job_title FROM skill_feedback sf JOIN employee e ON sf.employee_id = e.id", ())
+    feedback_rows = fetch_results(FEEDBACK_QUERY, ())
+    # Votes past this id are picked up by the next incremental retrain
+    watermark = max((row['id'] for row in feedback_rows), default=0)
     # Map skill_id to skill label
-    skill_map = {row['id']: row['preferred_label'] for row in fetch_results("SELECT id, preferred_label FROM skill", ())}
-    # Build feedback DataFrame
-    feedback_data = []
-    for row in feedback_rows:
-        job_title = row['job_title'].lower().strip() if row['job_title'] else None
-        skill_label = skill_map.get(row['skill_id'])
-        if job_title and skill_label:
-            feedback_data.append({
-                'job_title_norm': job_title,
-                'skill': skill_label,
-                'vote': row['vote']
-            })
-    feedback_df = pd.DataFrame(feedback_data)
-    print(f"[Retrain] ✓ Found {len(feedback_df)} feedback votes")
+    skill_map = {skill_id: row['preferred_label'] for skill_id, row in skill_catalog.id_map().items()}
+    vote_counts, n_votes = _count_votes(feedback_rows, skill_map)
+    print(f"[Retrain] ✓ Found {n_votes} feedback votes")
 
     # --- 3. Merge ESCO and feedback data with weighted feedback ---
     print("[Retrain] Merging ESCO data with weighted feedback...")
     # For each job_title_norm, collect skills from ESCO
     job_to_skills = df.groupby('job_title_norm')['skillLabel'].apply(set).to_dict()
-    
-    # Build skill weights dictionary (skill_name -> weight)
-    # Base weight = 1.0, +0.2 per upvote, -0.2 per downvote, min 0.2
-    skill_weights = {}  # Will map skill_label -> weight
-    
     # Add upvoted/downvoted skills from feedback (keeping all, not removing)
-    if not feedback_df.empty:
-        for jt, group in feedback_df.groupby('job_title_norm'):
-            if jt not in job_to_skills:
-                job_to_skills[jt] = set()
-            # Process each skill in this job title
-            for skill in group['skill'].unique():
-                skill_votes = group[group['skill'] == skill]
-                up_count = len(skill_votes[skill_votes['vote'] == 'up'])
-                down_count = len(skill_votes[skill_votes['vote'] == 'down'])
-                # Weight = 1.0 + (0.2 * up_count) - (0.2 * down_count), min 0.2
-                weight = max(0.2, 1.0 + (0.2 * up_count) - (0.2 * down_count))
-                skill_weights[skill] = weight
-                job_to_skills[jt].add(skill)  # Add skill even if downvoted
+    for jt, skill in sorted(vote_counts):
+        job_to_skills.setdefault(jt, set()).add(skill)  # Add skill even if downvoted
+    skill_weights = _skill_weights(vote_counts)
     
     print(f"[Retrain] ✓ Prepared training data with {len(job_to_skills)} job titles")
     print(f"[Retrain] ✓ Built skill weights for {len(skill_weights)} feedback-voted skills")
@@ -104,7 +198,7 @@ def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
     skill_lists = [list(skills) for skills in job_to_skills.values()]
     
     # Clean up feedback data early to free memory before training
-    del feedback_df, feedback_data, job_to_skills
+    del feedback_rows, job_to_skills
     gc.collect()
 
     # --- 5. Train model ---
@@ -115,28 +209,129 @@ def retrain_recommender_on_feedback(employee_id: int = None, topn: int = 10):
     print(f"[Retrain]   TF-IDF vocabulary size: {len(vectorizer.get_feature_names_out())}")
     mlb = MultiLabelBinarizer()
     Y = mlb.fit_transform(skill_lists)
-    # liblinear is more memory-efficient than default 'lbfgs' solver
-    clf = OneVsRestClassifier(LogisticRegression(max_iter=2000, C=10, solver='liblinear', n_jobs=1))
-    clf.fit(X, Y)
+    # liblinear is more memory-efficient than default 'lbfgs' solver; labels are
+    # sharded over TRAIN_WORKERS processes that share X read-only
+    clf = fit_one_vs_rest(LogisticRegression(max_iter=2000, C=10, solver='liblinear', n_jobs=1), X, Y)
     print(f"[Retrain] ✓ Model training complete")
 
-    # --- 6. Save model and encoders ---
-    print("[Retrain] Saving model artifacts...")
-    joblib.dump(clf, MODEL_PATH)
-    joblib.dump(vectorizer, VECTORIZER_PATH)
-    joblib.dump(mlb, MLB_PATH)
-    
-    # --- 6b. Save skill weights dictionary ---
-    WEIGHTS_PATH = os.path.join(BASE_PATH, 'esco_skill_weights.pkl')
-    joblib.dump(skill_weights, WEIGHTS_PATH)
-    print(f"[Retrain] ✓ Saved 4 files to {BASE_PATH} (model + weights)")
+    # --- 6. Save model, encoders, skill weights and training state ---
+    state = {"watermark": watermark, "job_titles": job_titles, "skill_lists": skill_lists, "vote_counts": vote_counts}
+    _publish(clf, vectorizer, mlb, skill_weights, X, state, topn, mode="full")
 
     elapsed = time.time() - start_time
     print(f"[Retrain] ✓ Complete! Model trained in {elapsed:.1f}s")
     print(f"[Retrain] Skills will be calculated per-employee when 'Calculate' is clicked.")
     
     # Clean up all intermediate data
-    del X, Y, job_titles, skill_lists, df, feedback_df, job_to_skills, clf, vectorizer, mlb, skill_weights
+    del X, Y, job_titles, skill_lists, df, clf, vectorizer, mlb, skill_weights, state, vote_counts
     gc.collect()
     
     return True
+
+
+def retrain_recommender_incremental(topn: int = 10):
+    """
+    Update the last full retrain with the skill_feedback votes recorded since.
+
+    Only the labels whose set of job titles changed are refitted, on the TF-IDF
+    rows of all job titles under the frozen vocabulary and idf; every other binary
+    estimator is kept as is (it does not see new job titles as negatives until the
+    next full retrain). Skill weights are recomputed from the accumulated votes.
+    Falls back to ``retrain_recommender_on_feedback`` when there is no training
+    state, the feedback table was reset, or the unseen terms in new job titles
+    exceed RETRAIN_MAX_VOCAB_DRIFT of the vocabulary. Job-title edits and deleted
+    votes are not feedback rows; they are picked up by the next full retrain.
+    """
+    import time
+    import joblib
+    import numpy as np
+    from scipy import sparse
+
+    start_time = time.time()
+    print("[Retrain] Starting incremental ML model retrain...")
+    try:
+        state = joblib.load(TRAINING_STATE_PATH)
+        clf = joblib.load(MODEL_PATH)
+        vectorizer = joblib.load(VECTORIZER_PATH)
+        mlb = joblib.load(MLB_PATH)
+    except Exception as e:
+        print(f"[Retrain] ⚠ No usable training state ({e}); running a full retrain")
+        return retrain_recommender_on_feedback(topn=topn)
+
+    # --- 1. Votes past the watermark ---
+    watermark = state["watermark"]
+    latest = fetch_results("SELECT MAX(id) AS max_id FROM skill_feedback", ())[0]['max_id'] or 0
+    if latest < watermark:
+        print(f"[Retrain] ⚠ skill_feedback ids went back ({latest} < watermark {watermark}); running a full retrain")
+        return retrain_recommender_on_feedback(topn=topn)
+    if latest == watermark:
+        print(f"[Retrain] ✓ No feedback since watermark {watermark}; model unchanged")
+        return True
+    feedback_rows = fetch_results(f"{FEEDBACK_QUERY} WHERE sf.id > %s AND sf.id <= %s", (watermark, latest))
+    skill_map = {skill_id: row['preferred_label'] for skill_id, row in skill_catalog.id_map().items()}
+    new_votes, n_votes = _count_votes(feedback_rows, skill_map)
+    print(f"[Retrain] ✓ Found {n_votes} feedback votes since watermark {watermark}")
+
+    # --- 2. Changed job titles and labels ---
+    vote_counts = state["vote_counts"]
+    job_titles = list(state["job_titles"])
+    skill_sets = {jt: set(skills) for jt, skills in zip(job_titles, state["skill_lists"])}
+    changed_titles, changed_labels = set(), set()
+    for (jt, skill), (up_count, down_count) in sorted(new_votes.items()):
+        counts = vote_counts.setdefault((jt, skill), [0, 0])
+        counts[0] += up_count
+        counts[1] += down_count
+        if jt not in skill_sets:
+            skill_sets[jt] = set()
+            job_titles.append(jt)
+        if skill not in skill_sets[jt]:
+            skill_sets[jt].add(skill)
+            changed_titles.add(jt)
+            changed_labels.add(skill)
+    new_titles = job_titles[len(state["job_titles"]):]
+
+    # --- 3. Vocabulary drift check ---
+    analyzer = vectorizer.build_analyzer()
+    unseen = {term for jt in new_titles for term in analyzer(jt)} - vectorizer.vocabulary_.keys()
+    drift = len(unseen) / max(len(vectorizer.vocabulary_), 1)
+    if drift > RETRAIN_MAX_VOCAB_DRIFT:
+        print(f"[Retrain] ⚠ {len(unseen)} unseen terms in new job titles (drift {drift:.3f} > "
+              f"{RETRAIN_MAX_VOCAB_DRIFT}); running a full retrain")
+        return retrain_recommender_on_feedback(topn=topn)
+    print(f"[Retrain] ✓ {len(changed_titles)} job titles ({len(new_titles)} new) and "
+          f"{len(changed_labels)} labels changed, vocabulary drift {drift:.3f}")
+
+    # --- 4. Insert new labels in the binarizer's sorted column order ---
+    new_labels = changed_labels - set(mlb.classes_)
+    if new_labels:
+        position = {label: i for i, label in enumerate(mlb.classes_)}
+        classes = sorted(set(mlb.classes_) | new_labels)
+        clf.estimators_ = [clf.estimators_[position[c]] if c in position else None for c in classes]
+        mlb.classes_ = np.array(classes, dtype=object)
+        mlb._cached_dict = None
+        clf.label_binarizer_.classes_ = np.arange(len(classes))
+        clf.classes_ = clf.label_binarizer_.classes_
+
+    # --- 5. Refit the changed labels against the frozen vocabulary ---
+    X = vectorizer.transform(job_titles)
+    column = {label: i for i, label in enumerate(mlb.classes_)}
+    refit = sorted(changed_labels, key=column.get)
+    refit_index = {label: j for j, label in enumerate(refit)}
+    rows, cols = [], []
+    for i, jt in enumerate(job_titles):
+        for skill in skill_sets[jt] & changed_labels:
+            rows.append(i)
+            cols.append(refit_index[skill])
+    Y = sparse.csc_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(job_titles), len(refit)))
+    estimators = fit_label_estimators(clf.estimator, X, Y, [column[label] for label in refit])
+    for label, estimator in zip(refit, estimators):
+        clf.estimators_[column[label]] = estimator
+    print(f"[Retrain] ✓ Refitted {len(refit)} of {len(mlb.classes_)} labels")
+
+    # --- 6. Save ---
+    state = {"watermark": latest, "job_titles": job_titles,
+             "skill_lists": [list(skill_sets[jt]) for jt in job_titles], "vote_counts": vote_counts}
+    _publish(clf, vectorizer, mlb, _skill_weights(vote_counts), X, state, topn,
+             mode="incremental", refit_labels=len(refit), vocab_drift=drift)
+    print(f"[Retrain] ✓ Incremental retrain complete in {time.time() - start_time:.1f}s")
+    return True
@@ -5,32 +5,262 @@ Hybrid L&D Recommendation Engine for HR_Management
 """
 import pandas as pd
 import numpy as np
-import pickle
 import os
-from app.database import fetch_results
+import tempfile
+from scipy import sparse
+from scipy.special import expit
+from app.database import fetch_results, fetch_iter
+from app.model_registry import model_registry
+from app.occupation_index import get_occupation_index, CSV_PATH
+from app.skill_catalog import skill_catalog
 # DEPRECATED: cosine_similarity was imported but not used (collaborative filtering not yet implemented)
 
 # --- Data Extraction Helpers (replace with your DB queries) ---
+# Loaders stream plain tuples straight into the DataFrame instead of materializing a list of dicts
 def get_employees(con):
-    rows = fetch_results('SELECT id, first_name, last_name, department, job_title FROM employee', ())
-    return pd.DataFrame(rows, columns=['id', 'first_name', 'last_name', 'department', 'job_title'])
+    rows = fetch_iter('SELECT id, first_name, last_name, department, job_title FROM employee', (), as_tuples=True)
+    return pd.DataFrame.from_records(rows, columns=['id', 'first_name', 'last_name', 'department', 'job_title'])
 
 def get_trainings(con):
-    rows = fetch_results('SELECT id, title, description, start_date, end_date, category FROM training', ())
-    return pd.DataFrame(rows, columns=['id', 'title', 'description', 'start_date', 'end_date', 'category'])
+    rows = fetch_iter('SELECT id, title, description, start_date, end_date, category FROM training', (), as_tuples=True)
+    return pd.DataFrame.from_records(rows, columns=['id', 'title', 'description', 'start_date', 'end_date', 'category'])
 
 def get_employee_skills(con):
-    rows = fetch_results('SELECT employee_id, skill_id FROM employee_skill', ())
-    return pd.DataFrame(rows, columns=['employee_id', 'skill_id'])
+    rows = fetch_iter('SELECT employee_id, skill_id FROM employee_skill', (), as_tuples=True)
+    return pd.DataFrame.from_records(rows, columns=['employee_id', 'skill_id'])
 
 
 def get_training_need(con):
-    rows = fetch_results('SELECT employee_id, skill_id, recommendation_score FROM skill_need', ())
-    return pd.DataFrame(rows, columns=['employee_id', 'skill_id', 'recommendation_score'])
+    rows = fetch_iter('SELECT employee_id, skill_id, recommendation_score FROM skill_need', (), as_tuples=True)
+    return pd.DataFrame.from_records(rows, columns=['employee_id', 'skill_id', 'recommendation_score'])
 
 def get_training_history(con):
-    rows = fetch_results('SELECT employee_id, training_id FROM employee_training', ())
-    return pd.DataFrame(rows, columns=['employee_id', 'training_id'])
+    rows = fetch_iter('SELECT employee_id, training_id FROM employee_training', (), as_tuples=True)
+    return pd.DataFrame.from_records(rows, columns=['employee_id', 'training_id'])
+
+# Employee ids per IN (...) lookup in recommend_batch
+BATCH_LOOKUP_SIZE = 1000
+# Neighbors kept per employee / training in the collaborative-filtering graphs
+CF_NEIGHBORS = int(os.getenv("CF_NEIGHBORS", "20"))
+# Share of the skill score taken from similar employees' skills. Opt-in: the default 0
+# keeps recommend() rankings (ml-calculate, suggested-skills) unchanged
+CF_BLEND_WEIGHT = float(os.getenv("CF_BLEND_WEIGHT", "0"))
+# Rows per block when computing similarities, bounding the intermediate product
+CF_BLOCK_SIZE = 2048
+
+
+def top_k_indices(scores, k):
+    """Column indices of the k largest values in each row of ``scores``, highest first."""
+    k = min(int(k), scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+def interaction_matrix(user_ids, item_ids, users, items):
+    """
+    Binary CSR matrix (len(users) x len(items)) with a 1 for every (user_id, item_id) pair.
+    Pairs whose user or item is not in ``users`` / ``items`` are ignored.
+    """
+    u = pd.Index(users).get_indexer(user_ids)
+    i = pd.Index(items).get_indexer(item_ids)
+    keep = (u >= 0) & (i >= 0)
+    matrix = sparse.csr_matrix(
+        (np.ones(int(keep.sum()), dtype=np.float32), (u[keep], i[keep])),
+        shape=(len(users), len(items)),
+    )
+    # Repeated pairs are summed on construction; implicit feedback is just 0/1
+    matrix.data[:] = 1
+    return matrix
+
+
+def top_k_neighbors(matrix, k, block_size=CF_BLOCK_SIZE, rows=None):
+    """
+    Cosine-similarity k-nearest-neighbor graph of the rows of a sparse matrix.
+    Returns a CSR matrix whose row i holds the similarities of the (at most) k most
+    similar other rows; similarities are computed block by block and pruned right away.
+    With ``rows``, only those rows of the graph are computed (the others stay empty).
+    """
+    n = matrix.shape[0]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    normed = sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+    normed_t = normed.T.tocsr()
+    targets = np.arange(n) if rows is None else np.unique(np.asarray(rows, dtype=np.int64))
+    out_rows, out_cols, out_vals = [], [], []
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        sims = (normed[block] @ normed_t).tocoo()
+        r, c, d = block[sims.row], sims.col, sims.data
+        keep = (r != c) & (d > 0)
+        r, c, d = r[keep], c[keep], d[keep]
+        # Best first within each row (ties by column), then keep each row's first k
+        order = np.lexsort((c, -d, r))
+        r, c, d = r[order], c[order], d[order]
+        rank = np.arange(len(r)) - np.searchsorted(r, r, side="left")
+        keep = rank < k
+        out_rows.append(r[keep])
+        out_cols.append(c[keep])
+        out_vals.append(d[keep])
+    if not out_rows:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+    return sparse.csr_matrix(
+        (np.concatenate(out_vals), (np.concatenate(out_rows), np.concatenate(out_cols))),
+        shape=(n, n), dtype=np.float32,
+    )
+
+
+def _replace_rows(matrix, rows, new):
+    """``matrix`` with ``rows`` replaced by the same rows of ``new`` (which is empty elsewhere)."""
+    keep = np.ones(matrix.shape[0], dtype=np.float32)
+    keep[rows] = 0
+    out = (sparse.diags(keep) @ matrix + new).tocsr().astype(np.float32)
+    out.eliminate_zeros()
+    return out
+
+
+def _set_entry(matrix, row, col, present):
+    """
+    Binary CSR matrix with entry (row, col) set to 1 or removed. The entry is spliced
+    into the CSR arrays (one copy of each) instead of rebuilding the matrix from COO.
+    """
+    if not matrix.has_sorted_indices:
+        matrix = matrix.sorted_indices()
+    start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+    at = start + int(np.searchsorted(matrix.indices[start:stop], col))
+    if (at < stop and matrix.indices[at] == col) == present:
+        return matrix
+    indptr = matrix.indptr.copy()
+    if present:
+        indices = np.insert(matrix.indices, at, col)
+        data = np.insert(matrix.data, at, 1)
+        indptr[row + 1:] += 1
+    else:
+        indices = np.delete(matrix.indices, at)
+        data = np.delete(matrix.data, at)
+        indptr[row + 1:] -= 1
+    return sparse.csr_matrix((data, indices, indptr), shape=matrix.shape)
+
+
+def _resized(matrix, shape):
+    matrix = matrix.copy()
+    matrix.resize(shape)
+    return matrix
+
+
+# Logit standing in for sklearn's constant 1/0 predictions: expit(+-40) is 1/0 to
+# float32 precision, while staying finite through quantization and arithmetic
+CONSTANT_LOGIT = 40.0
+
+
+class LinearSkillScorer:
+    """
+    Compiled form of the OneVsRest logistic regression used for skill inference.
+
+    The per-label estimators are stacked into one (n_features, n_labels) coefficient
+    matrix and an intercept vector, so scoring a batch of TF-IDF rows is a single
+    sparse x dense matmul followed by a sigmoid, instead of one predict_proba call per
+    label. Coefficients are float32, or int8 with a per-label scale when quantized.
+    """
+
+    def __init__(self, coef, intercept, scale=None, version=None):
+        self.coef = coef
+        # Artifacts written before constants were clamped store them as +-inf
+        if not np.isfinite(intercept).all():
+            intercept = np.clip(intercept, -CONSTANT_LOGIT, CONSTANT_LOGIT).astype(np.float32)
+        self.intercept = intercept
+        self.scale = scale
+        self.version = version
+
+    @property
+    def n_labels(self):
+        return self.intercept.shape[0]
+
+    @property
+    def n_features(self):
+        return self.coef.shape[0]
+
+    @classmethod
+    def from_estimator(cls, clf, version=None):
+        """Stack the binary estimators of a fitted multilabel OneVsRestClassifier."""
+        if not getattr(clf, "multilabel_", False):
+            raise ValueError("Only multilabel OneVsRestClassifier models can be compiled")
+        coef = np.zeros((clf.n_features_in_, len(clf.estimators_)), dtype=np.float32)
+        intercept = np.empty(len(clf.estimators_), dtype=np.float32)
+        for j, est in enumerate(clf.estimators_):
+            if hasattr(est, "coef_"):
+                if est.coef_.shape[0] != 1:
+                    raise ValueError("Expected binary estimators")
+                coef[:, j] = est.coef_[0]
+                intercept[j] = np.ravel(est.intercept_)[0]
+            elif hasattr(est, "y_"):
+                # Label present in every (or no) training row: sklearn predicts a constant 1 or 0
+                intercept[j] = CONSTANT_LOGIT if np.ravel(est.y_)[0] else -CONSTANT_LOGIT
+            else:
+                raise TypeError(f"Cannot compile estimator {type(est).__name__}")
+        return cls(coef, intercept, version=version)
+
+    def quantized(self):
+        """int8 copy with a per-label scale (max |coef| / 127)."""
+        if self.scale is not None:
+            return self
+        scale = np.abs(self.coef).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        coef = np.rint(self.coef / scale).astype(np.int8)
+        return LinearSkillScorer(coef, self.intercept, scale.astype(np.float32), self.version)
+
+    def decision_function(self, X):
+        """Logits for each row of the sparse TF-IDF matrix ``X``."""
+        X = X.tocsr()
+        if self.scale is None:
+            out = np.asarray(X.astype(np.float32) @ self.coef)
+        else:
+            # Dequantize only the vocabulary rows the batch actually uses
+            cols = np.unique(X.indices)
+            out = np.asarray(X[:, cols].astype(np.float32) @ self.coef[cols].astype(np.float32))
+            out *= self.scale
+        out += self.intercept
+        return out
+
+    def predict_proba(self, X):
+        return expit(self.decision_function(X))
+
+    def top_k(self, X, k):
+        """(indices, probabilities) of the k most likely labels per row, highest first."""
+        logits = self.decision_function(X)
+        # The sigmoid is monotonic: rank on logits, then only transform the winners
+        top = top_k_indices(logits, k)
+        return top, expit(np.take_along_axis(logits, top, axis=1))
+
+    def ranking_agreement(self, clf, X, k, tol=1e-6):
+        """
+        Share of this scorer's top-k labels that also rank in the top k of sklearn's
+        predict_proba (1.0 = same ranking). Labels tied with sklearn's k-th score count
+        as agreeing, since labels seen with the same titles have identical estimators.
+        """
+        if X.shape[0] == 0:
+            return 1.0
+        proba = clf.predict_proba(X)
+        ours, _ = self.top_k(X, k)
+        if ours.shape[1] == 0:
+            return 1.0
+        kth = -np.partition(-proba, ours.shape[1] - 1, axis=1)[:, ours.shape[1] - 1:ours.shape[1]]
+        return float((np.take_along_axis(proba, ours, axis=1) >= kth - tol).mean())
+
+
+def rank_skills(artifacts, titles, topn):
+    """Top ``topn`` (skill label, probability) pairs for each preprocessed job title."""
+    X = artifacts.vectorizer.transform(titles)
+    if artifacts.scorer is not None:
+        top, probs = artifacts.scorer.top_k(X, topn)
+    else:
+        proba = artifacts.clf.predict_proba(X)
+        top = top_k_indices(proba, topn)
+        probs = np.take_along_axis(proba, top, axis=1)
+    classes = artifacts.classes
+    return [[(classes[i], float(p)) for i, p in zip(row, row_probs)] for row, row_probs in zip(top, probs)]
 
 # --- Hybrid Recommendation Engine ---
 
@@ -68,25 +298,6 @@ class HybridRecommender:
         Loads job_title and department from the employee table using employee_id.
         If the ML model returns no skills, falls back to direct CSV lookup and fuzzy matching.
         """
-        import joblib
-        import os
-        import pandas as pd
-        try:
-            from rapidfuzz import process
-        except ImportError:
-            process = None
-        # Paths to model and encoders
-        BASE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data')
-        MODEL_PATH = os.path.join(BASE_PATH, 'esco_skill_recommender.pkl')
-        VECTORIZER_PATH = os.path.join(BASE_PATH, 'esco_jobtitle_vectorizer.pkl')
-        MLB_PATH = os.path.join(BASE_PATH, 'esco_skill_binarizer.pkl')
-        WEIGHTS_PATH = os.path.join(BASE_PATH, 'esco_skill_weights.pkl')
-        # DEPRECATED: Debug logging below replaced with proper logging framework
-        # print(f"[DEBUG] Loading MODEL_PATH: {os.path.abspath(MODEL_PATH)}")
-        # print(f"[DEBUG] Loading VECTORIZER_PATH: {os.path.abspath(VECTORIZER_PATH)}")
-        # print(f"[DEBUG] Loading MLB_PATH: {os.path.abspath(MLB_PATH)}")
-        CSV_PATH = os.path.join(BASE_PATH, 'occupationSkillRelations_en.csv')
-        import joblib  # TODO: Move to top-level imports
         # Always load job_title and department from DB using employee_id
         job_title = None
         department = None
@@ -108,126 +319,89 @@ class HybridRecommender:
         jt = self.preprocess_job_title(job_title, department)
         # DEPRECATED: Debug logging replaced with proper logging framework
         # print(f"[INFO] Preprocessed job title for ML: '{jt}' (original: '{job_title}', department: '{department}')")
-        # Load model and encoders with error handling for missing files
-        clf = None
-        vectorizer = None
-        mlb = None
-        skill_weights = {}  # Will be populated from weights file
-        proba = None
-        try:
-            clf = joblib.load(MODEL_PATH)
-            vectorizer = joblib.load(VECTORIZER_PATH)
-            mlb = joblib.load(MLB_PATH)
-            # Load skill weights dictionary
-            try:
-                skill_weights = joblib.load(WEIGHTS_PATH)
-            except FileNotFoundError:
-                # Weights file may not exist on first run; continue without weights
-                skill_weights = {}
-            X_new = vectorizer.transform([jt])
-            # Efficiently select top N skills by probability
-            proba = clf.predict_proba(X_new)
-        except FileNotFoundError as e:
+        # Model artifacts are loaded once per process and hot-swapped after retraining
+        artifacts = model_registry.get()
+        topn = int(topn) if topn is not None else 5
+        ranked = []
+        if artifacts is None:
             # Model files not yet trained; will fall back to CSV lookup below
-            print(f"[WARNING] ML model files not found: {e}. Falling back to CSV lookup.")
-            proba = None
-        except Exception as e:
-            # Other errors during model loading/inference; fall back gracefully
-            print(f"[WARNING] Error loading/using ML model: {e}. Falling back to CSV lookup.")
-            proba = None
-        
+            print("[WARNING] ML model files not found. Falling back to CSV lookup.")
+        else:
+            try:
+                ranked = rank_skills(artifacts, [jt], topn)[0]
+            except Exception as e:
+                # Errors during inference; fall back gracefully
+                print(f"[WARNING] Error using ML model: {e}. Falling back to CSV lookup.")
+        return self._score_skill_labels(jt, ranked, artifacts, topn)
+
+    def recommend_batch(self, employee_ids, topn=5):
+        """
+        Recommended skills for many employees at once; returns {employee_id: [skills]}.
+        Same results as calling fetch_trending_skills_from_web per employee, but job titles
+        are loaded in one query, identical preprocessed titles are scored once, and the
+        model scores all distinct titles in a single pass.
+        """
         topn = int(topn) if topn is not None else 5
-        skill_labels = []
-        
-        # Only process ML predictions if model loaded successfully
-        if proba is not None and clf is not None and mlb is not None:
+        employee_ids = list(dict.fromkeys(employee_ids))
+        titles = {eid: self.preprocess_job_title(None, None) for eid in employee_ids}
+        for start in range(0, len(employee_ids), BATCH_LOOKUP_SIZE):
+            chunk = employee_ids[start:start + BATCH_LOOKUP_SIZE]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            rows = fetch_results(f'SELECT id, job_title, department FROM employee WHERE id IN ({placeholders})', tuple(chunk))
+            for row in rows:
+                titles[row['id']] = self.preprocess_job_title(row['job_title'], row['department'])
+        distinct = list(dict.fromkeys(titles.values()))
+
+        artifacts = model_registry.get()
+        ranked = [[] for _ in distinct]
+        if artifacts is not None and distinct:
             try:
-                # Get indices of top N probabilities
-                top_indices = np.argpartition(-proba[0], range(topn))[:topn]
-                # Sort these indices by actual probability descending
-                top_indices = top_indices[np.argsort(-proba[0][top_indices])]
-                skill_labels = [mlb.classes_[i] for i in top_indices]
+                ranked = rank_skills(artifacts, distinct, topn)
             except Exception as e:
-                print(f"[WARNING] Error extracting top skills from predictions: {e}. Using CSV fallback.")
-                skill_labels = []
-        # Fallback: direct CSV lookup if ML returns nothing
-        if not skill_labels:
+                print(f"[WARNING] Error using ML model: {e}. Falling back to CSV lookup.")
+        by_title = {jt: self._score_skill_labels(jt, r, artifacts, topn) for jt, r in zip(distinct, ranked)}
+        # Callers may modify the returned dicts, so employees sharing a title get their own copies
+        return {eid: [dict(s) for s in by_title[titles[eid]]] for eid in employee_ids}
+
+    def _score_skill_labels(self, jt, ranked, artifacts, topn):
+        """
+        Resolve (skill label, probability) pairs from the model to catalog skills and score them.
+        Falls back to the occupation index when the model produced no labels.
+        """
+        # Fallback: precomputed occupation -> skills index if ML returns nothing
+        if not ranked:
             try:
-                df = pd.read_csv(CSV_PATH)
-                df['job_title_norm'] = df['occupationLabel'].str.lower().str.strip()
-                direct = df[df['job_title_norm'] == jt]['skillLabel'].tolist()
-                if direct:
-                    skill_labels = direct[:topn]
-                elif process is not None:
-                    all_titles = df['occupationLabel'].unique()
-                    matches = process.extract(jt, all_titles, limit=5)
-                    match, score, _ = matches[0]
-                    HIGH_CONFIDENCE = 90
-                    LOW_CONFIDENCE = 80
-                    if score >= HIGH_CONFIDENCE:
-                        direct = df[df['occupationLabel'] == match]['skillLabel'].tolist()
-                        skill_labels = direct[:topn]
-                    elif score >= LOW_CONFIDENCE:
-                        direct = df[df['occupationLabel'] == match]['skillLabel'].tolist()
-                        skill_labels = direct[:topn]
-                    else:
-                        skill_labels = []
-            except FileNotFoundError:
-                print(f"[WARNING] CSV lookup file not found: {CSV_PATH}. No fallback available.")
-                skill_labels = []
+                index = get_occupation_index()
+                if index is None:
+                    print(f"[WARNING] CSV lookup file not found: {CSV_PATH}. No fallback available.")
+                else:
+                    # Default probability 0.5 for skills not coming from ML
+                    ranked = [(label, 0.5) for label in index.lookup(jt, topn)]
             except Exception as e:
                 print(f"[WARNING] Error during CSV lookup: {e}")
-                skill_labels = []
-        # Map skill labels to DB skills
-        from app.database import fetch_results, execute_query
-        db_skills = fetch_results("SELECT id, preferred_label, skill_type FROM skill", ())
-        skill_map = { s['preferred_label'].lower(): s for s in db_skills }
+                ranked = []
+        # Map skill labels to DB skills (shared in-process catalog)
+        skill_map = skill_catalog.label_map()
+        skill_weights = artifacts.skill_weights if artifacts is not None else {}
         result = []
-        # employee_id is already provided as argument
-        # Map skill labels to their ML probabilities (scaled 0-100)
-        skill_to_proba = {}
-        if proba is not None and mlb is not None:
-            try:
-                for idx, skill in enumerate(mlb.classes_):
-                    skill_to_proba[skill] = float(proba[0][idx])
-            except Exception as e:
-                print(f"[WARNING] Error mapping skill probabilities: {e}")
-                skill_to_proba = {}
-        for i, label in enumerate(skill_labels[:topn]):
+        for label, prob in ranked[:topn]:
             key = label.lower()
             if key in skill_map:
                 db_skill = skill_map[key]
-                skill_id = db_skill['id']
-                # Get ML probability for this skill
-                prob = skill_to_proba.get(label, 0.5)  # Default 0.5 if not from ML
                 # Apply feedback weight (1.0 baseline, +/-0.2 per vote, min 0.2)
                 weight = skill_weights.get(label, 1.0)  # Default 1.0 if no feedback
                 weighted_prob = prob * weight
                 # Cap final score at 100%
                 rec_score = min(100, int(round(weighted_prob * 100)))
                 result.append({
-                    "id": skill_id,
+                    "id": db_skill['id'],
                     "preferred_label": label,
-                    "skill_type": skill_map[key]["skill_type"],
+                    "skill_type": db_skill["skill_type"],
                     "recommendation_score": rec_score
                 })
-                # DEPRECATED: Batch upsert to skill_need moved to separate retrain job
-                #if employee_id is not None:
-                #    upsert_query = "INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE recommendation_score = VALUES(recommendation_score)"
-                #    try:
-                #        execute_query(upsert_query, (skill_id, employee_id, rec_score))
-                #    except Exception as e:
-                        # print(f"Failed to insert/update skill_need: {e}. Data: skill_id={skill_id}, employee_id={employee_id}, recommendation_score={rec_score}")
-            # DEPRECATED: individual skill insertion logic no longer needed
-            #else:
-                # Do not insert new skills; skip if not found
-                # print(f"[DEBUG] Skill '{label}' not found in skill table. Skipping.")
         # Sort results by recommendation_score descending
-        result_sorted = sorted(result, key=lambda x: x["recommendation_score"], reverse=True)
-        # DEPRECATED: Debug logging replaced with proper logging framework
-        # print(f"[INFO] Final recommended skills: {result_sorted}")
-        # print("[SUCCESS] ML recommendation procedure completed successfully.")  # Use logging instead
-        return result_sorted
+        return sorted(result, key=lambda x: x["recommendation_score"], reverse=True)
+
     def __init__(self):
         self.training_ids = None
         self.employee_ids = None
@@ -242,71 +416,278 @@ class HybridRecommender:
         self.employee_ids = list(employees['id'])
         self.training_ids = list(trainings['id'])
         self.training_need = training_need
+        self._employee_pos = {eid: i for i, eid in enumerate(self.employee_ids)}
 
-        # Build user-item interaction matrix (collaborative filtering)
-        user_idx = {eid: i for i, eid in enumerate(self.employee_ids)}
-        item_idx = {tid: i for i, tid in enumerate(self.training_ids)}
-        matrix = np.zeros((len(self.employee_ids), len(self.training_ids)))
-        for _, row in training_history.iterrows():
-            u = user_idx.get(row['employee_id'])
-            t = item_idx.get(row['training_id'])
-            if u is not None and t is not None:
-                matrix[u, t] = 1  # implicit feedback
-        self.user_item_matrix = matrix
+        # Build user-item interaction matrix (collaborative filtering), sparse and vectorized
+        self.user_item_matrix = interaction_matrix(
+            training_history['employee_id'], training_history['training_id'], self.employee_ids, self.training_ids
+        )
+        # Employee x skill matrix, for suggesting what similar employees know
+        self.skill_ids = np.unique(employee_skills['skill_id'].to_numpy())
+        self.user_skill_matrix = interaction_matrix(
+            employee_skills['employee_id'], employee_skills['skill_id'], self.employee_ids, self.skill_ids
+        )
+        # Precomputed top-k neighbor graphs: employees with similar training histories,
+        # and trainings taken by the same employees
+        self.user_neighbors = top_k_neighbors(self.user_item_matrix, CF_NEIGHBORS)
+        self.item_neighbors = top_k_neighbors(self.user_item_matrix.T.tocsr(), CF_NEIGHBORS)
+
+    def collaborative_skill_scores(self, employee_id):
+        """
+        {skill_id: score in [0, 1]}: similarity-weighted share of the employee's nearest
+        neighbors (by training history) that have each skill. Empty without neighbors.
+        """
+        skill_ids, scores = self._collaborative_skill_vector(employee_id)
+        return dict(zip(skill_ids.tolist(), scores.tolist()))
+
+    def _collaborative_skill_vector(self, employee_id):
+        empty = (np.empty(0, dtype=np.int64), np.empty(0))
+        u = self._employee_pos.get(employee_id)
+        if u is None:
+            return empty
+        neighbors = self.user_neighbors[u]
+        total = neighbors.sum()
+        if total <= 0:
+            return empty
+        scores = (neighbors @ self.user_skill_matrix).tocsr()
+        return self.skill_ids[scores.indices], scores.data / total
+
+    def recommend_trainings(self, employee_id, topn=5):
+        """
+        Trainings the employee has not taken, ranked by blending item-item scores (trainings
+        similar to their history) with user-user scores (trainings their neighbors took).
+        """
+        u = self._employee_pos.get(employee_id)
+        if u is None:
+            return []
+        history = self.user_item_matrix[u]
+        neighbors = self.user_neighbors[u]
+        item_based = np.asarray((history @ self.item_neighbors).todense()).ravel()
+        user_based = np.asarray((neighbors @ self.user_item_matrix).todense()).ravel()
+        scores = np.zeros(len(self.training_ids))
+        for part in (item_based, user_based):
+            if part.max() > 0:
+                scores += part / part.max() / 2
+        scores[history.indices] = 0
+        top = top_k_indices(scores[None, :], topn)[0]
+        return [
+            {"id": self.training_ids[i], "recommendation_score": round(float(scores[i]) * 100, 1)}
+            for i in top if scores[i] > 0
+        ]
 
     def recommend(self, employee_id, topn=5, con=None, force_trending=False):
         # If force_trending is True, always return trending skills for this employee
         if force_trending:
             return self.fetch_trending_skills_from_web(topn=topn, employee_id=employee_id)
         # If employee not found, return trending skills for this employee
-        if employee_id not in self.employee_ids:
+        if employee_id not in self._employee_pos:
             return self.fetch_trending_skills_from_web(topn=topn, employee_id=employee_id)
 
         # If training_need is empty, fallback to trending skills for this employee
         if self.training_need is None or len(self.training_need) == 0:
             return self.fetch_trending_skills_from_web(topn=topn, employee_id=employee_id)
 
-        # Get all skills from DB
-        from app.database import fetch_results
-        all_skills = fetch_results("SELECT id, preferred_label, skill_type FROM skill", ())
+        # Catalog as arrays sorted by id; scoring below is vectorized over the whole catalog
+        catalog = skill_catalog.arrays()
         # Get employee's current skills and proficiency
         emp_skill_rows = fetch_results("SELECT skill_id, proficiency_level FROM employee_skill WHERE employee_id = %s", (employee_id,))
-        emp_skill_proficiency = {s['skill_id']: int(s['proficiency_level']) if s['proficiency_level'] is not None else 1 for s in emp_skill_rows}
-
-        scored_skills = []
-        for s in all_skills:
-            skill_id = s['id']
-            if skill_id not in emp_skill_proficiency:
-                # Missing skill: highest score
-                score = 100
-            else:
-                proficiency = emp_skill_proficiency[skill_id]
-                if proficiency >= 5:
-                    continue  # Skip if already fully proficient
-                # Inverse score: lower proficiency = higher score
-                score = max(0, 100 - (proficiency - 1) * 25)  # 1:100, 2:75, 3:50, 4:25, 5:0
-            scored_skills.append({
-                "id": s['id'],
-                "preferred_label": s['preferred_label'],
-                "skill_type": s['skill_type'],
-                "recommendation_score": score
-            })
-        # Sort by score descending and return top N
-        scored_skills = sorted(scored_skills, key=lambda x: x["recommendation_score"], reverse=True)[:topn]
+        proficiency = np.array([int(s['proficiency_level']) if s['proficiency_level'] is not None else 1 for s in emp_skill_rows], dtype=np.int64)
+        pos, found = catalog.positions([s['skill_id'] for s in emp_skill_rows])
+        pos, proficiency = pos[found], proficiency[found]
+
+        # Missing skill: highest score; inverse score for held ones: 1:100, 2:75, 3:50, 4:25
+        scores = np.full(len(catalog.ids), 100, dtype=np.int64)
+        scores[pos] = np.maximum(0, 100 - (proficiency - 1) * 25)
+        eligible = np.ones(len(catalog.ids), dtype=bool)
+        eligible[pos[proficiency >= 5]] = False  # Skip if already fully proficient
+        # Blend in skills held by employees with similar training histories
+        cf_ids, cf_values = self._collaborative_skill_vector(employee_id) if CF_BLEND_WEIGHT > 0 else ((), ())
+        if len(cf_ids):
+            cf = np.zeros(len(catalog.ids))
+            cf_pos, cf_found = catalog.positions(cf_ids)
+            cf[cf_pos[cf_found]] = cf_values[cf_found]
+            scores = np.rint((1 - CF_BLEND_WEIGHT) * scores + CF_BLEND_WEIGHT * 100 * cf).astype(np.int64)
+
+        # Top N by score; ties keep catalog (id) order, as the stable sort over rows did
+        candidates = np.flatnonzero(eligible)
+        n = len(catalog.ids)
+        key = scores[candidates] * (n + 1) + (n - candidates)
+        top = candidates[top_k_indices(key[None, :], topn)[0]] if len(candidates) else candidates
+        scored_skills = [
+            {
+                "id": catalog.rows[i]['id'],
+                "preferred_label": catalog.labels[i],
+                "skill_type": catalog.skill_types[catalog.type_codes[i]],
+                "recommendation_score": int(scores[i]),
+            }
+            for i in top.tolist()
+        ]
         if not scored_skills:
             return self.fetch_trending_skills_from_web(topn=topn, employee_id=employee_id)
         return scored_skills
 
 
 
+    # --- Persistence (columnar .npz, no pickles) ---
+
+    _MATRICES = ("user_item_matrix", "user_skill_matrix", "user_neighbors", "item_neighbors")
+
     def save(self, path):
-        with open(path, 'wb') as f:
-            pickle.dump(self, f)
+        """Write the fitted state as flat arrays (ids, CSR components, training_need columns)."""
+        arrays = {
+            "employee_ids": np.asarray(self.employee_ids, dtype=np.int64),
+            "training_ids": np.asarray(self.training_ids, dtype=np.int64),
+            "skill_ids": np.asarray(self.skill_ids, dtype=np.int64),
+        }
+        for name in self._MATRICES:
+            matrix = getattr(self, name)
+            arrays[f"{name}_indptr"] = matrix.indptr
+            arrays[f"{name}_indices"] = matrix.indices
+            arrays[f"{name}_data"] = matrix.data
+            arrays[f"{name}_shape"] = np.asarray(matrix.shape, dtype=np.int64)
+        for column in ('employee_id', 'skill_id', 'recommendation_score'):
+            arrays[f"need_{column}"] = self.training_need[column].to_numpy()
+        # Unique temp name in the target directory: several workers may save at once
+        fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp.npz",
+                                   dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
 
     @staticmethod
     def load(path):
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+        recommender = HybridRecommender()
+        with np.load(path, allow_pickle=False) as data:
+            recommender.employee_ids = data["employee_ids"].tolist()
+            recommender.training_ids = data["training_ids"].tolist()
+            recommender.skill_ids = data["skill_ids"]
+            for name in HybridRecommender._MATRICES:
+                setattr(recommender, name, sparse.csr_matrix(
+                    (data[f"{name}_data"], data[f"{name}_indices"], data[f"{name}_indptr"]),
+                    shape=tuple(data[f"{name}_shape"]),
+                ))
+            recommender.training_need = pd.DataFrame({
+                column: data[f"need_{column}"] for column in ('employee_id', 'skill_id', 'recommendation_score')
+            })
+        recommender._employee_pos = {eid: i for i, eid in enumerate(recommender.employee_ids) if eid >= 0}
+        recommender.trainings = pd.DataFrame({'id': recommender.training_ids})
+        skills = recommender.user_skill_matrix.tocoo()
+        recommender.employee_skills = pd.DataFrame({
+            'employee_id': np.asarray(recommender.employee_ids, dtype=np.int64)[skills.row],
+            'skill_id': recommender.skill_ids[skills.col],
+        })
+        return recommender
+
+    # --- Incremental updates (keep a fitted recommender current without refitting) ---
+    # Updates only ever assign new matrices, id lists and index dicts, never modify them in
+    # place, so a shallow copy can be updated while readers keep scoring the original.
+
+    def has_employee(self, employee_id):
+        return employee_id in self._employee_pos
+
+    def add_employee(self, employee_id):
+        """Add an employee with no history (no-op if already known)."""
+        if employee_id in self._employee_pos:
+            return
+        n = len(self.employee_ids) + 1
+        self.user_item_matrix = _resized(self.user_item_matrix, (n, len(self.training_ids)))
+        self.user_skill_matrix = _resized(self.user_skill_matrix, (n, len(self.skill_ids)))
+        self.user_neighbors = _resized(self.user_neighbors, (n, n))
+        self.employee_ids = self.employee_ids + [employee_id]
+        self._employee_pos = {**self._employee_pos, employee_id: n - 1}
+
+    def remove_employee(self, employee_id):
+        """Forget an employee: drop their history and treat them as unknown."""
+        u = self._employee_pos.get(employee_id)
+        if u is None:
+            return
+        for t in self.user_item_matrix[u].indices.tolist():
+            self.remove_training_history(employee_id, self.training_ids[t])
+        self.user_skill_matrix = _replace_rows(
+            self.user_skill_matrix, [u], sparse.csr_matrix(self.user_skill_matrix.shape, dtype=np.float32)
+        )
+        self._employee_pos = {eid: i for eid, i in self._employee_pos.items() if eid != employee_id}
+        # The (now empty) row stays in place; -1 marks it as unused when saved
+        self.employee_ids = self.employee_ids[:u] + [-1] + self.employee_ids[u + 1:]
+
+    def add_training_history(self, employee_id, training_id):
+        """Record an employee_training row and refresh the affected neighbor lists."""
+        self._set_training_history(employee_id, training_id, True)
+
+    def remove_training_history(self, employee_id, training_id):
+        self._set_training_history(employee_id, training_id, False)
+
+    def _set_training_history(self, employee_id, training_id, present):
+        u = self._employee_pos.get(employee_id)
+        if u is None:
+            return
+        if training_id not in self.training_ids:
+            if not present:
+                return
+            self.training_ids = self.training_ids + [training_id]
+            m = len(self.training_ids)
+            self.user_item_matrix = _resized(self.user_item_matrix, (len(self.employee_ids), m))
+            self.item_neighbors = _resized(self.item_neighbors, (m, m))
+        t = self.training_ids.index(training_id)
+        # Users sharing a training with u (before or after the change) and trainings sharing
+        # a user with t are the only rows whose cosine similarities can change
+        before = self.user_item_matrix
+        after = _set_entry(before, u, t, present)
+        item_user = (before + after).T.tocsr()
+        history = np.union1d(before[u].indices, after[u].indices)
+        users = np.union1d([u], item_user[history].indices if len(history) else [])
+        items = np.union1d([t], (before + after)[item_user[t].indices].indices)
+        self.user_item_matrix = after
+        self.user_neighbors = _replace_rows(
+            self.user_neighbors, users, top_k_neighbors(after, CF_NEIGHBORS, rows=users)
+        )
+        item_matrix = after.T.tocsr()
+        self.item_neighbors = _replace_rows(
+            self.item_neighbors, items, top_k_neighbors(item_matrix, CF_NEIGHBORS, rows=items)
+        )
+
+    def add_employee_skill(self, employee_id, skill_id):
+        """Record an employee_skill row (used by collaborative skill scores)."""
+        self._set_employee_skill(employee_id, skill_id, True)
+
+    def remove_employee_skill(self, employee_id, skill_id):
+        self._set_employee_skill(employee_id, skill_id, False)
+
+    def _set_employee_skill(self, employee_id, skill_id, present):
+        u = self._employee_pos.get(employee_id)
+        if u is None:
+            return
+        pos = int(np.searchsorted(self.skill_ids, skill_id))
+        if pos == len(self.skill_ids) or self.skill_ids[pos] != skill_id:
+            if not present:
+                return
+            # New skill column: shift the later columns right by one
+            self.skill_ids = np.insert(self.skill_ids, pos, skill_id)
+            coo = self.user_skill_matrix.tocoo()
+            cols = coo.col + (coo.col >= pos)
+            self.user_skill_matrix = sparse.csr_matrix(
+                (coo.data, (coo.row, cols)), shape=(len(self.employee_ids), len(self.skill_ids))
+            )
+        self.user_skill_matrix = _set_entry(self.user_skill_matrix, u, pos, present)
+
+    def set_training_need(self, employee_id, rows):
+        """Replace an employee's skill_need rows ((skill_id, recommendation_score) pairs)."""
+        need = self.training_need
+        need = need[need['employee_id'] != employee_id]
+        if rows:
+            added = pd.DataFrame(
+                [(employee_id, skill_id, score) for skill_id, score in rows],
+                columns=['employee_id', 'skill_id', 'recommendation_score'],
+            )
+            need = pd.concat([need, added], ignore_index=True) if len(need) else added
+        self.training_need = need
 
 # --- DEPRECATED: Old Example Usage (deprecated in favor of batched retrain job) ---
 # This usage pattern is replaced with:
@@ -0,0 +1,138 @@
+"""
+Memory-mapped artifact format for the skill recommender.
+
+``retrain_recommender_on_feedback`` writes one directory per model version::
+
+    esco_model_mmap/<version>/
+        meta.json                      version, TF-IDF parameters, shapes
+        weights.json                   feedback skill weights
+        coef.npy, intercept.npy        float32 LinearSkillScorer arrays
+        coef_int8.npy, scale.npy       optional int8 copy
+        idf.npy                        TF-IDF idf vector
+        vocab_buf.npy, vocab_off.npy   vocabulary terms in column order (UTF-8 + offsets)
+        classes_buf.npy, classes_off.npy  skill labels in column order
+
+Every array is a plain ``.npy`` file (64-byte aligned header, no pickles)
+opened with ``np.load(mmap_mode='r')``, so uvicorn workers map the same
+page-cache pages instead of each deserializing its own copy, and loading a
+model only reads the small headers. Skill labels are decoded on access; only
+the vocabulary dict the vectorizer needs is built per process.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+# TfidfVectorizer parameters that affect transform() and survive a JSON round trip
+VECTORIZER_PARAMS = (
+    "analyzer", "binary", "lowercase", "ngram_range", "norm", "smooth_idf",
+    "stop_words", "strip_accents", "sublinear_tf", "token_pattern", "use_idf",
+)
+
+
+def pack_strings(strings):
+    """UTF-8 bytes of all strings as one uint8 buffer, plus int64 offsets."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class StringTable:
+    """Read-only sequence of strings backed by a packed (possibly memory-mapped) buffer."""
+
+    def __init__(self, buffer, offsets):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i = int(i) % len(self)
+        return self._buffer[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        data = self._buffer.tobytes()
+        offsets = self._offsets
+        for i in range(len(self)):
+            yield data[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+
+def write_artifacts(path, version, vectorizer, classes, skill_weights, scorer, quantize=False):
+    """Write a model version to the directory ``path`` (written to a temp dir, then renamed)."""
+    params = {name: getattr(vectorizer, name) for name in VECTORIZER_PARAMS}
+    if not isinstance(params["analyzer"], str) or vectorizer.tokenizer or vectorizer.preprocessor:
+        raise ValueError("Only vectorizers with built-in analyzers can be memory-mapped")
+    tmp = f"{path}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    vocab = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    arrays = {
+        "coef": np.ascontiguousarray(scorer.coef, dtype=np.float32),
+        "intercept": np.asarray(scorer.intercept, dtype=np.float32),
+        "idf": np.asarray(vectorizer.idf_),
+    }
+    arrays["vocab_buf"], arrays["vocab_off"] = pack_strings(vocab)
+    arrays["classes_buf"], arrays["classes_off"] = pack_strings([str(c) for c in classes])
+    if quantize:
+        q = scorer.quantized()
+        arrays["coef_int8"], arrays["scale"] = q.coef, q.scale
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), array, allow_pickle=False)
+    with open(os.path.join(tmp, "weights.json"), "w") as f:
+        json.dump({str(k): float(v) for k, v in skill_weights.items()}, f)
+    meta = {
+        "version": version,
+        "vectorizer": params,
+        "n_features": scorer.n_features,
+        "n_labels": scorer.n_labels,
+        "int8": bool(quantize),
+    }
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return meta
+
+
+def load_artifacts(path, int8=False):
+    """
+    Open a model version written by write_artifacts.
+    Returns (version, vectorizer, classes, skill_weights, scorer); ``int8`` serves
+    the quantized coefficients when the version has them.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from app.ml_recommender import LinearSkillScorer
+
+    def array(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    with open(os.path.join(path, "weights.json")) as f:
+        skill_weights = json.load(f)
+    params = dict(meta["vectorizer"])
+    params["ngram_range"] = tuple(params["ngram_range"])
+    vocab = StringTable(array("vocab_buf"), array("vocab_off"))
+    vectorizer = TfidfVectorizer(vocabulary={term: i for i, term in enumerate(vocab)}, **params)
+    vectorizer.idf_ = array("idf")
+    classes = StringTable(array("classes_buf"), array("classes_off"))
+    if int8 and meta.get("int8"):
+        scorer = LinearSkillScorer(array("coef_int8"), array("intercept"), array("scale"), meta["version"])
+    else:
+        scorer = LinearSkillScorer(array("coef"), array("intercept"), version=meta["version"])
+    return meta["version"], vectorizer, classes, skill_weights, scorer
+
+
+def prune_artifacts(root, keep):
+    """Delete all version directories under ``root`` except ``keep`` (and leftover temp dirs)."""
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        if name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
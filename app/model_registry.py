@@ -0,0 +1,278 @@
+"""
+Process-wide registry for the skill recommender's model artifacts.
+
+The four artifacts written by ``retrain_recommender_on_feedback`` (classifier,
+TF-IDF vectorizer, label binarizer and feedback weights) are loaded once and
+shared by every request, together with the compiled linear scorer used for
+inference. When retraining also wrote the memory-mapped format
+(``app.mmap_artifacts``) for the current version, that is opened instead of
+the pickles, so all workers share one page-cache copy of the arrays. ``get()`` checks, at most every
+``MODEL_RELOAD_INTERVAL`` seconds, whether retraining produced new artifacts
+(the manifest version, or file mtimes when there is no manifest) and loads
+them in the calling thread while other requests keep using the current
+snapshot. The new snapshot replaces the old one with a single reference
+assignment, so readers always see one consistent set of artifacts.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import joblib
+
+from app.mmap_artifacts import load_artifacts
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+MODEL_PATH = os.path.join(DATA_DIR, 'esco_skill_recommender.pkl')
+VECTORIZER_PATH = os.path.join(DATA_DIR, 'esco_jobtitle_vectorizer.pkl')
+MLB_PATH = os.path.join(DATA_DIR, 'esco_skill_binarizer.pkl')
+WEIGHTS_PATH = os.path.join(DATA_DIR, 'esco_skill_weights.pkl')
+MANIFEST_PATH = os.path.join(DATA_DIR, 'esco_model_manifest.json')
+ARTIFACTS_DIR = os.path.join(DATA_DIR, 'esco_model_mmap')
+# Training set and feedback watermark of the last retrain, for incremental retrains
+TRAINING_STATE_PATH = os.path.join(DATA_DIR, 'esco_training_state.pkl')
+
+# Seconds between checks for new artifacts
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "5"))
+# "mmap" opens the memory-mapped artifacts when present, "pickle" always uses joblib
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "mmap").lower()
+# "linear" scores with the compiled coefficient matrix, "sklearn" with clf.predict_proba
+ML_SCORER = os.getenv("ML_SCORER", "linear").lower()
+# Export (on retrain) and serve the int8-quantized coefficients
+ML_SCORER_INT8 = os.getenv("ML_SCORER_INT8", "0").lower() in ("1", "true", "yes")
+# Minimum top-k agreement with sklearn's ranking for a compiled scorer to be exported
+ML_SCORER_MIN_AGREEMENT = float(os.getenv("ML_SCORER_MIN_AGREEMENT", "0.99"))
+
+
+class ModelArtifacts:
+    """One consistent, immutable set of loaded recommender artifacts."""
+
+    def __init__(self, clf, vectorizer, classes, skill_weights, version, scorer=None, fmt="pickle"):
+        # clf is None for memory-mapped artifacts, which always have a scorer
+        self.clf = clf
+        self.vectorizer = vectorizer
+        # Skill label per model column (mlb.classes_ or a StringTable)
+        self.classes = classes
+        self.skill_weights = skill_weights
+        self.version = version
+        # LinearSkillScorer, or None to use clf.predict_proba
+        self.scorer = scorer
+        self.format = fmt
+        self.loaded_at = time.time()
+
+
+def new_version():
+    return f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+@contextmanager
+def atomic_file(path):
+    """Yield a binary file in ``path``'s directory that replaces ``path`` on success.
+
+    The temp name is unique, so concurrent writers (two retrains, or two
+    workers) never write into each other's file.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_manifest(version=None, path=MANIFEST_PATH, **extra):
+    """Record a new artifact version; write it after all artifact files are in place."""
+    version = version or new_version()
+    manifest = {"version": version, "created_at": time.time(), **extra}
+    with atomic_file(path) as f:
+        f.write(json.dumps(manifest).encode("utf-8"))
+    return manifest
+
+
+def dump_atomic(obj, path):
+    """joblib.dump to a temporary file and rename it into place."""
+    with atomic_file(path) as f:
+        joblib.dump(obj, f)
+
+
+_publish_lock = threading.Lock()
+
+
+@contextmanager
+def publish_lock(manifest_path=MANIFEST_PATH):
+    """Serialize artifact publishing across threads and processes.
+
+    Held from the first artifact file to the manifest, so one version's
+    pickles and manifest always come from the same retrain. Across
+    processes this uses an flock on ``<manifest>.lock`` (POSIX only).
+    """
+    with _publish_lock:
+        try:
+            import fcntl
+        except ImportError:  # Windows: threads of this process only
+            yield
+            return
+        with open(f"{manifest_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class ModelRegistry:
+    """Loads recommender artifacts once and hot-swaps them when they change on disk."""
+
+    def __init__(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, mlb_path=MLB_PATH,
+                 weights_path=WEIGHTS_PATH, manifest_path=MANIFEST_PATH, check_interval=MODEL_RELOAD_INTERVAL,
+                 artifacts_dir=ARTIFACTS_DIR, model_format=MODEL_FORMAT, scorer=ML_SCORER, int8=ML_SCORER_INT8):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.mlb_path = mlb_path
+        self.weights_path = weights_path
+        self.manifest_path = manifest_path
+        self.check_interval = check_interval
+        self.artifacts_dir = artifacts_dir
+        self.model_format = model_format
+        self.scorer = scorer
+        self.int8 = int8
+        self._current = None
+        self._signature = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._loads = 0
+        self._failures = 0
+        self._last_error = None
+        self._last_load_ms = None
+
+    def _disk_signature(self):
+        """Identify the artifacts on disk: the manifest version, else the files' mtimes and sizes."""
+        try:
+            with open(self.manifest_path) as f:
+                return ("manifest", json.load(f).get("version"))
+        except (OSError, ValueError):
+            pass
+        sig = []
+        for path in (self.model_path, self.vectorizer_path, self.mlb_path, self.weights_path):
+            try:
+                st = os.stat(path)
+                sig.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append(None)
+        return ("mtime", tuple(sig))
+
+    def _load(self, signature):
+        start = time.perf_counter()
+        mmap_dir = os.path.join(self.artifacts_dir, str(signature[1]))
+        if (signature[0] == "manifest" and self.model_format == "mmap" and self.scorer == "linear"
+                and os.path.isdir(mmap_dir)):
+            version, vectorizer, classes, skill_weights, scorer = load_artifacts(mmap_dir, int8=self.int8)
+            artifacts = ModelArtifacts(None, vectorizer, classes, skill_weights, version, scorer, fmt="mmap")
+        else:
+            artifacts = self._load_pickles(signature)
+        with self._stats_lock:
+            self._loads += 1
+            self._last_error = None
+            self._last_load_ms = (time.perf_counter() - start) * 1000
+        return artifacts
+
+    def _load_pickles(self, signature):
+        clf = joblib.load(self.model_path)
+        vectorizer = joblib.load(self.vectorizer_path)
+        mlb = joblib.load(self.mlb_path)
+        try:
+            skill_weights = joblib.load(self.weights_path)
+        except FileNotFoundError:
+            # Weights file may not exist on first run; continue without weights
+            skill_weights = {}
+        version = signature[1] if signature[0] == "manifest" else str(int(os.stat(self.model_path).st_mtime))
+        scorer = self._compile_scorer(clf, version) if self.scorer == "linear" else None
+        return ModelArtifacts(clf, vectorizer, mlb.classes_, skill_weights, version, scorer)
+
+    def _compile_scorer(self, clf, version):
+        from app.ml_recommender import LinearSkillScorer
+
+        try:
+            scorer = LinearSkillScorer.from_estimator(clf, version=version)
+            return scorer.quantized() if self.int8 else scorer
+        except Exception as e:
+            print(f"[WARNING] Could not prepare linear scorer: {e}. Using predict_proba.")
+            return None
+
+    def get(self):
+        """Return the current ModelArtifacts (None when no model has been trained yet)."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._current
+        # Only one thread checks/reloads; the others keep serving the current snapshot
+        if not self._reload_lock.acquire(blocking=self._current is None):
+            return self._current
+        try:
+            if time.monotonic() >= self._next_check:
+                self._refresh()
+        finally:
+            self._reload_lock.release()
+        return self._current
+
+    def current_version(self):
+        """Version of the artifacts in use, without checking disk (None before the first load)."""
+        current = self._current
+        return current.version if current is not None else None
+
+    def reload(self):
+        """Reload from disk now if the artifacts changed (e.g. right after retraining)."""
+        with self._reload_lock:
+            self._refresh()
+        return self._current
+
+    def _refresh(self):
+        self._next_check = time.monotonic() + self.check_interval
+        signature = self._disk_signature()
+        if signature == self._signature:
+            return
+        try:
+            artifacts = self._load(signature)
+        except FileNotFoundError as e:
+            # Model files not yet trained; callers fall back to CSV lookup
+            with self._stats_lock:
+                self._last_error = str(e)
+            self._signature = signature
+            return
+        except Exception as e:
+            print(f"[WARNING] Error loading ML model artifacts: {e}. Keeping the current model.")
+            with self._stats_lock:
+                self._failures += 1
+                self._last_error = str(e)
+            return
+        self._signature = signature
+        self._current = artifacts
+
+    def stats(self):
+        current = self._current
+        with self._stats_lock:
+            return {
+                "loaded": current is not None,
+                "version": current.version if current else None,
+                "loaded_at": current.loaded_at if current else None,
+                "format": current.format if current else None,
+                "scorer": str(current.scorer.coef.dtype) if current and current.scorer is not None else None,
+                "loads": self._loads,
+                "load_failures": self._failures,
+                "last_error": self._last_error,
+                "last_load_ms": self._last_load_ms,
+                "check_interval": self.check_interval,
+            }
+
+
+model_registry = ModelRegistry()
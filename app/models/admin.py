@@ -0,0 +1,102 @@
+"""
+Admin endpoints for the HR Management system.
+Exposes database instrumentation: per-query timings, connection pool state and flagged handlers,
+plus principal cache stats, forced logout (token revocation), bcrypt pool load and the loaded ML model version.
+Every route requires an admin role (``ADMIN_ROLES``); other authenticated users get 403.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from app.database import pool_stats, replica_stats
+from app.database import instrumentation
+from app.models.auth import principal_cache, require_role, ADMIN_ROLES
+from app.token_revocation import revocation
+from app.hashing_pool import hashing_pool
+from app.model_registry import model_registry
+from app.skill_catalog import skill_catalog
+from app.recommender_snapshot import recommender_snapshot
+from app.recommendation_cache import recommendation_cache
+
+# Every route here resets shared state or exposes internals, so the whole router needs an admin role
+router = APIRouter(dependencies=[Depends(require_role(*ADMIN_ROLES))])
+
+
+@router.get("/db-stats")
+def db_stats(top: int = Query(50, ge=1, le=500), order_by: str = Query("total_ms", enum=["total_ms", "avg_ms", "max_ms", "count", "rows", "slow"])):
+    """Return query aggregates grouped by fingerprint, connection-acquire timings,
+    handlers flagged for issuing too many queries, connection pool stats and replica health."""
+    data = instrumentation.snapshot(top=top, order_by=order_by)
+    data["pool"] = pool_stats()
+    data["replicas"] = replica_stats()
+    return data
+
+
+@router.post("/db-stats/reset")
+def reset_db_stats():
+    """Clear all collected query statistics."""
+    instrumentation.reset()
+    return {"message": "Database statistics reset"}
+
+
+@router.get("/auth-cache")
+def auth_cache_stats():
+    """Return principal cache occupancy and hit rate, and token revocation state."""
+    return {**principal_cache.stats(), "revocation": revocation.stats()}
+
+
+@router.post("/auth-cache/reset")
+def reset_auth_cache():
+    """Drop all cached principals and clear the hit/miss counters."""
+    principal_cache.invalidate()
+    principal_cache.reset_stats()
+    return {"message": "Principal cache cleared"}
+
+
+@router.get("/recommendation-cache")
+def recommendation_cache_stats():
+    """Return recommendation result cache occupancy and hit rate."""
+    return recommendation_cache.stats()
+
+
+@router.post("/recommendation-cache/reset")
+def reset_recommendation_cache():
+    """Drop all cached recommendation results and clear the hit/miss counters."""
+    recommendation_cache.invalidate()
+    recommendation_cache.reset_stats()
+    return {"message": "Recommendation cache cleared"}
+
+
+@router.post("/revoke-tokens")
+def revoke_tokens(email: Optional[str] = Query(None, description="Revoke only this user's tokens; omit to revoke all")):
+    """Force logout in every worker: reject every access token issued so far for ``email`` (or for everyone)."""
+    if email:
+        revocation.revoke_subject(email)
+        principal_cache.invalidate(email)
+        return {"message": f"Tokens revoked for {email}"}
+    revocation.revoke_all()
+    principal_cache.invalidate()
+    return {"message": "All tokens revoked", "epoch": revocation.epoch}
+
+
+@router.get("/hashing-stats")
+def hashing_stats():
+    """Return bcrypt process pool load: in-flight calls, queue depth, rejections and timings."""
+    return hashing_pool.stats()
+
+
+@router.get("/model-registry")
+def model_registry_stats():
+    """Return the loaded recommender model version, reload counters, skill catalog and recommender snapshot state."""
+    return {
+        **model_registry.stats(),
+        "skill_catalog": skill_catalog.stats(),
+        "recommender_snapshot": recommender_snapshot.stats(),
+    }
+
+
+@router.post("/model-registry/reload")
+def reload_model_registry():
+    """Pick up new model artifacts now instead of at the next periodic check."""
+    model_registry.reload()
+    return model_registry.stats()
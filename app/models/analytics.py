@@ -4,7 +4,9 @@ Provides aggregated statistics and export functionality for employees, trainings
 """
 
 from fastapi import APIRouter, Query, Response, HTTPException
-from app.database.database import fetch_results
+from app.streaming import stream_response
+from app.database.database import fetch_results, fetch_iter
+from app.database.async_database import fetch_results as async_fetch_results, gather_queries
 import csv
 import io
 from datetime import datetime
@@ -19,7 +21,7 @@ router = APIRouter()
 
 
 @router.get("/overview")
-def analytics_overview(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
+async def analytics_overview(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
     """High-level stats + monthly feedback timeseries.
 
     Returns:
@@ -28,17 +30,6 @@ def analytics_overview(start_date: Optional[str] = Query(None, description="YYYY
       - avg_feedback
       - monthly_feedback: [{month: 'YYYY-MM', avg_feedback, n}]
     """
-    # Basic counts
-    emp = fetch_results("SELECT COUNT(*) AS count FROM employee")[0]["count"]
-    trn = fetch_results("SELECT COUNT(*) AS count FROM training")[0]["count"]
-    fb = fetch_results("SELECT COUNT(*) AS count FROM feedback")[0]["count"]
-
-    # Active / upcoming trainings
-    active = fetch_results("SELECT COUNT(*) AS count FROM training WHERE start_date <= CURDATE() AND end_date >= CURDATE()")[0]["count"]
-    upcoming = fetch_results("SELECT COUNT(*) AS count FROM training WHERE start_date > CURDATE()")[0]["count"]
-
-    avg_feedback = fetch_results("SELECT AVG(sentiment_score) AS avg FROM feedback")[0]["avg"]
-
     # Build date filter for feedback monthly aggregation
     where_clauses: List[str] = []
     params: List[str] = []
@@ -60,13 +51,28 @@ def analytics_overview(start_date: Optional[str] = Query(None, description="YYYY
 
     where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
 
-    monthly = fetch_results(f"""
-        SELECT DATE_FORMAT(feedback_date, '%Y-%m') AS month, AVG(sentiment_score) AS avg_feedback, COUNT(*) AS n
-        FROM feedback
-        {where_sql}
-        GROUP BY month
-        ORDER BY month
-    """, tuple(params) if params else None)
+    # Counts, averages and the monthly series are independent; run them concurrently,
+    # a few at a time so concurrent overview requests do not exhaust the pool
+    emp, trn, fb, active, upcoming, avg_feedback, monthly = await gather_queries(
+        # Basic counts
+        async_fetch_results("SELECT COUNT(*) AS count FROM employee"),
+        async_fetch_results("SELECT COUNT(*) AS count FROM training"),
+        async_fetch_results("SELECT COUNT(*) AS count FROM feedback"),
+        # Active / upcoming trainings
+        async_fetch_results("SELECT COUNT(*) AS count FROM training WHERE start_date <= CURDATE() AND end_date >= CURDATE()"),
+        async_fetch_results("SELECT COUNT(*) AS count FROM training WHERE start_date > CURDATE()"),
+        async_fetch_results("SELECT AVG(sentiment_score) AS avg FROM feedback"),
+        async_fetch_results(f"""
+            SELECT DATE_FORMAT(feedback_date, '%Y-%m') AS month, AVG(sentiment_score) AS avg_feedback, COUNT(*) AS n
+            FROM feedback
+            {where_sql}
+            GROUP BY month
+            ORDER BY month
+        """, tuple(params) if params else None),
+    )
+    emp, trn, fb = emp[0]["count"], trn[0]["count"], fb[0]["count"]
+    active, upcoming = active[0]["count"], upcoming[0]["count"]
+    avg_feedback = avg_feedback[0]["avg"]
 
     return {
         "employee_count": emp,
@@ -80,16 +86,8 @@ def analytics_overview(start_date: Optional[str] = Query(None, description="YYYY
 
 
 @router.get("/trainings")
-def analytics_trainings(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
+async def analytics_trainings(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
     """Return trainings with participant counts and monthly aggregates (trainings started & participants by month)."""
-    trainings = fetch_results("""
-        SELECT t.id, t.title, t.category, COUNT(et.employee_id) AS participants
-        FROM training t
-        LEFT JOIN employee_training et ON t.id = et.training_id
-        GROUP BY t.id
-        ORDER BY participants DESC
-    """)
-
     # Apply optional start/end filter on training start_date
     where_clauses: List[str] = []
     params: List[str] = []
@@ -110,28 +108,36 @@ def analytics_trainings(start_date: Optional[str] = Query(None, description="YYY
 
     where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
 
-    trainings_by_month = fetch_results(f"""
-        SELECT DATE_FORMAT(t.start_date, '%Y-%m') AS month, COUNT(*) AS trainings_started
-        FROM training t
-        {where_sql}
-        GROUP BY month
-        ORDER BY month
-    """, tuple(params) if params else None)
-
-    participants_by_month = fetch_results(f"""
-        SELECT DATE_FORMAT(t.start_date, '%Y-%m') AS month, COUNT(et.employee_id) AS participants
-        FROM training t
-        LEFT JOIN employee_training et ON t.id = et.training_id
-        {where_sql}
-        GROUP BY month
-        ORDER BY month
-    """, tuple(params) if params else None)
+    trainings, trainings_by_month, participants_by_month = await gather_queries(
+        async_fetch_results("""
+            SELECT t.id, t.title, t.category, COUNT(et.employee_id) AS participants
+            FROM training t
+            LEFT JOIN employee_training et ON t.id = et.training_id
+            GROUP BY t.id
+            ORDER BY participants DESC
+        """),
+        async_fetch_results(f"""
+            SELECT DATE_FORMAT(t.start_date, '%Y-%m') AS month, COUNT(*) AS trainings_started
+            FROM training t
+            {where_sql}
+            GROUP BY month
+            ORDER BY month
+        """, tuple(params) if params else None),
+        async_fetch_results(f"""
+            SELECT DATE_FORMAT(t.start_date, '%Y-%m') AS month, COUNT(et.employee_id) AS participants
+            FROM training t
+            LEFT JOIN employee_training et ON t.id = et.training_id
+            {where_sql}
+            GROUP BY month
+            ORDER BY month
+        """, tuple(params) if params else None),
+    )
 
     return {"trainings": trainings, "trainings_by_month": trainings_by_month, "participants_by_month": participants_by_month}
 
 
 @router.get("/feedback")
-def analytics_feedback(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
+async def analytics_feedback(start_date: Optional[str] = Query(None, description="YYYY-MM-DD"), end_date: Optional[str] = Query(None, description="YYYY-MM-DD")):
     """Return feedback analytics: monthly averages and top/bottom employees by avg feedback."""
     where_clauses: List[str] = []
     params: List[str] = []
@@ -152,44 +158,44 @@ def analytics_feedback(start_date: Optional[str] = Query(None, description="YYYY
 
     where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
 
-    monthly = fetch_results(f"""
-        SELECT DATE_FORMAT(f.feedback_date, '%Y-%m') AS month, AVG(f.sentiment_score) AS avg_feedback, COUNT(*) AS n
-        FROM feedback f
-        {where_sql}
-        GROUP BY month
-        ORDER BY month
-    """, tuple(params) if params else None)
-
-    top_pos = fetch_results("""
-        SELECT e.id AS employee_id, e.first_name, e.last_name, AVG(f.sentiment_score) AS avg_feedback, COUNT(f.id) AS n_feedback
-        FROM employee e
-        JOIN feedback f ON e.id = f.employee_id
-        GROUP BY e.id
-        HAVING COUNT(f.id) >= 1
-        ORDER BY avg_feedback DESC
-        LIMIT 10
-    """)
-
-    top_neg = fetch_results("""
-        SELECT e.id AS employee_id, e.first_name, e.last_name, AVG(f.sentiment_score) AS avg_feedback, COUNT(f.id) AS n_feedback
-        FROM employee e
-        JOIN feedback f ON e.id = f.employee_id
-        GROUP BY e.id
-        HAVING COUNT(f.id) >= 1
-        ORDER BY avg_feedback ASC
-        LIMIT 10
-    """)
+    monthly, top_pos, top_neg = await gather_queries(
+        async_fetch_results(f"""
+            SELECT DATE_FORMAT(f.feedback_date, '%Y-%m') AS month, AVG(f.sentiment_score) AS avg_feedback, COUNT(*) AS n
+            FROM feedback f
+            {where_sql}
+            GROUP BY month
+            ORDER BY month
+        """, tuple(params) if params else None),
+        async_fetch_results("""
+            SELECT e.id AS employee_id, e.first_name, e.last_name, AVG(f.sentiment_score) AS avg_feedback, COUNT(f.id) AS n_feedback
+            FROM employee e
+            JOIN feedback f ON e.id = f.employee_id
+            GROUP BY e.id
+            HAVING COUNT(f.id) >= 1
+            ORDER BY avg_feedback DESC
+            LIMIT 10
+        """),
+        async_fetch_results("""
+            SELECT e.id AS employee_id, e.first_name, e.last_name, AVG(f.sentiment_score) AS avg_feedback, COUNT(f.id) AS n_feedback
+            FROM employee e
+            JOIN feedback f ON e.id = f.employee_id
+            GROUP BY e.id
+            HAVING COUNT(f.id) >= 1
+            ORDER BY avg_feedback ASC
+            LIMIT 10
+        """),
+    )
 
     return {"monthly": monthly, "top_positive": top_pos, "top_negative": top_neg}
 
 
 @router.get("/skills")
-def analytics_skills(limit: int = 20):
+async def analytics_skills(limit: int = 20):
     """Return skills with lowest average proficiency (skill gaps).
 
     Requires `employee_skill.proficiency_level` to be numeric.
     """
-    skills = fetch_results("""
+    skills = await async_fetch_results("""
         SELECT s.id AS skill_id, s.preferred_label, AVG(es.proficiency_level) AS avg_proficiency, COUNT(es.employee_id) AS n
         FROM skill s
         JOIN employee_skill es ON s.id = es.skill_id
@@ -201,23 +207,49 @@ def analytics_skills(limit: int = 20):
     return {"low_proficiency_skills": skills}
 
 
+EXPORT_QUERIES = (
+    ("EMPLOYEES", "SELECT * FROM employee"),
+    ("TRAININGS", "SELECT * FROM training"),
+    ("FEEDBACK", "SELECT * FROM feedback"),
+)
+
+
+def _export_csv_chunks():
+    """Yield the CSV export section by section, streaming rows from the database."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for i, (title, query) in enumerate(EXPORT_QUERIES):
+        if i:
+            writer.writerow([])
+        writer.writerow([title])
+        header_written = False
+        for batch in fetch_iter(query, batches=True):
+            if not header_written:
+                writer.writerow(list(batch[0].keys()))
+                header_written = True
+            for row in batch:
+                writer.writerow(list(row.values()))
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+    yield output.getvalue()
+    output.close()
+
+
 @router.get("/export")
 def analytics_export(format: str = Query("csv", enum=["csv", "excel"])):
     """Export employees/trainings/feedback. Supports CSV and Excel (if pandas + engine available).
 
     Excel requires pandas and either openpyxl/xlsxwriter installed. If Excel can't be produced the endpoint falls back to CSV.
+    CSV is streamed from the database so large tables are never held in memory.
     """
-    employees = fetch_results("SELECT * FROM employee")
-    trainings = fetch_results("SELECT * FROM training")
-    feedback = fetch_results("SELECT * FROM feedback")
-
     # If Excel requested and pandas available, try to produce a multi-sheet workbook
     if format == "excel" and pd is not None:
         try:
-            # Build DataFrames
-            df_emp = pd.DataFrame(employees)
-            df_trn = pd.DataFrame(trainings)
-            df_fb = pd.DataFrame(feedback)
+            # Build DataFrames (the workbook itself has to be built in memory)
+            df_emp = pd.DataFrame(fetch_results("SELECT * FROM employee"))
+            df_trn = pd.DataFrame(fetch_results("SELECT * FROM training"))
+            df_fb = pd.DataFrame(fetch_results("SELECT * FROM feedback"))
 
             output = io.BytesIO()
             # let pandas pick the engine; if not available an Exception will be raised
@@ -232,25 +264,4 @@ def analytics_export(format: str = Query("csv", enum=["csv", "excel"])):
             pass
 
     # Default CSV export
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["EMPLOYEES"])
-    if employees:
-        writer.writerow(list(employees[0].keys()))
-        for row in employees:
-            writer.writerow(list(row.values()))
-    writer.writerow([])
-    writer.writerow(["TRAININGS"])
-    if trainings:
-        writer.writerow(list(trainings[0].keys()))
-        for row in trainings:
-            writer.writerow(list(row.values()))
-    writer.writerow([])
-    writer.writerow(["FEEDBACK"])
-    if feedback:
-        writer.writerow(list(feedback[0].keys()))
-        for row in feedback:
-            writer.writerow(list(row.values()))
-    csv_data = output.getvalue()
-    output.close()
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=analytics_export.csv"})
+    return stream_response(_export_csv_chunks(), media_type="text/csv", headers={"Content-Disposition": "attachment; filename=analytics_export.csv"})
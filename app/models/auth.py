@@ -7,11 +7,13 @@ Handles JWT-based login, password hashing, and user info retrieval.
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-import bcrypt
 from pydantic import BaseModel
 import datetime
 import os
 from app.database.database import fetch_results, execute_query
+from app.principal_cache import PrincipalCache
+from app.token_revocation import revocation
+from app.hashing_pool import hashing_pool, HashingOverloaded
 
 router = APIRouter()
 
@@ -21,6 +23,18 @@ ALGORITHM = "HS256"
 # token lifetime in minutes
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# AUTH_MODE=stateless trusts the verified token claims as the principal (no
+# users lookup per request); the default "db" mode loads the users row.
+AUTH_MODE = os.getenv("AUTH_MODE", "db").lower()
+STATELESS_AUTH = AUTH_MODE == "stateless"
+
+# Resolved users rows, keyed by token subject + issue time, so authenticated
+# requests skip the users lookup. AUTH_CACHE_SIZE=0 or AUTH_CACHE_TTL=0 disables it.
+principal_cache = PrincipalCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "60")),
+)
+
 def _prepare_password_bytes(password: str) -> bytes:
     """Encode password to UTF-8 bytes and truncate to 72 bytes (bcrypt limit).
 
@@ -38,7 +52,8 @@ def _prepare_password_bytes(password: str) -> bytes:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a bcrypt hashed password using the bcrypt lib.
 
-    Returns True on match, False otherwise.
+    Runs in the bcrypt process pool. Returns True on match, False otherwise;
+    raises HashingOverloaded when the pool has no capacity.
     """
     try:
         pw = _prepare_password_bytes(plain_password)
@@ -46,7 +61,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             hashed_b = hashed_password.encode("utf-8")
         else:
             hashed_b = hashed_password
-        return bcrypt.checkpw(pw, hashed_b)
+        return hashing_pool.check_password(pw, hashed_b)
+    except HashingOverloaded:
+        raise
     except Exception as e:
         print(f"bcrypt checkpw error: {e}")
         return False
@@ -58,7 +75,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 # method that uses bcrypt under the hood.
 def hash_password(password: str) -> str:
     pw = _prepare_password_bytes(password)
-    return bcrypt.hashpw(pw, bcrypt.gensalt()).decode("utf-8")
+    return hashing_pool.hash_password(pw)
+
+
+def hash_passwords(passwords) -> list:
+    """Hash many passwords in parallel in the bcrypt process pool (each with its own salt)."""
+    return hashing_pool.hash_passwords([_prepare_password_bytes(p) for p in passwords])
 
 
 class _PwdContextCompat:
@@ -74,8 +96,10 @@ pwd_context = _PwdContextCompat()
 def create_access_token(data: dict, expires_delta: datetime.timedelta = None):
     """Create a JWT access token with an optional expiration delta."""
     to_encode = data.copy()
-    expire = datetime.datetime.utcnow() + (expires_delta or datetime.timedelta(minutes=15))
+    now = datetime.datetime.utcnow()
+    expire = now + (expires_delta or datetime.timedelta(minutes=15))
     to_encode.update({"exp": expire})
+    to_encode.setdefault("iat", now)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 class Token(BaseModel):
@@ -96,6 +120,15 @@ def _get_token_from_request(request: Request):
     return None
 
 
+def _principal_from_claims(payload: dict) -> dict:
+    """Build the principal from verified token claims (stateless mode)."""
+    principal = {"id": payload.get("id"), "email": payload["sub"], "role": payload.get("role")}
+    if "employee_id" in payload:
+        principal["employee_id"] = payload["employee_id"]
+        principal["employee_role"] = payload.get("employee_role")
+    return principal
+
+
 def get_current_user(request: Request, response: Response):
     """Get the current user from JWT stored in cookie or Authorization header.
     Also refreshes the cookie expiry (sliding session) on each successful call.
@@ -108,15 +141,39 @@ def get_current_user(request: Request, response: Response):
         email = payload.get("sub")
         if email is None:
             raise HTTPException(status_code=401, detail="Invalid token payload")
+        if revocation.is_revoked(payload):
+            raise HTTPException(status_code=401, detail="Token revoked")
+        if STATELESS_AUTH:
+            return _principal_from_claims(payload)
+        # Tokens issued before "iat" was added are keyed by their expiry instead
+        issued_at = payload.get("iat", payload.get("exp"))
+        user = principal_cache.get(email, issued_at)
+        if user is not None:
+            return user
         query = "SELECT * FROM users WHERE email = %s"
         users = fetch_results(query, (email,))
         if not users:
             raise HTTPException(status_code=404, detail="User not found")
         user = users[0]
+        expires_in = payload["exp"] - datetime.datetime.utcnow().timestamp() if "exp" in payload else None
+        principal_cache.put(email, issued_at, user, expires_in)
         return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# users.role / employee.role values allowed to call the /admin endpoints
+ADMIN_ROLES = ("admin", "hradmin")
+
+
+def require_role(*roles):
+    """Dependency factory: the current user, or 403 unless their role is one of ``roles``."""
+    def dependency(current_user=Depends(get_current_user)):
+        # employee_role is only present on stateless principals
+        if current_user.get("role") not in roles and current_user.get("employee_role") not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return current_user
+    return dependency
+
 @router.post("/login", response_model=Token)
 def login(response: Response, form_data: OAuth2PasswordRequestForm = Depends()):
     """Authenticate a user and return a JWT access token."""
@@ -128,14 +185,19 @@ def login(response: Response, form_data: OAuth2PasswordRequestForm = Depends()):
     try:
         if not verify_password(form_data.password, user['hashed_password']):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
+    except (HTTPException, HashingOverloaded):
+        raise
     except Exception as e:
         print(f"Password verification error for user {user['email']}: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Password verification failed: {str(e)}")
     expires = datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user['email'], "id": user['id'], "role": user['role']},
-        expires_delta=expires
-    )
+    claims = {"sub": user['email'], "id": user['id'], "role": user['role'], **revocation.claims(user['email'])}
+    if STATELESS_AUTH:
+        # Resolve the employee record once here so /me needs no query per call
+        employees = fetch_results("SELECT id, role FROM employee WHERE email = %s", (user['email'],))
+        claims["employee_id"] = employees[0]['id'] if employees else None
+        claims["employee_role"] = employees[0]['role'] if employees else None
+    access_token = create_access_token(data=claims, expires_delta=expires)
     # Do not set cookie; return token only
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -148,6 +210,11 @@ def logout(response: Response):
 @router.get("/me")
 def read_users_me(current_user=Depends(get_current_user)):
     """Get the current user's information from the JWT token, returning the employee id if available."""
+    # Stateless tokens already carry the employee lookup made at login
+    if "employee_id" in current_user:
+        if current_user["employee_id"] is not None:
+            return {"id": current_user["employee_id"], "email": current_user["email"], "role": current_user["employee_role"]}
+        return {"id": current_user["id"], "email": current_user["email"], "role": current_user["role"]}
     # Try to find the employee record matching the user's email
     query = "SELECT id, role, email FROM employee WHERE email = %s"
     employees = fetch_results(query, (current_user['email'],))
@@ -176,7 +243,12 @@ def change_password(data: PasswordChange, current_user=Depends(get_current_user)
     """Change the authenticated user's password.
     Verifies the provided current password and updates the stored hashed password.
     """
-    # current_user is loaded from the users table by get_current_user
+    # current_user is loaded from the users table by get_current_user (claims only in stateless mode)
+    if "hashed_password" not in current_user:
+        users = fetch_results("SELECT * FROM users WHERE email = %s", (current_user['email'],))
+        if not users:
+            raise HTTPException(status_code=404, detail="User not found")
+        current_user = users[0]
     if not verify_password(data.current_password, current_user.get('hashed_password', '')):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Current password incorrect")
     # Don't allow setting the same password as the current one
@@ -189,4 +261,5 @@ def change_password(data: PasswordChange, current_user=Depends(get_current_user)
     except Exception as e:
         print(f"Failed to update password for user {current_user.get('email')}: {e}")
         raise HTTPException(status_code=500, detail="Failed to update password")
+    principal_cache.invalidate(current_user['email'])
     return {"msg": "Password updated successfully"}
@@ -4,27 +4,37 @@ Employee endpoints and models for the HR Management system.
 Handles CRUD operations and search for employees, including skills and training assignments.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi import Body
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import mysql.connector
-from app.database import create_connection, fetch_results
-from app.models.training import add_training, add_training_need, get_employee_training
+from app.database import create_connection, fetch_results, fetch_iter, async_fetch_results, async_read_session, transaction
+from app.streaming import json_stream_response
+from app import employee_import
+from app.skill_catalog import skill_catalog
+from app.recommender_snapshot import recommender_snapshot
+from app.recommendation_cache import recommendation_cache
+from app.model_registry import model_registry
+from app.models.training import add_training, add_training_need, get_employee_training, EMPLOYEE_TRAINING_QUERY
 from app.ml_recommender import HybridRecommender, get_employees, get_trainings, get_employee_skills, get_training_history, get_training_need
-from app.ml_feedback_training import retrain_recommender_on_feedback
+from app.ml_feedback_training import retrain_recommender_on_feedback, retrain_recommender_incremental
 from typing import List, Optional
+import logging
 import threading
 
-def get_employee_skills(employee_id: int):
-    """Fetch all skills for a given employee."""
-    query = '''
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_SKILLS_QUERY = '''
     SELECT s.id, s.preferred_label, es.proficiency_level
     FROM employee_skill es
     JOIN skill s ON es.skill_id = s.id
     WHERE es.employee_id = %s
     '''
-    return fetch_results(query, (employee_id,))
+
+def get_employee_skills(employee_id: int):
+    """Fetch all skills for a given employee."""
+    return fetch_results(EMPLOYEE_SKILLS_QUERY, (employee_id,))
 
 router = APIRouter()
 
@@ -38,16 +48,13 @@ def update_skill_feedback_db(employee_id: int, skill_id: int, vote: str):
     """
     if vote not in ('up', 'down'):
         return {"error": "Invalid vote. Use 'up' or 'down'."}
-    con = create_connection()
-    cursor = con.cursor()
-    # Log the vote in skill_feedback table
-    cursor.execute(
-        "INSERT INTO skill_feedback (employee_id, skill_id, vote) VALUES (%s, %s, %s)",
-        (employee_id, skill_id, vote)
-    )
-    con.commit()
-    cursor.close()
-    con.close()
+    with transaction() as tx:
+        # Log the vote in skill_feedback table
+        tx.execute(
+            "INSERT INTO skill_feedback (employee_id, skill_id, vote) VALUES (%s, %s, %s)",
+            (employee_id, skill_id, vote)
+        )
+    recommendation_cache.employee_changed(employee_id)
     return {"success": True, "skill_id": skill_id, "vote": vote}
 
 def trigger_skill_feedback_ml_async(employee_id: int):
@@ -88,16 +95,8 @@ def skill_feedback(employee_id: int, skill_id: int = Body(...), vote: str = Body
     # REMOVED: Async ML retraining on every feedback (now batch/scheduled only)
     return db_result
 
-# --- ML/AI Calculation Endpoint: Calculate and Insert Skills ---
-@router.post("/ml-calculate-skills/{employee_id}", operation_id="ml_calculate_and_insert_skills")
-def ml_calculate_and_insert_skills(employee_id: int, topn: int = 10):
-    """
-    Run the ML/AI recommender (web/hardcoded/ML logic, no DB filtering),
-    insert any new recommended skills into the DB, and update the score if the skill already exists.
-    Fetches the employee's job title and passes it to the ML recommender.
-    """
-    con = create_connection()
-    from app.database import fetch_results, execute_query
+def _recommend_missing_skills(employee_id: int, topn: int):
+    """Recommended skills for the employee, minus the ones they already have."""
     # Fetch job title and department for the employee
     emp_result = fetch_results("SELECT job_title, department FROM employee WHERE id = %s", (employee_id,))
     if not emp_result or not emp_result[0].get('job_title'):
@@ -109,40 +108,79 @@ def ml_calculate_and_insert_skills(employee_id: int, topn: int = 10):
     recommender = HybridRecommender()
     rec_skills = recommender.fetch_trending_skills_from_web(topn=topn, employee_id=employee_id)
     
-    # Delete old skill_need entries for this employee (clean slate approach)
-    try:
-        execute_query("DELETE FROM skill_need WHERE employee_id = %s", (employee_id,))
-    except Exception as e:
-        print(f"[WARNING] Failed to delete old skill_need entries: {e}")
-    
     # Filter out skills the employee already has
     existing_skills = set(s['preferred_label'].lower() for s in get_employee_skills(employee_id))
     filtered_skills = [s for s in rec_skills if s.get('preferred_label', s.get('name', '')).lower() not in existing_skills]
-    db_skills = fetch_results("SELECT id, preferred_label FROM skill", ())
-    skill_map = { s['preferred_label'].lower(): s for s in db_skills }
-    for s in filtered_skills:
-        key = s.get('preferred_label', s.get('name', '')).lower()
-        if key in skill_map:
-            # Update preferred_label if needed (no score column in schema)
-            try:
-                execute_query("UPDATE skill SET preferred_label = %s WHERE id = %s", (s.get('preferred_label', s.get('name', '')), skill_map[key]['id']))
-            except Exception:
-                pass
-            s['id'] = skill_map[key]['id']
-        else:
-            # Insert new skill (no score column in schema)
-            new_id = execute_query("INSERT INTO skill (preferred_label) VALUES (%s)", (s.get('preferred_label', s.get('name', '')),))
-            s['id'] = new_id
-            skill_map[key] = {"id": new_id, "preferred_label": s.get('preferred_label', s.get('name', ''))}
-        # Insert or update skill_need (recommendation)
-        try:
-            execute_query(
-                "INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s) "
-                "ON DUPLICATE KEY UPDATE recommendation_score = VALUES(recommendation_score)",
-                (s['id'], employee_id, s.get('recommendation_score'))
+    return filtered_skills
+
+# --- ML/AI Calculation Endpoint: Calculate and Insert Skills ---
+@router.post("/ml-calculate-skills/{employee_id}", operation_id="ml_calculate_and_insert_skills")
+def ml_calculate_and_insert_skills(employee_id: int, topn: int = 10):
+    """
+    Run the ML/AI recommender (web/hardcoded/ML logic, no DB filtering),
+    insert any new recommended skills into the DB, and update the score if the skill already exists.
+    Fetches the employee's job title and passes it to the ML recommender.
+    """
+    from app.database import fetch_results, bulk_insert, bulk_upsert
+    # Same model, skill catalog and employee data give the same recommendations;
+    # a hit skips the recommender but still rewrites skill_need below
+    artifacts = model_registry.get()
+    skill_catalog.label_map()
+    model_version = (artifacts.version if artifacts else None, skill_catalog.version)
+    cache_key = recommendation_cache.key("ml-calculate", employee_id, topn, model_version)
+    cached = recommendation_cache.get(cache_key)
+    if cached is not None:
+        filtered_skills = [dict(s) for s in cached]
+    else:
+        filtered_skills = _recommend_missing_skills(employee_id, topn)
+    # Replace the employee's skill_need rows in one transaction so readers never
+    # see the emptied state between the DELETE and the re-insert
+    try:
+        with transaction() as tx:
+            # Delete old skill_need entries for this employee (clean slate approach)
+            tx.execute("DELETE FROM skill_need WHERE employee_id = %s", (employee_id,))
+            skill_map = skill_catalog.label_map()
+            # Insert any recommended skills missing from the catalog in one batch (no score column in schema)
+            new_labels = {}
+            for s in filtered_skills:
+                label = s.get('preferred_label', s.get('name', ''))
+                if label.lower() not in skill_map:
+                    new_labels.setdefault(label.lower(), label)
+            new_rows = {}
+            if new_labels:
+                # Another process may have added some since the catalog's last refresh
+                placeholders = ", ".join(["%s"] * len(new_labels))
+                lookup = f"SELECT id, preferred_label, skill_type FROM skill WHERE preferred_label IN ({placeholders})"
+                found = tx.fetch(lookup, tuple(new_labels.values()))
+                found_keys = {row['preferred_label'].lower() for row in found}
+                missing = [label for key, label in new_labels.items() if key not in found_keys]
+                if missing:
+                    bulk_insert("skill", ("preferred_label",), [(label,) for label in missing])
+                    found = tx.fetch(lookup, tuple(new_labels.values()))
+                for row in found:
+                    new_rows.setdefault(row['preferred_label'].lower(), row)
+            for s in filtered_skills:
+                key = s.get('preferred_label', s.get('name', '')).lower()
+                s['id'] = (skill_map.get(key) or new_rows[key])['id']
+            # Insert or update skill_need (recommendation) rows in one multi-row upsert
+            bulk_upsert(
+                "skill_need",
+                ("skill_id", "employee_id", "recommendation_score"),
+                [(s['id'], employee_id, s.get('recommendation_score')) for s in filtered_skills],
+                update_columns=("recommendation_score",),
             )
-        except Exception as e:
-            print(f"Failed to insert/update skill_need: {e}")
+    except Exception:
+        # The transaction was rolled back, so the previous recommendations are kept
+        logger.exception("Failed to replace skill_need rows for employee %s", employee_id)
+        raise HTTPException(status_code=500, detail="Failed to save skill recommendations")
+    # Only publish new skills to the catalog once they are committed
+    skill_catalog.add(new_rows.values())
+    recommender_snapshot.skill_needs_replaced(
+        employee_id, [(s['id'], s.get('recommendation_score')) for s in filtered_skills]
+    )
+    recommendation_cache.skill_need_changed(employee_id)
+    if cached is None:
+        recommendation_cache.put(cache_key, [dict(s) for s in filtered_skills])
     # Placeholder: collect user feedback on recommendations (future work)
     # e.g., store feedback in a table, or log for analysis
     #print(f"[DEBUG] Final recommended skills (after filtering): {filtered_skills}")
@@ -154,29 +192,24 @@ def db_only_skills(employee_id: int, topn: int = 10):
     """
     Read and return skills from the DB only (no ML/AI logic).
     """
-    con = create_connection()
     # Get all skills from DB
     db_skills = fetch_results("SELECT id, preferred_label FROM skill LIMIT %s", (topn,))
     return {"db_skills": db_skills}
 
 @router.get("/{employee_id}", operation_id="get_employee_by_id")
-def get_employee_by_id(employee_id: int):
+async def get_employee_by_id(employee_id: int):
     """Get a single employee by ID, including skills and ongoing trainings."""
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM employee WHERE id = %s", (employee_id,))
-    employee = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
-    # Fetch skills for this employee
-    skills = get_employee_skills(employee_id)
-    employee["skills"] = skills
-    # Fetch ongoing trainings for this employee
-    from app.models.training import get_employee_training
     import datetime
-    trainings = get_employee_training(employee_id)
+    # One read connection serves the employee, skills and trainings lookups
+    async with async_read_session() as tx:
+        employee_rows = await tx.fetch("SELECT * FROM employee WHERE id = %s", (employee_id,))
+        if not employee_rows:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        skills = await tx.fetch(EMPLOYEE_SKILLS_QUERY, (employee_id,))
+        trainings = await tx.fetch(EMPLOYEE_TRAINING_QUERY, (employee_id,))
+    employee = employee_rows[0]
+    employee["skills"] = skills
+    # Keep only ongoing trainings for this employee
     today = datetime.date.today()
     ongoing = []
     for t in trainings:
@@ -190,7 +223,7 @@ def get_employee_by_id(employee_id: int):
     return employee
 
 
-from app.models.auth import pwd_context
+from app.models.auth import pwd_context, principal_cache
 
 class Employee(BaseModel):
     """Request/response model for employee records."""
@@ -206,11 +239,11 @@ class Employee(BaseModel):
 
 def insert_employee(employee: Employee):
     """Insert a new employee into the database, with default password '1234' hashed."""
-    conn = create_connection()
-    cursor = conn.cursor()
-    # Hash the default password
+    # Hash the default password before taking a connection so the pool slot isn't held during bcrypt
     default_password = "1234"
     hashed_password = pwd_context.hash(default_password)
+    conn = create_connection()
+    cursor = conn.cursor()
     query = """
     INSERT INTO employee (first_name, last_name, email, hire_date, department, job_title, details, hashed_password)
     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
@@ -232,16 +265,25 @@ def create_employee(employee: Employee):
         raise HTTPException(status_code=400, detail=f"Error: {e}")
 
 
+@router.post("/import")
+async def import_employees(request: Request, format: Optional[str] = Query(None, enum=["csv", "jsonl"])):
+    """Bulk-create employees from a CSV (with header) or JSON Lines request body.
+
+    The body is streamed and processed in chunks; every new employee gets the
+    default password '1234'. Returns counts and per-row errors.
+    """
+    fmt = format
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = "jsonl" if "json" in content_type else "csv"
+    report = await employee_import.import_employees(request.stream(), fmt, Employee)
+    return report.as_dict()
+
+
 @router.get("/", operation_id="get_all_employees")
 def get_employee():
-    """Get all employees."""
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM employee")
-    employee = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return {"employee": employee}
+    """Get all employees (streamed, so large tables are never held in memory)."""
+    return json_stream_response(fetch_iter("SELECT * FROM employee"), key="employee")
 
 
 @router.put("/{employee_id}")
@@ -259,6 +301,10 @@ def update_employee(employee_id: int, employee: Employee):
     conn.commit()
     cursor.close()
     conn.close()
+    # The previous email is not known here, so drop every cached principal
+    principal_cache.invalidate()
+    # The job title may have changed
+    recommendation_cache.employee_changed(employee_id)
     return {"message": "Employee updated successfully"}
 
 
@@ -271,6 +317,9 @@ def delete_employee(employee_id: int):
     conn.commit()
     cursor.close()
     conn.close()
+    principal_cache.invalidate()
+    recommender_snapshot.employee_removed(employee_id)
+    recommendation_cache.invalidate(employee_id)
     return {"message": "Employee deleted successfully"}
 
 
@@ -346,22 +395,23 @@ class SuggestedSkillsResponse(BaseModel):
 
 
 @router.get("/{employee_id}/suggested-skills", response_model=SuggestedSkillsResponse, operation_id="get_suggested_skills")
-def get_suggested_skills(employee_id: int):
+async def get_suggested_skills(employee_id: int):
     """
     Return the current recommended skills for the employee from the skill_need table (DB-driven, not ML-generated).
     """
-    con = create_connection()
-    cursor = con.cursor(dictionary=True)
-    cursor.execute("""
+    cache_key = recommendation_cache.key(
+        "suggested-skills", employee_id, None, model_registry.current_version(), with_skill_need=True
+    )
+    cached = recommendation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    skills = await async_fetch_results("""
         SELECT s.id as skill_id, s.preferred_label as skill_name, s.skill_type, sn.recommendation_score as score
         FROM skill_need sn
         JOIN skill s ON sn.skill_id = s.id
         WHERE sn.employee_id = %s
         ORDER BY sn.recommendation_score DESC
     """, (employee_id,))
-    skills = cursor.fetchall()
-    cursor.close()
-    con.close()
     suggested_skills = [
         SuggestedSkill(
             skill_id=rec['skill_id'],
@@ -371,14 +421,18 @@ def get_suggested_skills(employee_id: int):
         )
         for rec in skills
     ]
-    return SuggestedSkillsResponse(suggested_skills=suggested_skills)
+    response = SuggestedSkillsResponse(suggested_skills=suggested_skills)
+    recommendation_cache.put(cache_key, response)
+    return response
 
 
 @router.post("/admin/retrain-recommender", tags=["admin"])
-def admin_retrain_recommender(topn: int = 5):
+def admin_retrain_recommender(topn: int = 5, incremental: bool = False):
     """
     Admin-only endpoint to manually trigger ML model retrain.
     Trains model on ESCO data + feedback and saves trained artifacts.
+    With ``incremental=true`` only the labels touched by feedback since the last
+    retrain are refitted (falling back to a full retrain when needed).
     Skills are calculated per-employee when the 'Calculate' button is clicked.
     
     Returns:
@@ -388,7 +442,10 @@ def admin_retrain_recommender(topn: int = 5):
     """
     from datetime import datetime
     try:
-        retrain_recommender_on_feedback(employee_id=None, topn=topn)
+        if incremental:
+            retrain_recommender_incremental(topn=topn)
+        else:
+            retrain_recommender_on_feedback(employee_id=None, topn=topn)
         return JSONResponse(
             status_code=200,
             content={
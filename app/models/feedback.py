@@ -8,7 +8,10 @@ from fastapi import APIRouter, HTTPException, Body, Request
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date
-from app.database.database import execute_query, fetch_results
+from app.database.database import execute_query, fetch_results, fetch_iter
+from app.database.async_database import fetch_results as async_fetch_results
+from app.streaming import json_stream_response
+from fastapi.encoders import jsonable_encoder
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 router = APIRouter()
@@ -31,6 +34,11 @@ class FeedbackOut(BaseModel):
     comments: Optional[str]
 
 
+def _encode_feedback(row):
+    """Validate a feedback row against FeedbackOut and return its JSON form."""
+    return jsonable_encoder(FeedbackOut(**dict(row)))
+
+
 @router.post("/", response_model=None)
 def create_feedback(feedback: FeedbackCreate):
     """Create a new feedback record. Calculates sentiment if comments are provided."""
@@ -49,19 +57,18 @@ def create_feedback(feedback: FeedbackCreate):
 
 
 @router.get("/{employee_id}", response_model=List[FeedbackOut])
-def get_feedback_for_employee(employee_id: int):
+async def get_feedback_for_employee(employee_id: int):
     """Get all feedback for a specific employee, most recent first."""
     query = "SELECT * FROM feedback WHERE employee_id = %s ORDER BY feedback_date DESC"
-    results = fetch_results(query, (employee_id,))
+    results = await async_fetch_results(query, (employee_id,))
     return [FeedbackOut(**dict(row)) for row in results]
 
 
 @router.get("/", response_model=List[FeedbackOut])
 def get_all_feedback():
-    """Get all feedback records, most recent first."""
+    """Get all feedback records, most recent first (streamed row by row)."""
     query = "SELECT * FROM feedback ORDER BY feedback_date DESC"
-    results = fetch_results(query)
-    return [FeedbackOut(**dict(row)) for row in results]
+    return json_stream_response(fetch_iter(query), encode=_encode_feedback)
 
 
 # Cleaned up: Only one set of imports, router, models, endpoints, and /sentiment endpoint
@@ -69,7 +76,10 @@ from fastapi import APIRouter, HTTPException, Body, Request
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date
-from app.database.database import execute_query, fetch_results
+from app.database.database import execute_query, fetch_results, fetch_iter
+from app.database.async_database import fetch_results as async_fetch_results
+from app.streaming import json_stream_response
+from fastapi.encoders import jsonable_encoder
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 router = APIRouter()
@@ -87,6 +97,10 @@ class FeedbackOut(BaseModel):
     sentiment_score: Optional[float]
     comments: Optional[str]
 
+def _encode_feedback(row):
+    """Validate a feedback row against FeedbackOut and return its JSON form."""
+    return jsonable_encoder(FeedbackOut(**dict(row)))
+
 @router.post("/", response_model=None)
 def create_feedback(feedback: FeedbackCreate):
     # Calculate sentiment using VADER
@@ -103,16 +117,15 @@ def create_feedback(feedback: FeedbackCreate):
     return {"message": "Feedback submitted successfully."}
 
 @router.get("/{employee_id}", response_model=List[FeedbackOut])
-def get_feedback_for_employee(employee_id: int):
+async def get_feedback_for_employee(employee_id: int):
     query = "SELECT * FROM feedback WHERE employee_id = %s ORDER BY feedback_date DESC"
-    results = fetch_results(query, (employee_id,))
+    results = await async_fetch_results(query, (employee_id,))
     return [FeedbackOut(**dict(row)) for row in results]
 
 @router.get("/", response_model=List[FeedbackOut])
 def get_all_feedback():
     query = "SELECT * FROM feedback ORDER BY feedback_date DESC"
-    results = fetch_results(query)
-    return [FeedbackOut(**dict(row)) for row in results]
+    return json_stream_response(fetch_iter(query), encode=_encode_feedback)
 
 
 @router.post("/sentiment")
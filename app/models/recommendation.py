@@ -7,8 +7,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from app.ml_recommender import HybridRecommender, get_employees, get_trainings, get_employee_skills, get_training_history, get_training_need
-from app.database import create_connection
+from app.database import fetch_results
+from app.recommender_snapshot import recommender_snapshot
 
 router = APIRouter()
 
@@ -28,32 +28,30 @@ class RecommendationResponse(BaseModel):
 
 @router.get("/recommendations/{employee_id}", response_model=RecommendationResponse)
 def get_recommendations(employee_id: int, topn: int = 5):
-    con = create_connection()
-    employees = get_employees(con)
-    trainings = get_trainings(con)
-    employee_skills = get_employee_skills(con)
-    training_need = get_training_need(con)
-    training_history = get_training_history(con)
-    if employee_id not in set(employees['id']):
-        raise HTTPException(status_code=404, detail="Employee not found")
-    recommender = HybridRecommender()
-    recommender.fit(employees, trainings, employee_skills, training_history, training_need)
-    recommended = recommender.recommend(employee_id, topn=topn)
+    # Score against the shared fitted snapshot instead of reloading every table and refitting
+    recommender = recommender_snapshot.get()
+    if not recommender.has_employee(employee_id):
+        # Employees created since the snapshot was fitted join it with an empty history
+        if not fetch_results("SELECT id FROM employee WHERE id = %s", (employee_id,)):
+            raise HTTPException(status_code=404, detail="Employee not found")
+        recommender_snapshot.employee_added(employee_id)
+        recommender = recommender_snapshot.get()
+    recommended = recommender.recommend_trainings(employee_id, topn=topn)
     # Map scores to training info
-    id_to_score = {r['id']: r.get('recommendation_score', r.get('score', 0.0)) for r in recommended}
-    recommended_trainings = trainings[trainings['id'].isin(id_to_score.keys())].copy()
-    recommended_trainings['recommendation_score'] = recommended_trainings['id'].map(id_to_score)
+    id_to_score = {r['id']: r['recommendation_score'] for r in recommended}
+    rows = []
+    if id_to_score:
+        placeholders = ", ".join(["%s"] * len(id_to_score))
+        rows = fetch_results(
+            f"SELECT id, title, description, start_date, end_date, category FROM training WHERE id IN ({placeholders})",
+            tuple(id_to_score),
+        )
     # Sort by score descending
-    recommended_trainings = recommended_trainings.sort_values('recommendation_score', ascending=False)
+    rows.sort(key=lambda d: id_to_score.get(d['id'], 0.0), reverse=True)
     # Ensure every training has a recommendation_score (default 0.0 if missing)
     result = []
-    for row in recommended_trainings.itertuples(index=False):
-        d = row._asdict() if hasattr(row, '_asdict') else dict(zip(row._fields, row))
+    for d in rows:
         d['recommendation_score'] = float(id_to_score.get(d['id'], 0.0))
-        # Ensure all required fields for TrainingRecommendation
-        for field in ['description', 'start_date', 'end_date']:
-            if field not in d:
-                d[field] = None
         # Convert date fields to string if they are date objects
         for date_field in ['start_date', 'end_date']:
             if d[date_field] is not None and hasattr(d[date_field], 'isoformat'):
@@ -7,7 +7,8 @@ Handles CRUD operations for skills.
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import mysql.connector
-from app.database import create_connection
+from app.database import create_connection, async_fetch_results
+from app.skill_catalog import skill_catalog
 
 router = APIRouter()
 
@@ -31,8 +32,10 @@ def insert_skill(skill: Skill):
     values = (skill.preferred_label, skill.skill_type, skill.reuse_level, skill.alt_labels)
     cursor.execute(query, values)
     conn.commit()
+    skill_id = cursor.lastrowid
     cursor.close()
     conn.close()
+    skill_catalog.add([{"id": skill_id, "preferred_label": skill.preferred_label, "skill_type": skill.skill_type}])
 
 
 @router.post("/")
@@ -49,23 +52,16 @@ def create_skill(skill: Skill):
 from fastapi import Query
 
 @router.get("/")
-def get_skills(limit: int = Query(50, ge=1, le=100)):
+async def get_skills(limit: int = Query(50, ge=1, le=100)):
     """Get up to 'limit' skills (default 50, max 100)."""
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT id, preferred_label, skill_type, reuse_level, alt_labels FROM skill LIMIT %s", (limit,))
-    skills = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    skills = await async_fetch_results("SELECT id, preferred_label, skill_type, reuse_level, alt_labels FROM skill LIMIT %s", (limit,))
     return {"skills": skills}
 
 @router.get("/search")
-def search_skills(q: str):
+async def search_skills(q: str):
     """Search skills by preferred_label or alt_labels (case-insensitive, partial match), up to 25 results."""
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
     like = f"%{q}%"
-    cursor.execute(
+    skills = await async_fetch_results(
         """
         SELECT id, preferred_label, skill_type, reuse_level, alt_labels
         FROM skill
@@ -74,7 +70,4 @@ def search_skills(q: str):
         """,
         (like, like)
     )
-    skills = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return {"skills": skills}
\ No newline at end of file
+    return {"skills": skills}
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from typing import List, Dict
 from app.models.skill import get_skills
 from app.database import fetch_results
+from app.recommender_snapshot import recommender_snapshot
 
 router = APIRouter()
 
@@ -199,12 +200,14 @@ def assign_employee_to_training(employee_id, training_id):
     query = "INSERT INTO employee_training (employee_id, training_id) VALUES (%s, %s)"
     values = (employee_id, training_id)
     execute_query(query, values)
+    recommender_snapshot.training_assigned(employee_id, training_id)
 
 def remove_employee_from_training(employee_id, training_id):
     """Remove an employee from a training in the database."""
     query = "DELETE FROM employee_training WHERE employee_id = %s AND training_id = %s"
     values = (employee_id, training_id)
     execute_query(query, values)
+    recommender_snapshot.training_unassigned(employee_id, training_id)
 
 def assign_trainer_to_training(trainer_id, training_id):
     """Assign a trainer to a training in the database."""
@@ -255,13 +258,14 @@ def get_all_trainings():
     results = fetch_results(query)
     return results
 
-def get_employee_training(employee_id):
-    """Fetch all trainings assigned to a specific employee."""
-    query = """
+EMPLOYEE_TRAINING_QUERY = """
     SELECT t.id AS training_id, t.title, t.description, t.start_date, t.end_date, t.category
     FROM training t
     INNER JOIN employee_training et ON t.id = et.training_id
     WHERE et.employee_id = %s
     """
-    results = fetch_results(query, (employee_id,))
+
+def get_employee_training(employee_id):
+    """Fetch all trainings assigned to a specific employee."""
+    results = fetch_results(EMPLOYEE_TRAINING_QUERY, (employee_id,))
     return results
@@ -0,0 +1,163 @@
+"""
+Precomputed occupation -> skills index for the recommender's CSV fallback.
+
+``occupationSkillRelations_en.csv`` is parsed once into a compact NumPy
+archive (no pickles): every distinct skill and occupation label is stored
+once as UTF-8 bytes plus offsets, and each occupation's skills as a run of
+int32 ids in CSV order. Loading it takes milliseconds, after which a lookup
+is a dict access and fuzzy matching runs over a prebuilt choice list
+instead of ``df['occupationLabel'].unique()``.
+
+The index is rebuilt automatically when the CSV is newer than it, or with
+``scripts/build_occupation_index.py``.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import process
+except ImportError:
+    process = None
+
+from app.mmap_artifacts import pack_strings
+from app.model_registry import DATA_DIR, atomic_file
+
+CSV_PATH = os.path.join(DATA_DIR, 'occupationSkillRelations_en.csv')
+INDEX_PATH = os.path.join(DATA_DIR, 'occupation_skill_index.npz')
+
+# Minimum rapidfuzz score for using the closest occupation's skills
+LOW_CONFIDENCE = 80
+
+
+def _unpack(buffer, offsets):
+    data = buffer.tobytes()
+    return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def normalize(label):
+    return label.lower().strip() if isinstance(label, str) else ""
+
+
+class OccupationSkillIndex:
+    """Occupation label -> ordered skill labels, with normalized lookup and fuzzy matching."""
+
+    def __init__(self, skill_labels, occupation_labels, skill_offsets, skill_ids):
+        self.skill_labels = skill_labels
+        self.occupation_labels = occupation_labels
+        self._skill_offsets = skill_offsets
+        self._skill_ids = skill_ids
+        self._by_label = {label: i for i, label in enumerate(occupation_labels)}
+        self._by_norm = {}
+        for i, label in enumerate(occupation_labels):
+            self._by_norm.setdefault(normalize(label), []).append(i)
+        # Choice list for fuzzy matching, built once
+        self.choices = occupation_labels
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build from a DataFrame with ``occupationLabel`` and ``skillLabel`` columns."""
+        df = df.dropna(subset=['occupationLabel', 'skillLabel'])
+        occ_codes, occupation_labels = pd.factorize(df['occupationLabel'], sort=False)
+        skill_codes, skill_labels = pd.factorize(df['skillLabel'], sort=False)
+        # Stable sort keeps each occupation's skills in CSV order
+        order = np.argsort(occ_codes, kind="stable")
+        counts = np.bincount(occ_codes, minlength=len(occupation_labels))
+        offsets = np.zeros(len(occupation_labels) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(list(skill_labels), list(occupation_labels), offsets, skill_codes[order].astype(np.int32))
+
+    @classmethod
+    def build(cls, csv_path=CSV_PATH):
+        return cls.from_frame(pd.read_csv(csv_path, usecols=['occupationLabel', 'skillLabel']))
+
+    def save(self, path=INDEX_PATH):
+        skill_buf, skill_off = pack_strings(self.skill_labels)
+        occ_buf, occ_off = pack_strings(self.occupation_labels)
+        # Unique temp file: several workers may build the index on a cold start
+        with atomic_file(path) as f:
+            np.savez(
+                f,
+                skill_buf=skill_buf, skill_off=skill_off, occ_buf=occ_buf, occ_off=occ_off,
+                skill_offsets=self._skill_offsets, skill_ids=self._skill_ids,
+            )
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                _unpack(data["skill_buf"], data["skill_off"]),
+                _unpack(data["occ_buf"], data["occ_off"]),
+                data["skill_offsets"],
+                data["skill_ids"],
+            )
+
+    def _skills_of(self, occ):
+        ids = self._skill_ids[self._skill_offsets[occ]:self._skill_offsets[occ + 1]]
+        return [self.skill_labels[i] for i in ids]
+
+    def skills_for(self, job_title_norm):
+        """Skills of every occupation whose normalized label equals ``job_title_norm``."""
+        skills = []
+        for occ in self._by_norm.get(job_title_norm, ()):
+            skills.extend(self._skills_of(occ))
+        return skills
+
+    def skills_for_label(self, occupation_label):
+        occ = self._by_label.get(occupation_label)
+        return [] if occ is None else self._skills_of(occ)
+
+    def lookup(self, job_title_norm, topn):
+        """Direct match on the normalized title, else the closest occupation above LOW_CONFIDENCE."""
+        direct = self.skills_for(job_title_norm)
+        if direct:
+            return direct[:topn]
+        if process is None or not self.choices:
+            return []
+        matches = process.extract(job_title_norm, self.choices, limit=5)
+        match, score, _ = matches[0]
+        if score >= LOW_CONFIDENCE:
+            return self.skills_for_label(match)[:topn]
+        return []
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_occupation_index(csv_path=CSV_PATH, index_path=INDEX_PATH):
+    """Return the process-wide index, loading (or building and persisting) it on first use.
+
+    Returns None when neither the index nor the CSV is available.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            _index = _load_or_build(csv_path, index_path)
+    return _index
+
+
+def _load_or_build(csv_path, index_path):
+    csv_mtime = os.path.getmtime(csv_path) if os.path.exists(csv_path) else None
+    if os.path.exists(index_path) and (csv_mtime is None or os.path.getmtime(index_path) >= csv_mtime):
+        return OccupationSkillIndex.load(index_path)
+    if csv_mtime is None:
+        return None
+    index = OccupationSkillIndex.build(csv_path)
+    try:
+        index.save(index_path)
+    except OSError as e:
+        print(f"[WARNING] Could not persist occupation index to {index_path}: {e}")
+    return index
+
+
+def reset_occupation_index():
+    """Forget the loaded index (e.g. after rebuilding it on disk)."""
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,203 @@
+"""
+Label-sharded parallel training of the skill recommender's one-vs-rest model.
+
+``OneVsRestClassifier`` fits one binary estimator per skill label, one after
+the other. ``fit_one_vs_rest`` produces the same fitted classifier (same
+label binarizer, same per-label estimators in the same order) but splits the
+labels into shards fitted by a process pool. The TF-IDF matrix and the
+binarized labels are written once as ``.npy`` files and memory-mapped
+read-only by every worker, so workers share the page cache instead of each
+receiving a pickled copy; only the small per-shard estimators travel back.
+
+Environment:
+  TRAIN_WORKERS: worker processes (default 1, i.e. serial in-process)
+  TRAIN_SHARD_SIZE: labels per task (default 256)
+  TRAIN_MAX_MEMORY_MB: cap on the estimated peak memory of all workers; the
+      pool is shrunk to fit (default 0, no cap)
+  TRAIN_START_METHOD: multiprocessing start method (default spawn)
+  TRAIN_TMP_DIR: where the shared arrays are written (default system temp;
+      /dev/shm keeps them in RAM)
+"""
+
+import inspect
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, clone
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.preprocessing import LabelBinarizer
+
+try:
+    # The same per-label fit OneVsRestClassifier.fit uses, so both paths give identical estimators
+    from sklearn.multiclass import _fit_binary
+except ImportError:  # private helper; _fit_label below reproduces it if a release drops it
+    _fit_binary = None
+# fit_params became a required argument of _fit_binary in scikit-learn 1.4
+_FIT_BINARY_KWARGS = (
+    {"fit_params": {}} if _fit_binary is not None and "fit_params" in inspect.signature(_fit_binary).parameters else {}
+)
+
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", "1"))
+TRAIN_SHARD_SIZE = int(os.getenv("TRAIN_SHARD_SIZE", "256"))
+TRAIN_MAX_MEMORY_MB = float(os.getenv("TRAIN_MAX_MEMORY_MB", "0"))
+TRAIN_START_METHOD = os.getenv("TRAIN_START_METHOD", "spawn")
+TRAIN_TMP_DIR = os.getenv("TRAIN_TMP_DIR") or None
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5.0
+
+# Worker-process state, set by _init_worker
+_shared = {}
+
+
+def _save_csr(directory, name, matrix):
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(directory, f"{name}_{part}.npy"), getattr(matrix, part), allow_pickle=False)
+
+
+def _load_csr(directory, name, shape, cls):
+    parts = [np.load(os.path.join(directory, f"{name}_{part}.npy"), mmap_mode="r") for part in ("data", "indices", "indptr")]
+    return cls(tuple(parts), shape=shape)
+
+
+def _init_worker(directory, x_shape, y_shape, estimator, classes):
+    _shared["X"] = _load_csr(directory, "X", x_shape, sparse.csr_matrix)
+    _shared["Y"] = _load_csr(directory, "Y", y_shape, sparse.csc_matrix)
+    _shared["estimator"] = estimator
+    _shared["classes"] = classes
+
+
+class _ConstantLabel(BaseEstimator):
+    """Predicts the only value a label took in training, like sklearn's private _ConstantPredictor."""
+
+    def fit(self, X, y):
+        self.y_ = np.asarray(y)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def predict(self, X):
+        return np.repeat(self.y_, X.shape[0])
+
+    def decision_function(self, X):
+        return np.repeat(self.y_, X.shape[0])
+
+    def predict_proba(self, X):
+        y_ = self.y_.astype(np.float64)
+        return np.repeat([np.hstack([1 - y_, y_])], X.shape[0], axis=0)
+
+
+def _fit_label(estimator, X, y, classes):
+    if _fit_binary is not None:
+        return _fit_binary(estimator, X, y, classes=classes, **_FIT_BINARY_KWARGS)
+    unique_y = np.unique(y)
+    if len(unique_y) == 1:
+        return _ConstantLabel().fit(X, unique_y)
+    return clone(estimator).fit(X, y)
+
+
+def _fit_labels(X, Y, estimator, classes, start, stop):
+    return [
+        _fit_label(estimator, X, Y[:, i].toarray().ravel(), ["not %s" % classes[i], classes[i]])
+        for i in range(start, stop)
+    ]
+
+
+def _fit_shard(start, stop):
+    s = _shared
+    return start, _fit_labels(s["X"], s["Y"], s["estimator"], s["classes"], start, stop)
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process plus its largest finished child (Linux reports KiB); 0 where unavailable."""
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return 0.0
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return (own + children) / 1024
+
+
+def estimate_worker_memory_mb(X, shard_size):
+    """Rough peak of one worker: liblinear's private copy of X (16 bytes per nonzero) plus a shard's coefficients."""
+    return (X.nnz * 16 + shard_size * X.shape[1] * 8) / (1024 * 1024)
+
+
+def fit_label_estimators(estimator, X, Y, classes, workers=TRAIN_WORKERS, shard_size=TRAIN_SHARD_SIZE,
+                         max_memory_mb=TRAIN_MAX_MEMORY_MB, progress=print):
+    """
+    Fit one binary estimator per column of the label indicator matrix ``Y``
+    (``classes[i]`` names column ``i``), in column order, over ``workers`` processes.
+    ``progress`` receives status lines (None silences them).
+    """
+    progress = progress or (lambda *_: None)
+    X = sparse.csr_matrix(X)
+    Y = sparse.csc_matrix(Y)
+    n_labels = Y.shape[1]
+    if n_labels == 0:
+        return []
+    shard_size = max(1, shard_size)
+    shards = [(start, min(start + shard_size, n_labels)) for start in range(0, n_labels, shard_size)]
+    workers = max(1, min(workers, len(shards)))
+    if max_memory_mb > 0:
+        per_worker = estimate_worker_memory_mb(X, shard_size)
+        allowed = max(1, int(max_memory_mb // max(per_worker, 1e-9)))
+        if allowed < workers:
+            progress(f"[Retrain]   Memory cap {max_memory_mb:.0f} MB allows {allowed} worker(s) (~{per_worker:.0f} MB each)")
+            workers = allowed
+    progress(f"[Retrain]   Fitting {n_labels} labels in {len(shards)} shard(s) on {workers} worker(s)")
+
+    start_time = time.monotonic()
+    results = {}
+    if workers == 1:
+        last_report = start_time
+        for start, stop in shards:
+            results[start] = _fit_labels(X, Y, estimator, classes, start, stop)
+            if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                done = sum(len(r) for r in results.values())
+                progress(f"[Retrain]   {done}/{n_labels} labels ({done * 100 // n_labels}%), peak RSS {_peak_rss_mb():.0f} MB")
+    else:
+        with tempfile.TemporaryDirectory(prefix="ovr-train-", dir=TRAIN_TMP_DIR) as directory:
+            _save_csr(directory, "X", X)
+            _save_csr(directory, "Y", Y)
+            context = multiprocessing.get_context(TRAIN_START_METHOD)
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker,
+                initargs=(directory, X.shape, Y.shape, estimator, classes),
+            ) as pool:
+                futures = [pool.submit(_fit_shard, start, stop) for start, stop in shards]
+                last_report = start_time
+                for future in as_completed(futures):
+                    start, estimators = future.result()
+                    results[start] = estimators
+                    if time.monotonic() - last_report >= PROGRESS_INTERVAL or len(results) == len(shards):
+                        last_report = time.monotonic()
+                        done = sum(len(r) for r in results.values())
+                        progress(f"[Retrain]   {done}/{n_labels} labels ({done * 100 // n_labels}%), "
+                                 f"peak RSS {_peak_rss_mb():.0f} MB")
+
+    progress(f"[Retrain]   Fitted {n_labels} labels in {time.monotonic() - start_time:.1f}s")
+    return [est for start, _ in shards for est in results[start]]
+
+
+def fit_one_vs_rest(estimator, X, Y, workers=TRAIN_WORKERS, shard_size=TRAIN_SHARD_SIZE,
+                    max_memory_mb=TRAIN_MAX_MEMORY_MB, progress=print):
+    """
+    Fit ``OneVsRestClassifier(estimator)`` on ``X`` and the label indicator matrix ``Y``.
+    Equivalent to ``OneVsRestClassifier(estimator).fit(X, Y)``, with labels fitted in
+    ``workers`` processes.
+    """
+    clf = OneVsRestClassifier(estimator)
+    clf.label_binarizer_ = LabelBinarizer(sparse_output=True)
+    Y = clf.label_binarizer_.fit_transform(Y).tocsc()
+    clf.classes_ = clf.label_binarizer_.classes_
+    clf.estimators_ = fit_label_estimators(estimator, X, Y, clf.classes_, workers, shard_size, max_memory_mb, progress)
+    if hasattr(clf.estimators_[0], "n_features_in_"):
+        clf.n_features_in_ = clf.estimators_[0].n_features_in_
+    return clf
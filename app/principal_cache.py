@@ -0,0 +1,40 @@
+"""
+Bounded cache of authenticated principals for the HR Management API.
+
+``get_current_user`` resolves the ``users`` row for a JWT on every protected
+request. ``PrincipalCache`` keeps recently resolved rows keyed by the token's
+subject and issue time, evicting least-recently-used entries beyond
+``maxsize`` and expiring entries after ``ttl`` seconds (or when the token
+itself expires). Entries for a subject are dropped when the user changes.
+"""
+
+from app.ttl_cache import TTLCache
+
+
+class PrincipalCache(TTLCache):
+    """Thread-safe TTL + LRU cache of principals keyed by ``(subject, issued_at)``.
+
+    Args:
+        maxsize: maximum number of cached principals; 0 disables the cache.
+        ttl: seconds an entry stays valid after it was loaded.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        super().__init__(maxsize, ttl)
+
+    def get(self, subject, issued_at):
+        """Return a copy of the cached principal, or None on a miss."""
+        principal = super().get((subject, issued_at))
+        return dict(principal) if principal is not None else None
+
+    def put(self, subject, issued_at, principal, token_expires_in=None):
+        """Cache ``principal``; it never outlives the token (``token_expires_in`` seconds)."""
+        super().put((subject, issued_at), dict(principal), token_expires_in)
+
+    def invalidate(self, subject=None):
+        """Drop every entry for ``subject``, or the whole cache when no subject is given."""
+        if subject is None:
+            self.clear()
+            return
+        with self._lock:
+            self._drop_locked(lambda key: key[0] == subject)
@@ -0,0 +1,100 @@
+"""
+Bounded cache of per-employee skill recommendation results.
+
+``GET /employee/{id}/suggested-skills`` and
+``POST /employee/ml-calculate-skills/{id}`` are keyed by
+``(kind, employee_id, topn, model_version, employee_data_version)``.
+The data version is a per-employee counter bumped whenever the inputs change
+(job title, ``employee_skill``, ``skill_feedback``), plus a separate counter
+for ``skill_need`` for the results that read it. Callers build the key before
+computing, so a result computed from data that changed meanwhile is stored
+under a key that is never looked up again. A retrain changes the model
+version and therefore every key; the ML skill endpoint also keys on the
+skill catalog version, so cached skill ids follow catalog reloads. Counters are per process; ``ttl`` bounds
+how long another worker's writes can go unseen.
+
+Versions are drawn from one process-wide clock and only the ``maxsize``
+most recently changed employees keep their own; employees without one use
+the clock value at the last time a version was dropped, which is newer
+than any change they had.
+"""
+
+import os
+from collections import OrderedDict
+
+from app.ttl_cache import TTLCache
+
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "4096"))
+RECOMMENDATION_CACHE_TTL = float(os.getenv("RECOMMENDATION_CACHE_TTL", "300"))
+
+
+class RecommendationCache(TTLCache):
+    """Thread-safe TTL + LRU cache of recommendation results with data-version keys.
+
+    Args:
+        maxsize: maximum number of cached results (and of per-employee data
+            versions tracked); 0 disables the cache.
+        ttl: seconds a result stays valid after it was computed.
+    """
+
+    def __init__(self, maxsize=RECOMMENDATION_CACHE_SIZE, ttl=RECOMMENDATION_CACHE_TTL):
+        super().__init__(maxsize, ttl)
+        self._epoch = 0
+        # Version clock, and the version of employees whose own version was dropped
+        self._clock = 0
+        self._version_floor = 0
+        self._input_versions = OrderedDict()
+        self._skill_need_versions = OrderedDict()
+
+    def data_version(self, employee_id, with_skill_need=False):
+        with self._lock:
+            version = (self._epoch, self._input_versions.get(employee_id, self._version_floor))
+            if with_skill_need:
+                version += (self._skill_need_versions.get(employee_id, self._version_floor),)
+        return version
+
+    def key(self, kind, employee_id, topn, model_version, with_skill_need=False):
+        """Cache key for a result; take it before computing the result."""
+        return (kind, employee_id, topn, model_version, self.data_version(employee_id, with_skill_need))
+
+    def _bump_locked(self, versions, employee_id):
+        self._clock += 1
+        versions[employee_id] = self._clock
+        versions.move_to_end(employee_id)
+        while len(versions) > self.maxsize:
+            versions.popitem(last=False)
+            # Forgotten employees all move to the current clock, past any version they had
+            self._version_floor = self._clock
+
+    def employee_changed(self, employee_id):
+        """The employee's job title, skills or skill feedback changed."""
+        with self._lock:
+            self._bump_locked(self._input_versions, employee_id)
+            self._drop_locked(lambda key: key[1] == employee_id)
+
+    def skill_need_changed(self, employee_id):
+        """The employee's skill_need rows were rewritten."""
+        with self._lock:
+            self._bump_locked(self._skill_need_versions, employee_id)
+            self._drop_locked(lambda key: key[1] == employee_id and len(key[4]) == 3)
+
+    def invalidate(self, employee_id=None):
+        """Drop the employee's results, or every result when no employee is given."""
+        if employee_id is not None:
+            self.employee_changed(employee_id)
+            return
+        with self._lock:
+            self._epoch += 1
+            self._input_versions.clear()
+            self._skill_need_versions.clear()
+            self._version_floor = self._clock
+        self.clear()
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats["tracked_versions"] = len(self._input_versions) + len(self._skill_need_versions)
+        return stats
+
+
+recommendation_cache = RecommendationCache()
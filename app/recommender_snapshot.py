@@ -0,0 +1,147 @@
+"""
+Process-wide fitted HybridRecommender for the /recommendations endpoint.
+
+Fitting reads the employee, training, employee_skill, skill_need and
+employee_training tables in full, so it happens once: the fitted state is
+kept in memory and saved with ``HybridRecommender.save`` (columnar .npz).
+A new process loads that file when it is younger than
+``RECOMMENDER_SNAPSHOT_TTL``. Writes made through this process
+(training assignments, employee deletion, skill_need recalculation) are
+applied to the snapshot incrementally. Writes made by other processes show
+up when the snapshot is refitted after the TTL; the refit runs in one
+thread while the others keep scoring against the current snapshot.
+Incremental updates are applied to a copy of the snapshot, which then
+replaces it in one reference swap, so a scoring call never sees a
+half-applied update.
+"""
+
+import copy
+import os
+import threading
+import time
+
+from app.ml_recommender import (
+    HybridRecommender, get_employees, get_trainings, get_employee_skills, get_training_history, get_training_need,
+)
+from app.model_registry import DATA_DIR
+
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'hybrid_recommender.npz')
+# Seconds before the snapshot is refitted from the database
+RECOMMENDER_SNAPSHOT_TTL = float(os.getenv("RECOMMENDER_SNAPSHOT_TTL", "300"))
+
+
+class RecommenderSnapshot:
+    """Holds one fitted HybridRecommender, keeps it current and refits it periodically."""
+
+    def __init__(self, path=SNAPSHOT_PATH, ttl=RECOMMENDER_SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._current = None
+        self._fitted_at = 0.0
+        self._refit_lock = threading.Lock()
+        # Serializes incremental updates; scoring never takes it (updates publish a new object)
+        self._update_lock = threading.Lock()
+        self._fits = 0
+        self._loads = 0
+        self._updates = 0
+        self._last_fit_ms = None
+
+    def _fit(self):
+        start = time.perf_counter()
+        con = None  # loaders draw their own pooled connections
+        recommender = HybridRecommender()
+        recommender.fit(
+            get_employees(con), get_trainings(con), get_employee_skills(con),
+            get_training_history(con), get_training_need(con),
+        )
+        self._fits += 1
+        self._last_fit_ms = (time.perf_counter() - start) * 1000
+        try:
+            recommender.save(self.path)
+        except OSError as e:
+            print(f"[WARNING] Could not persist recommender snapshot to {self.path}: {e}")
+        return recommender
+
+    def _load_or_fit(self):
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            age = None
+        if self._current is None and age is not None and age < self.ttl:
+            try:
+                recommender = HybridRecommender.load(self.path)
+                self._loads += 1
+                return recommender, time.monotonic() - age
+            except Exception as e:
+                print(f"[WARNING] Could not load recommender snapshot: {e}. Refitting.")
+        return self._fit(), time.monotonic()
+
+    def get(self):
+        """The current fitted recommender (fitting or loading it on first use)."""
+        if self._current is not None and time.monotonic() - self._fitted_at < self.ttl:
+            return self._current
+        # Only one thread refits; the others keep scoring against the current snapshot
+        if not self._refit_lock.acquire(blocking=self._current is None):
+            return self._current
+        try:
+            if self._current is None or time.monotonic() - self._fitted_at >= self.ttl:
+                recommender, fitted_at = self._load_or_fit()
+                with self._update_lock:
+                    self._current, self._fitted_at = recommender, fitted_at
+        finally:
+            self._refit_lock.release()
+        return self._current
+
+    def invalidate(self):
+        """Refit on next use."""
+        with self._update_lock:
+            self._current = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _apply(self, method, *args):
+        with self._update_lock:
+            if self._current is not None:
+                updated = copy.copy(self._current)
+                getattr(updated, method)(*args)
+                self._current = updated
+                self._updates += 1
+
+    def employee_added(self, employee_id):
+        self._apply("add_employee", employee_id)
+
+    def employee_removed(self, employee_id):
+        self._apply("remove_employee", employee_id)
+
+    def training_assigned(self, employee_id, training_id):
+        self._apply("add_training_history", employee_id, training_id)
+
+    def training_unassigned(self, employee_id, training_id):
+        self._apply("remove_training_history", employee_id, training_id)
+
+    def skill_added(self, employee_id, skill_id):
+        self._apply("add_employee_skill", employee_id, skill_id)
+
+    def skill_removed(self, employee_id, skill_id):
+        self._apply("remove_employee_skill", employee_id, skill_id)
+
+    def skill_needs_replaced(self, employee_id, rows):
+        self._apply("set_training_need", employee_id, rows)
+
+    def stats(self):
+        current = self._current
+        return {
+            "loaded": current is not None,
+            "age_seconds": time.monotonic() - self._fitted_at if current is not None else None,
+            "employees": len(current._employee_pos) if current is not None else 0,
+            "fits": self._fits,
+            "loads": self._loads,
+            "incremental_updates": self._updates,
+            "last_fit_ms": self._last_fit_ms,
+            "ttl": self.ttl,
+        }
+
+
+recommender_snapshot = RecommenderSnapshot()
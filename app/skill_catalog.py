@@ -0,0 +1,159 @@
+"""
+Versioned in-process cache of the skill catalog.
+
+The recommender and the ML skill endpoint resolve skill labels against the
+whole ``skill`` table. ``SkillCatalog`` loads it once into a lowercase
+label -> row map and an id -> row map, and afterwards only fetches rows
+with an id above the highest one seen (every ``SKILL_CATALOG_REFRESH``
+seconds, to pick up inserts from other processes). Code that inserts skills
+calls ``add()`` so the catalog is current immediately. Every change bumps
+``version``; maps are replaced, never mutated, so readers can iterate a
+snapshot without locking. ``arrays()`` exposes the same snapshot as NumPy
+arrays for vectorized scoring, rebuilt only when the version changes.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.database import fetch_results
+
+# Seconds between incremental refreshes for skills inserted by other processes
+SKILL_CATALOG_REFRESH = float(os.getenv("SKILL_CATALOG_REFRESH", "60"))
+
+CATALOG_QUERY = "SELECT id, preferred_label, skill_type FROM skill"
+
+
+class CatalogArrays:
+    """Skill catalog as parallel arrays sorted by id (``rows[i]`` is the row of ``ids[i]``)."""
+
+    def __init__(self, by_id, version):
+        self.version = version
+        self.ids = np.array(sorted(by_id), dtype=np.int64)
+        self.rows = [by_id[i] for i in self.ids.tolist()]
+        self.labels = [r['preferred_label'] for r in self.rows]
+        # skill_type as small integer codes into skill_types
+        types = {}
+        codes = [types.setdefault(r['skill_type'], len(types)) for r in self.rows]
+        self.skill_types = list(types)
+        self.type_codes = np.array(codes, dtype=np.int16)
+
+    def positions(self, skill_ids):
+        """(positions, found mask) of ``skill_ids`` in ``ids``."""
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        pos = np.searchsorted(self.ids, skill_ids)
+        pos[pos == len(self.ids)] = 0
+        found = self.ids[pos] == skill_ids if len(self.ids) else np.zeros(len(skill_ids), dtype=bool)
+        return pos, found
+
+
+class SkillCatalog:
+    """Skill rows keyed by lowercase label and by id, with a version counter."""
+
+    def __init__(self, refresh_interval=SKILL_CATALOG_REFRESH):
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._by_label = {}
+        self._by_id = {}
+        self._rows = []
+        self._max_id = 0
+        self._loaded = False
+        self._next_refresh = 0.0
+        self._full_loads = 0
+        self._refreshes = 0
+        self._arrays = None
+
+    def _publish(self, by_label, by_id):
+        self._by_label = by_label
+        self._by_id = by_id
+        self._rows = list(by_id.values())
+        self._max_id = max(by_id, default=0)
+        self.version += 1
+
+    def _ensure_current(self):
+        if self._loaded and time.monotonic() < self._next_refresh:
+            return
+        with self._lock:
+            if not self._loaded:
+                rows = fetch_results(CATALOG_QUERY, ())
+                self._publish(
+                    {r['preferred_label'].lower(): r for r in rows if r['preferred_label']},
+                    {r['id']: r for r in rows},
+                )
+                self._loaded = True
+                self._full_loads += 1
+            elif time.monotonic() >= self._next_refresh:
+                rows = fetch_results(f"{CATALOG_QUERY} WHERE id > %s", (self._max_id,))
+                self._refreshes += 1
+                if rows:
+                    self._add_locked(rows)
+            self._next_refresh = time.monotonic() + self.refresh_interval
+
+    def _add_locked(self, rows):
+        by_label = dict(self._by_label)
+        by_id = dict(self._by_id)
+        for r in rows:
+            by_id[r['id']] = r
+            if r['preferred_label']:
+                by_label.setdefault(r['preferred_label'].lower(), r)
+        self._publish(by_label, by_id)
+
+    def add(self, rows):
+        """Record newly inserted skills (dicts with id, preferred_label, skill_type)."""
+        rows = [{"skill_type": None, **r} for r in rows]
+        if not rows:
+            return
+        with self._lock:
+            if self._loaded:
+                self._add_locked(rows)
+
+    def invalidate(self):
+        """Reload the whole table on next access (e.g. after skills were renamed or deleted)."""
+        with self._lock:
+            self._loaded = False
+
+    def label_map(self):
+        """Lowercase preferred_label -> row (treat as read-only)."""
+        self._ensure_current()
+        return self._by_label
+
+    def id_map(self):
+        """id -> row (treat as read-only)."""
+        self._ensure_current()
+        return self._by_id
+
+    def rows(self):
+        """All skill rows (treat as read-only)."""
+        self._ensure_current()
+        return self._rows
+
+    def arrays(self):
+        """The catalog as CatalogArrays (treat as read-only)."""
+        self._ensure_current()
+        arrays = self._arrays
+        if arrays is None or arrays.version != self.version:
+            with self._lock:
+                arrays = self._arrays
+                if arrays is None or arrays.version != self.version:
+                    arrays = self._arrays = CatalogArrays(self._by_id, self.version)
+        return arrays
+
+    def get_by_label(self, label):
+        return self.label_map().get(label.lower()) if label else None
+
+    def stats(self):
+        return {
+            "loaded": self._loaded,
+            "version": self.version,
+            "size": len(self._by_id),
+            "max_id": self._max_id,
+            "full_loads": self._full_loads,
+            "incremental_refreshes": self._refreshes,
+            "refresh_interval": self.refresh_interval,
+        }
+
+
+skill_catalog = SkillCatalog()
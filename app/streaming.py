@@ -0,0 +1,90 @@
+"""
+Helpers for streaming large query results as HTTP responses.
+Rows are serialized as they arrive from ``fetch_iter`` so the full result set
+is never held in memory.
+
+The first row is pulled before the response is returned, so a failed query
+(or a connect / pool timeout) still becomes an HTTP 500 instead of a
+truncated 200 body. The row iterator is closed when the response ends for
+any reason, including a client disconnect, so its pooled connection goes
+back to the pool right away instead of whenever the generator is collected.
+"""
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+# Number of serialized rows sent per response chunk
+ROWS_PER_CHUNK = 500
+
+
+def _close(iterator):
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def _resume(first, rest):
+    try:
+        yield first
+        yield from rest
+    finally:
+        _close(rest)
+
+
+def started(rows):
+    """Pull the first item of ``rows`` now, so its errors raise in the endpoint; returns an equivalent iterator."""
+    rows = iter(rows)
+    try:
+        first = next(rows)
+    except StopIteration:
+        return iter(())
+    return _resume(first, rows)
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """StreamingResponse that closes its iterator however the response ends."""
+
+    def __init__(self, content, *args, **kwargs):
+        super().__init__(content, *args, **kwargs)
+        self._content = content
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await run_in_threadpool(_close, self._content)
+
+
+def _json_array_chunks(rows, key=None, encode=jsonable_encoder):
+    try:
+        yield f"{{{json.dumps(key)}: [" if key else "["
+        buffer = []
+        first = True
+        for row in rows:
+            buffer.append(("" if first else ",") + json.dumps(encode(row)))
+            first = False
+            if len(buffer) >= ROWS_PER_CHUNK:
+                yield "".join(buffer)
+                buffer = []
+        if buffer:
+            yield "".join(buffer)
+        yield "]}" if key else "]"
+    finally:
+        _close(rows)
+
+
+def json_stream_response(rows, key=None, encode=jsonable_encoder):
+    """Return a StreamingResponse that writes ``rows`` as a JSON array.
+
+    With ``key`` the array is wrapped in an object (``{"key": [...]}``), matching
+    the shape of the non-streaming endpoints. ``encode`` turns a row into a
+    JSON-serializable value.
+    """
+    return ClosingStreamingResponse(_json_array_chunks(started(rows), key, encode), media_type="application/json")
+
+
+def stream_response(chunks, **kwargs):
+    """ClosingStreamingResponse over an iterator of body chunks, started before it is returned."""
+    return ClosingStreamingResponse(started(chunks), **kwargs)
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import database
+
+
+@pytest.fixture
+def sqlite_app(tmp_path, monkeypatch):
+    """The main app backed by a freshly seeded SQLite database (login admin@example.com / admin)."""
+    from scripts.seed_sqlite import seed
+
+    path = str(tmp_path / "hr_bench.db")
+    seed(path, employees=20, skills=30, trainings=5, log=lambda *_: None)
+    for key in ("JAWSDB_URL", "CLEARDB_DATABASE_URL", "DATABASE_REPLICA_URLS"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{path}")
+    database.dispose_pools()
+    from main import app
+    from app.skill_catalog import skill_catalog
+    from app.recommender_snapshot import recommender_snapshot
+    from app.token_revocation import revocation
+    skill_catalog.invalidate()
+    revocation.invalidate()
+    monkeypatch.setattr(recommender_snapshot, "path", str(tmp_path / "hybrid_recommender.npz"))
+    recommender_snapshot.invalidate()
+    yield app
+    database.dispose_pools()
+    skill_catalog.invalidate()
+    recommender_snapshot.invalidate()
+    revocation.invalidate()
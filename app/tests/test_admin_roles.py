@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _login(client, email, password):
+    token = client.post("/login", data={"username": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def employee_user(sqlite_app):
+    from app.database import execute_query
+    from app.models.auth import hash_password
+
+    execute_query("INSERT INTO users (email, hashed_password, role) VALUES (%s, %s, %s)",
+                  ("staff@example.com", hash_password("staff"), "employee"))
+    return "staff@example.com", "staff"
+
+
+@pytest.mark.parametrize("path", [
+    "/admin/db-stats/reset", "/admin/auth-cache/reset", "/admin/recommendation-cache/reset",
+    "/admin/model-registry/reload",
+])
+def test_admin_routes_reject_non_admins(sqlite_app, employee_user, path):
+    from fastapi.testclient import TestClient
+
+    with TestClient(sqlite_app) as client:
+        assert client.post(path, headers=_login(client, *employee_user)).status_code == 403
+        assert client.post(path, headers=_login(client, "admin@example.com", "admin")).status_code == 200
+
+
+@pytest.mark.parametrize("stateless", [False, True])
+def test_non_admin_cannot_revoke_all_tokens(sqlite_app, employee_user, monkeypatch, stateless):
+    from fastapi.testclient import TestClient
+    from app.models import auth
+    from app.token_revocation import revocation
+
+    monkeypatch.setattr(auth, "STATELESS_AUTH", stateless)
+    with TestClient(sqlite_app) as client:
+        admin = _login(client, "admin@example.com", "admin")
+        epoch = revocation.epoch
+        assert client.post("/admin/revoke-tokens", headers=_login(client, *employee_user)).status_code == 403
+        assert revocation.epoch == epoch
+        assert client.get("/me", headers=admin).status_code == 200
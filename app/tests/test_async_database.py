@@ -0,0 +1,213 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import async_database
+
+
+def test_literal_percents_escaped_only_with_params():
+    query = "SELECT DATE_FORMAT(d, '%Y-%m') AS m FROM t WHERE a = %s"
+    assert async_database._escape_literal_percents(query, (1,)) == "SELECT DATE_FORMAT(d, '%%Y-%%m') AS m FROM t WHERE a = %s"
+    assert async_database._escape_literal_percents(query, None) == query
+
+
+@pytest.mark.parametrize("query, values", [
+    ("SELECT DATE_FORMAT(d, '%Y-%m') FROM t WHERE a = %s", ("1",)),
+    ("SELECT * FROM t WHERE name LIKE 'a%%' AND a = %s", ("1",)),
+    ("SELECT 100 %% 7 FROM t WHERE a = %s AND b = %s", ("1", "2")),
+    ("SELECT DATE_FORMAT(d, '%Y') FROM t WHERE a = %(a)s AND b LIKE 'x%%'", {"a": "1"}),
+])
+def test_native_and_sync_paths_send_the_same_sql(query, values):
+    import re
+
+    # mysql.connector only replaces placeholders; PyMySQL runs query % values
+    if isinstance(values, dict):
+        sync = re.sub(r"%\((\w+)\)s", lambda m: values[m.group(1)], query)
+    else:
+        args = iter(values)
+        sync = re.sub(r"%s", lambda m: next(args), query)
+    assert async_database._escape_literal_percents(query, values) % values == sync
+
+
+def test_thread_fallback_runs_sync_layer(monkeypatch):
+    calls = []
+
+    def fake_fetch(query, values=None):
+        calls.append((query, values))
+        return [{"n": 1}]
+
+    monkeypatch.setenv("DB_ASYNC_DRIVER", "thread")
+    monkeypatch.setattr(async_database.database, "fetch_results", fake_fetch)
+    rows = asyncio.run(async_database.fetch_results("SELECT 1 AS n", (2,)))
+    assert rows == [{"n": 1}]
+    assert calls == [("SELECT 1 AS n", (2,))]
+
+
+def test_gather_queries_limits_concurrency():
+    running, peak = 0, 0
+
+    async def query(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i
+
+    results = asyncio.run(async_database.gather_queries(*(query(i) for i in range(7)), limit=2))
+    assert results == list(range(7))
+    assert peak == 2
+
+
+class _FakePool:
+    def __init__(self, conn=None, fail=False):
+        self.conn, self.fail = conn, fail
+        self.closed = self.wait_closed_called = False
+        self.released = []
+
+    async def acquire(self):
+        if self.fail:
+            raise OSError("replica down")
+        return self.conn
+
+    def release(self, conn):
+        self.released.append(conn)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        self.wait_closed_called = True
+
+
+class _FailingConn:
+    def __init__(self):
+        self.rolled_back = False
+
+    def cursor(self, *args):
+        conn = self
+
+        class Cursor:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, query, values):
+                raise async_database.aiomysql.Error("query failed")
+
+        return Cursor()
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_failed_replica_pool_is_closed(monkeypatch):
+    from app.database.replicas import ReplicaRouter
+
+    replica, primary = _FakePool(fail=True), _FakePool(conn="primary-conn")
+    monkeypatch.setattr(async_database.database, "get_replica_router", lambda: ReplicaRouter(["r1"]))
+    monkeypatch.setitem(async_database._async_pools, "r1", replica)
+
+    async def get_pool(target="primary"):
+        return async_database._async_pools.get(target) if target != "primary" else primary
+
+    async def run():
+        result = await async_database._acquire_for_read()
+        await asyncio.sleep(0)
+        return result
+
+    monkeypatch.setattr(async_database, "get_async_pool", get_pool)
+    assert asyncio.run(run()) == (primary, "primary-conn")
+    assert "r1" not in async_database._async_pools
+    assert replica.closed and replica.wait_closed_called
+
+
+def test_failed_read_rolls_back_before_release(monkeypatch):
+    import pytest
+
+    if async_database.aiomysql is None:
+        pytest.skip("aiomysql not installed")
+    conn, pool = _FailingConn(), _FakePool()
+
+    async def acquire():
+        return pool, conn
+
+    monkeypatch.setattr(async_database, "_use_native_driver", lambda: True)
+    monkeypatch.setattr(async_database, "_acquire_for_read", acquire)
+    with pytest.raises(async_database.aiomysql.Error):
+        asyncio.run(async_database.fetch_results("SELECT 1"))
+    assert conn.rolled_back
+    assert pool.released == [conn]
+
+
+def test_read_session_keeps_replica_routing(sqlite_app):
+    from app.database import database
+
+    async def run():
+        async with async_database.read_session() as session:
+            return await session.fetch("SELECT id FROM employee WHERE id = %s", (1,))
+
+    with database.request_scope():
+        assert asyncio.run(run()) == [{"id": 1}]
+        assert not database._reads_on_primary()
+
+
+def test_read_session_rolls_back_instead_of_committing(monkeypatch):
+    import pytest
+
+    if async_database.aiomysql is None:
+        pytest.skip("aiomysql not installed")
+
+    class Conn(_FailingConn):
+        async def commit(self):
+            raise AssertionError("read session must not commit")
+
+    conn, pool = Conn(), _FakePool()
+
+    async def acquire():
+        return pool, conn
+
+    async def run():
+        async with async_database.read_session():
+            pass
+
+    monkeypatch.setattr(async_database, "_use_native_driver", lambda: True)
+    monkeypatch.setattr(async_database, "_acquire_for_read", acquire)
+    with async_database.database.request_scope():
+        asyncio.run(run())
+        assert not async_database.database._reads_on_primary()
+    assert conn.rolled_back
+    assert pool.released == [conn]
+
+
+def test_async_acquire_times_out_like_sync_pool(monkeypatch):
+    import pytest
+    from app.database.pool import PoolTimeout
+    from app.database.replicas import ReplicaRouter
+
+    class SaturatedPool(_FakePool):
+        async def acquire(self):
+            await asyncio.sleep(3600)
+
+    replica, primary = SaturatedPool(), SaturatedPool()
+    router = ReplicaRouter(["r1"])
+
+    async def get_pool(target="primary"):
+        return replica if target == "r1" else primary
+
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.05")
+    monkeypatch.setattr(async_database.database, "get_replica_router", lambda: router)
+    monkeypatch.setattr(async_database, "get_async_pool", get_pool)
+    with pytest.raises(PoolTimeout):
+        asyncio.run(async_database._acquire_for_read())
+    # a saturated replica is skipped, not taken out of rotation
+    assert not replica.closed
+    assert router.candidates() == ["r1"]
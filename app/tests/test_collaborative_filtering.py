@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.ml_recommender import HybridRecommender, interaction_matrix, top_k_neighbors
+
+
+def _fitted():
+    employees = pd.DataFrame({"id": [1, 2, 3, 4, 5]})
+    trainings = pd.DataFrame({"id": [10, 20, 30, 40]})
+    # 1 and 2 share trainings; 5 has no history; (99, 10) refers to an unknown employee
+    history = pd.DataFrame(
+        [(1, 10), (1, 20), (1, 20), (2, 10), (2, 20), (2, 30), (3, 30), (3, 40), (4, 40), (99, 10)],
+        columns=["employee_id", "training_id"],
+    )
+    skills = pd.DataFrame([(1, 7), (2, 7), (2, 8), (3, 9), (4, 9)], columns=["employee_id", "skill_id"])
+    recommender = HybridRecommender()
+    recommender.fit(employees, trainings, skills, history, pd.DataFrame())
+    return recommender
+
+
+def test_interaction_matrix_is_binary_and_skips_unknown_ids():
+    matrix = interaction_matrix([1, 1, 2, 9], [10, 10, 20, 10], [1, 2], [10, 20])
+    assert matrix.toarray().tolist() == [[1, 0], [0, 1]]
+
+
+def test_top_k_neighbors_matches_dense_cosine():
+    rng = np.random.default_rng(1)
+    dense = (rng.random((30, 12)) < 0.3).astype(np.float32)
+    graph = top_k_neighbors(interaction_matrix(*np.nonzero(dense), range(30), range(12)), 3, block_size=7)
+    norms = np.linalg.norm(dense, axis=1)
+    norms[norms == 0] = 1
+    sims = dense @ dense.T / np.outer(norms, norms)
+    np.fill_diagonal(sims, 0)
+    for i in range(30):
+        row = graph[i]
+        assert row.nnz == min(3, int((sims[i] > 0).sum()))
+        if row.nnz:
+            assert np.allclose(np.sort(row.data)[::-1], np.sort(sims[i])[::-1][:row.nnz], atol=1e-6)
+
+
+def test_collaborative_scores():
+    recommender = _fitted()
+    assert recommender.user_item_matrix.nnz == 8
+    # employee 1's only neighbor is 2 (skills 7 and 8); 3 shares training 30 with 2 and 40 with 4
+    assert recommender.collaborative_skill_scores(1) == {7: 1.0, 8: 1.0}
+    scores = recommender.collaborative_skill_scores(3)
+    assert set(scores) == {7, 8, 9} and scores[9] > scores[7] > 0
+    assert recommender.collaborative_skill_scores(5) == {}
+
+    trainings = recommender.recommend_trainings(1, topn=2)
+    assert trainings[0]["id"] == 30
+    assert {t["id"] for t in trainings}.isdisjoint({10, 20})
+    assert recommender.recommend_trainings(99) == []
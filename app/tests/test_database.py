@@ -0,0 +1,225 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import database
+
+
+class FakeCursor:
+    def __init__(self, log, rows=None):
+        self.log = log
+        self.rowcount = 0
+        self.lastrowid = None
+        self.rows = list(rows or [])
+
+    def execute(self, query, values=None):
+        self.log.append(("execute", query, values))
+        self.rowcount = len(values) if values else 0
+
+    def executemany(self, query, rows):
+        self.log.append(("executemany", query, list(rows)))
+        self.rowcount = len(rows)
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.log.append(("cursor_close",))
+
+
+class FakeConnection:
+    def __init__(self, rows=None):
+        self.log = []
+        self.rows = rows
+
+    def cursor(self, **kwargs):
+        self.log.append(("cursor", kwargs))
+        return FakeCursor(self.log, self.rows)
+
+    def consume_results(self):
+        self.log.append(("consume",))
+
+    def commit(self):
+        self.log.append(("commit",))
+
+    def rollback(self):
+        self.log.append(("rollback",))
+
+    def close(self):
+        pass
+
+
+def use_fake_connection(monkeypatch, rows=None):
+    conn = FakeConnection(rows)
+    monkeypatch.setattr(database, "create_connection", lambda: conn)
+    return conn
+
+
+def test_bulk_upsert_builds_chunked_multi_row_statements(monkeypatch):
+    conn = use_fake_connection(monkeypatch)
+    rows = [(i, 7, i * 10) for i in range(5)]
+    database.bulk_upsert("skill_need", ("skill_id", "employee_id", "recommendation_score"), rows,
+                         update_columns=("recommendation_score",), chunk_size=2)
+    executes = [entry for entry in conn.log if entry[0] == "execute"]
+    assert len(executes) == 3
+    assert executes[0][1] == (
+        "INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s), (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE recommendation_score = VALUES(recommendation_score)"
+    )
+    assert executes[0][2] == [0, 7, 0, 1, 7, 10]
+    assert executes[2][2] == [4, 7, 40]
+    assert conn.log[-2] == ("commit",)
+    assert sum(1 for entry in conn.log if entry[0] == "commit") == 1
+
+
+def test_execute_many_uses_executemany_for_non_inserts(monkeypatch):
+    conn = use_fake_connection(monkeypatch)
+    total = database.execute_many("UPDATE skill SET skill_type = %s WHERE id = %s", [("a", 1), ("b", 2)])
+    assert total == 2
+    assert conn.log[1][0] == "executemany"
+
+
+def test_execute_many_skips_empty_input(monkeypatch):
+    conn = use_fake_connection(monkeypatch)
+    assert database.execute_many("INSERT INTO skill (preferred_label) VALUES (%s)", iter([])) == 0
+    assert conn.log == []
+
+
+def test_fetch_iter_streams_in_batches_with_unbuffered_cursor(monkeypatch):
+    conn = use_fake_connection(monkeypatch, rows=[(i,) for i in range(5)])
+    batches = list(database.fetch_iter("SELECT id FROM employee", batch_size=2, as_tuples=True, batches=True))
+    assert batches == [[(0,), (1,)], [(2,), (3,)], [(4,)]]
+    assert conn.log[0] == ("cursor", {"buffered": False, "dictionary": False})
+
+
+def test_fetch_iter_drains_connection_on_early_exit(monkeypatch):
+    conn = use_fake_connection(monkeypatch, rows=[{"id": i} for i in range(5)])
+    rows = database.fetch_iter("SELECT id FROM employee", batch_size=2)
+    assert next(rows) == {"id": 0}
+    rows.close()
+    assert ("consume",) in conn.log and conn.log[-1] == ("cursor_close",)
+
+
+def test_transaction_shares_connection_and_commits_once(monkeypatch):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(database, "create_connection", connect)
+    with database.transaction() as tx:
+        tx.execute("DELETE FROM skill_need WHERE employee_id = %s", (1,))
+        database.execute_query("INSERT INTO skill (preferred_label) VALUES (%s)", ("x",))
+        database.bulk_upsert("skill_need", ("skill_id", "employee_id"), [(1, 1), (2, 1)], update_columns=("skill_id",))
+        with database.transaction() as inner:
+            assert inner is tx
+    assert len(opened) == 1
+    assert sum(1 for entry in opened[0].log if entry[0] == "commit") == 1
+
+
+def test_transaction_rolls_back_on_error(monkeypatch):
+    conn = use_fake_connection(monkeypatch)
+    try:
+        with database.transaction() as tx:
+            tx.execute("DELETE FROM skill_need WHERE employee_id = %s", (1,))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert ("rollback",) in conn.log and ("commit",) not in conn.log
+    # the context no longer routes through the finished transaction
+    database.execute_query("DELETE FROM skill WHERE id = %s", (1,))
+    assert conn.log[-2] == ("commit",)
+
+
+def test_fetch_iter_joins_active_transaction(monkeypatch):
+    conn = use_fake_connection(monkeypatch, rows=[{"id": 1}])
+    monkeypatch.setattr(database, "create_read_connection", lambda: FakeConnection())
+    with database.transaction() as tx:
+        tx.execute("INSERT INTO skill (preferred_label) VALUES (%s)", ("x",))
+        assert list(database.fetch_iter("SELECT id FROM skill")) == [{"id": 1}]
+    assert [entry[0] for entry in conn.log].count("commit") == 1
+
+
+def test_fingerprint_normalizes_literals_lists_and_rows():
+    from app.database.instrumentation import fingerprint
+    assert fingerprint("SELECT * FROM employee  WHERE id = 42") == "SELECT * FROM employee WHERE id = ?"
+    assert fingerprint("SELECT * FROM users WHERE email = %s") == fingerprint("SELECT * FROM users WHERE email = 'a@b.c'")
+    assert fingerprint("SELECT id FROM skill WHERE preferred_label IN (%s, %s, %s)") == "SELECT id FROM skill WHERE preferred_label IN (?)"
+    assert fingerprint("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)") == "INSERT INTO t (a, b) VALUES (?, ?)"
+
+
+def test_queries_are_recorded_and_counted_per_request(monkeypatch):
+    import asyncio
+    from app.database import instrumentation
+
+    instrumentation.reset()
+    use_fake_connection(monkeypatch, rows=[])
+
+    async def handler(scope, receive, send):
+        for i in range(3):
+            database.execute_query("DELETE FROM skill_need WHERE employee_id = %s", (i,))
+
+    middleware = instrumentation.QueryCountMiddleware(handler, threshold=2)
+    asyncio.run(middleware({"type": "http", "method": "POST", "path": "/x"}, None, None))
+    snap = instrumentation.snapshot()
+    assert snap["queries"][0]["fingerprint"] == "DELETE FROM skill_need WHERE employee_id = ?"
+    assert snap["queries"][0]["count"] == 3
+    assert snap["flagged_handlers"] == {"POST /x": {"requests": 1, "max_queries": 3, "total_queries": 3}}
+
+
+def test_replica_router_rotates_and_skips_failed_replicas():
+    from app.database.replicas import ReplicaRouter
+    router = ReplicaRouter(["replica-0", "replica-1"], cooldown=60)
+    assert router.candidates()[0] != router.candidates()[0]
+    router.mark_down("replica-0", RuntimeError("down"))
+    assert router.candidates() == ["replica-1"]
+    assert router.stats()["replicas"]["replica-0"]["healthy"] is False
+
+
+def test_replica_router_least_loaded_orders_by_load():
+    from app.database.replicas import ReplicaRouter
+    load = {"replica-0": 4, "replica-1": 1}
+    router = ReplicaRouter(list(load), strategy="least_loaded", load=load.get)
+    assert router.candidates() == ["replica-1", "replica-0"]
+
+
+def test_reads_fall_back_to_primary_and_writes_pin_primary(monkeypatch):
+    import contextvars
+    from app.database.replicas import ReplicaRouter
+
+    router = ReplicaRouter(["replica-0"])
+    primary, replica = FakeConnection(), FakeConnection()
+
+    class Pool:
+        def __init__(self, conn, fail=False):
+            self.conn, self.fail = conn, fail
+
+        def acquire(self):
+            if self.fail:
+                raise RuntimeError("replica down")
+            return self.conn
+
+    pools = {"primary": Pool(primary), "replica-0": Pool(replica)}
+    monkeypatch.setattr(database, "get_replica_router", lambda: router)
+    monkeypatch.setattr(database, "get_pool", lambda target="primary": pools[target])
+
+    def scenario():
+        with database.request_scope():
+            assert database.create_read_connection() is replica
+            database.execute_query("UPDATE employee SET details = %s WHERE id = %s", ("x", 1))
+            assert database.create_read_connection() is primary
+        # the pin ends with the request; outside one (scripts, retrain thread) writes do not pin
+        assert database.create_read_connection() is replica
+        database.execute_query("UPDATE employee SET details = %s WHERE id = %s", ("y", 1))
+        assert database.create_read_connection() is replica
+
+    contextvars.Context().run(scenario)
+    pools["replica-0"].fail = True
+    assert contextvars.Context().run(database.create_read_connection) is primary
+    assert router.stats()["primary_fallbacks"] == 1
@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def is_connected(self):
+        return self.alive
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def connect():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), created
+
+
+def test_connection_is_reused_after_close():
+    pool, created = make_pool(size=2, max_overflow=0)
+    conn = pool.acquire()
+    conn.close()
+    conn = pool.acquire()
+    conn.close()
+    assert len(created) == 1
+    assert created[0].rollbacks == 2
+    stats = pool.stats()
+    assert stats['idle'] == 1 and stats['checked_out'] == 0 and stats['checkouts'] == 2
+
+
+def test_overflow_connections_are_closed_on_release():
+    pool, created = make_pool(size=1, max_overflow=1)
+    a = pool.acquire()
+    b = pool.acquire()
+    assert pool.stats()['overflow'] == 1
+    a.close()
+    b.close()
+    assert pool.stats()['open'] == 1
+    assert sum(c.closed for c in created) == 1
+
+
+def test_timeout_when_exhausted():
+    pool, _ = make_pool(size=1, max_overflow=0, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+    conn.close()
+
+
+def test_waiter_gets_released_connection():
+    pool, created = make_pool(size=1, max_overflow=0, timeout=2)
+    conn = pool.acquire()
+    threading.Timer(0.05, conn.close).start()
+    again = pool.acquire()
+    assert again.raw is created[0]
+    assert pool.stats()['waits'] >= 1
+    again.close()
+
+
+def test_dead_connection_is_replaced_on_checkout():
+    pool, created = make_pool(size=1, max_overflow=0)
+    pool.acquire().close()
+    created[0].alive = False
+    conn = pool.acquire()
+    assert conn.raw is created[1]
+    assert created[0].closed
+    assert pool.stats()['ping_failures'] == 1
+    conn.close()
+
+
+def test_expired_connection_is_recycled():
+    pool, created = make_pool(size=1, max_overflow=0, recycle=0.01)
+    conn = pool.acquire()
+    time.sleep(0.02)
+    conn.close()
+    assert created[0].closed
+    pool.acquire().close()
+    assert len(created) == 2
+
+
+def test_failed_connect_frees_slot():
+    calls = []
+
+    def connect():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return FakeConnection()
+
+    pool = ConnectionPool(connect, size=1, max_overflow=0, timeout=0.05)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    pool.acquire().close()
+    assert pool.stats()['open'] == 1
+
+
+def test_connection_released_after_dispose_is_closed():
+    pool, created = make_pool(size=2, max_overflow=0)
+    conn = pool.acquire()
+    pool.dispose()
+    assert not created[0].closed
+    conn.close()
+    assert created[0].closed
+    stats = pool.stats()
+    assert stats['idle'] == 0 and stats['open'] == 0 and stats['checked_out'] == 0
@@ -0,0 +1,81 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _client_and_headers(app):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app)
+    token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+    return client, {"Authorization": f"Bearer {token}"}
+
+
+def test_csv_import_reports_per_row_errors(sqlite_app, monkeypatch):
+    from app import employee_import
+
+    monkeypatch.setattr(employee_import, "IMPORT_CHUNK_SIZE", 2)
+    body = (
+        "first_name,last_name,email,hire_date,department,job_title,details\n"
+        "Ada,Lovelace,ada@example.com,2024-01-02,Engineering,developer,\"first line\nsecond line\"\n"
+        "Bad,Row,bad@example.com\n"
+        "Alan,Turing,alan@example.com,2024-01-03,Engineering,developer,\n"
+        "Ada,Again,ada@example.com,2024-01-04,Sales,manager,\n"
+        "Old,Hand,employee0@example.com,2020-01-01,HR,officer,\n"
+    )
+    client, headers = _client_and_headers(sqlite_app)
+    response = client.post("/employee/import", content=body.encode(), headers={**headers, "Content-Type": "text/csv"})
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["imported"], report["failed"]) == (5, 2, 3)
+    assert [e["row"] for e in report["errors"]] == [2, 4, 5]
+
+    from app.database import fetch_results
+    rows = fetch_results("SELECT details, hashed_password FROM employee WHERE email = %s", ("ada@example.com",))
+    assert rows[0]["details"] == "first line\nsecond line"
+    assert rows[0]["hashed_password"].startswith("$2")
+
+
+def test_jsonl_import(sqlite_app):
+    body = (
+        '{"first_name": "Grace", "last_name": "Hopper", "email": "grace@example.com", "hire_date": "2024-02-01", '
+        '"department": "Engineering", "job_title": "developer"}\n'
+        "not json\n"
+    )
+    client, headers = _client_and_headers(sqlite_app)
+    response = client.post("/employee/import?format=jsonl", content=body.encode(), headers=headers)
+    report = response.json()
+    assert (report["imported"], report["failed"]) == (1, 1)
+    assert report["errors"][0]["row"] == 2
+
+
+def test_hashing_overload_fails_only_its_chunk(sqlite_app, monkeypatch):
+    from app import employee_import
+    from app.hashing_pool import HashingOverloaded
+
+    real_hash = employee_import.hash_passwords
+    calls = []
+
+    def flaky_hash(passwords):
+        calls.append(len(passwords))
+        if len(calls) == 2:
+            raise HashingOverloaded("Password hashing is overloaded, retry shortly")
+        return real_hash(passwords)
+
+    monkeypatch.setattr(employee_import, "IMPORT_CHUNK_SIZE", 1)
+    monkeypatch.setattr(employee_import, "hash_passwords", flaky_hash)
+    body = "".join(
+        f'{{"first_name": "P{i}", "last_name": "Q", "email": "p{i}@example.com", "hire_date": "2024-02-01", '
+        f'"department": "HR", "job_title": "officer"}}\n'
+        for i in range(3)
+    )
+    client, headers = _client_and_headers(sqlite_app)
+    response = client.post("/employee/import?format=jsonl", content=body.encode(), headers=headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["rows"], report["imported"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 2
+    assert "overloaded" in report["errors"][0]["error"]
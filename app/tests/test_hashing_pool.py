@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.hashing_pool import HashingPool, HashingOverloaded
+
+
+def test_hash_and_check_in_worker_process():
+    pool = HashingPool(workers=1, max_queue=4)
+    try:
+        hashed = pool.hash_password(b"secret")
+        assert pool.check_password(b"secret", hashed.encode())
+        assert not pool.check_password(b"wrong", hashed.encode())
+        stats = pool.stats()
+        assert (stats["submitted"], stats["completed"], stats["in_flight"]) == (3, 3, 0)
+    finally:
+        pool.shutdown()
+
+
+def test_admission_control_rejects_when_saturated():
+    pool = HashingPool(workers=0, max_queue=0, admission_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return True
+
+    worker = threading.Thread(target=pool.run, args=(blocking,))
+    worker.start()
+    started.wait(5)
+    assert pool.stats()["in_flight"] == 1
+    with pytest.raises(HashingOverloaded):
+        pool.run(lambda: True)
+    release.set()
+    worker.join()
+    assert pool.stats()["rejected"] == 1
+    assert pool.run(lambda: 42) == 42
+
+
+def test_bulk_map_leaves_admission_slots_for_single_calls():
+    import time
+
+    pool = HashingPool(workers=1, max_queue=1, admission_timeout=0.5, bulk_slots=1)
+    try:
+        bulk = threading.Thread(target=pool.map, args=(time.sleep, [(0.1,)] * 8))
+        bulk.start()
+        time.sleep(0.3)
+        # without the bulk semaphore the batch would hold both slots and this would be rejected
+        assert pool.run(abs, -3) == 3
+        bulk.join()
+        stats = pool.stats()
+        assert stats["rejected"] == 0
+        assert stats["max_in_flight"] <= 2
+    finally:
+        pool.shutdown()
+
+
+def _die_once(marker):
+    # Kill the worker the first time, as an OOM-kill would; succeed on the retry
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "ok"
+
+
+def test_dead_worker_is_replaced_and_call_retried(tmp_path):
+    pool = HashingPool(workers=1, max_queue=4)
+    try:
+        assert pool.run(_die_once, str(tmp_path / "died")) == "ok"
+        assert pool.stats()["recycled"] == 1
+        hashed = pool.hash_password(b"secret")
+        assert pool.check_password(b"secret", hashed.encode())
+    finally:
+        pool.shutdown()
+
+
+def test_bulk_map_survives_a_dead_worker(tmp_path):
+    pool = HashingPool(workers=2, max_queue=4)
+    try:
+        marker = str(tmp_path / "died")
+        assert pool.map(_die_once, [(marker,)] * 4) == ["ok"] * 4
+        assert pool.stats()["recycled"] == 1
+    finally:
+        pool.shutdown()
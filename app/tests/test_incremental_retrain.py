@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.tests.test_model_registry import _registry
+
+ESCO = {
+    "software developer": ["python", "sql", "teamwork"],
+    "data analyst": ["sql", "statistics", "teamwork"],
+    "sales manager": ["negotiation", "teamwork"],
+    "accountant": ["budgeting", "excel", "teamwork"],
+    "human resources officer": ["recruiting", "teamwork"],
+    "marketing specialist": ["copywriting", "teamwork"],
+    "support technician": ["customer service", "networking"],
+    "project manager": ["leadership", "scheduling", "teamwork"],
+}
+
+
+@pytest.fixture
+def retrain(sqlite_app, tmp_path, monkeypatch):
+    """ml_feedback_training writing to tmp_path, with a small ESCO relations file."""
+    from app import ml_feedback_training as training
+
+    base = str(tmp_path)
+    with open(os.path.join(base, "occupationSkillRelations_en.csv"), "w") as f:
+        f.write("occupationLabel,skillLabel\n")
+        for title, skills in ESCO.items():
+            f.writelines(f"{title.title()},{skill}\n" for skill in skills)
+    paths = {
+        "DATA_DIR": base,
+        "MODEL_PATH": os.path.join(base, "model.pkl"),
+        "VECTORIZER_PATH": os.path.join(base, "vectorizer.pkl"),
+        "MLB_PATH": os.path.join(base, "mlb.pkl"),
+        "WEIGHTS_PATH": os.path.join(base, "weights.pkl"),
+        "MANIFEST_PATH": os.path.join(base, "manifest.json"),
+        "ARTIFACTS_DIR": os.path.join(base, "mmap"),
+        "TRAINING_STATE_PATH": os.path.join(base, "state.pkl"),
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(training, name, path)
+    monkeypatch.setattr(training, "model_registry", _registry(base))
+    return training
+
+
+def _manifest(training):
+    with open(training.MANIFEST_PATH) as f:
+        return json.load(f)
+
+
+def _new_vote(employee_id, job_title=None, skip=()):
+    """Upvote a skill not yet assigned to the employee's job title; returns its label."""
+    from app.database import execute_query, fetch_results
+    from app.models.employee import update_skill_feedback_db
+    from app.skill_catalog import skill_catalog
+
+    if job_title:
+        execute_query("UPDATE employee SET job_title = %s WHERE id = %s", (job_title, employee_id))
+    voted = {row['skill_id'] for row in fetch_results(
+        "SELECT sf.skill_id FROM skill_feedback sf JOIN employee e ON sf.employee_id = e.id "
+        "WHERE e.job_title = (SELECT job_title FROM employee WHERE id = %s)", (employee_id,))}
+    labels = {skill_id: row['preferred_label'] for skill_id, row in skill_catalog.id_map().items()}
+    skill_id = min(s for s in labels if s not in voted and labels[s] not in skip)
+    update_skill_feedback_db(employee_id, skill_id, "up")
+    return labels[skill_id]
+
+
+def test_incremental_refits_only_changed_labels(retrain, monkeypatch):
+    from sklearn.preprocessing import MultiLabelBinarizer
+    from app.database import fetch_results
+    from app.parallel_training import fit_one_vs_rest
+
+    assert retrain.retrain_recommender_on_feedback(topn=3)
+    full = _manifest(retrain)
+    assert full["mode"] == "full"
+    assert full["feedback_watermark"] == fetch_results("SELECT MAX(id) AS max_id FROM skill_feedback", ())[0]['max_id']
+    before = joblib.load(retrain.MODEL_PATH)
+    old_classes = list(joblib.load(retrain.MLB_PATH).classes_)
+
+    # nothing new: the model is left alone
+    assert retrain.retrain_recommender_incremental(topn=3)
+    assert _manifest(retrain)["version"] == full["version"]
+
+    monkeypatch.setattr(retrain, "RETRAIN_MAX_VOCAB_DRIFT", 0.5)
+    existing = _new_vote(1)
+    added = _new_vote(2, job_title="senior accountant", skip={existing})
+    assert retrain.retrain_recommender_incremental(topn=3)
+    manifest = _manifest(retrain)
+    assert manifest["mode"] == "incremental"
+    assert manifest["refit_labels"] == 2
+    assert manifest["feedback_watermark"] == full["feedback_watermark"] + 2
+    assert retrain.model_registry.get().version == manifest["version"]
+
+    clf = joblib.load(retrain.MODEL_PATH)
+    mlb = joblib.load(retrain.MLB_PATH)
+    state = joblib.load(retrain.TRAINING_STATE_PATH)
+    vectorizer = joblib.load(retrain.VECTORIZER_PATH)
+    assert "senior accountant" in state["job_titles"]
+    assert joblib.load(retrain.WEIGHTS_PATH)[added] >= 1.2
+
+    # changed labels match a fit on the same rows and frozen vocabulary; the rest are untouched
+    X = vectorizer.transform(state["job_titles"])
+    Y = MultiLabelBinarizer(classes=list(mlb.classes_)).fit_transform(state["skill_lists"])
+    reference = fit_one_vs_rest(clf.estimator, X, Y, workers=1, progress=None)
+    assert len(clf.estimators_) == len(mlb.classes_) == Y.shape[1]
+    for i, label in enumerate(mlb.classes_):
+        if label in (existing, added):
+            expected = reference.estimators_[i]
+        else:
+            expected = before.estimators_[old_classes.index(label)]
+        if hasattr(expected, "coef_"):
+            assert np.array_equal(clf.estimators_[i].coef_, expected.coef_), label
+        else:
+            assert type(clf.estimators_[i]) is type(expected)
+    assert np.allclose(clf.predict_proba(X[:1]), retrain.model_registry.get().scorer.predict_proba(X[:1]), atol=1e-5)
+
+
+def test_incremental_falls_back_on_vocabulary_drift(retrain, monkeypatch):
+    assert retrain.retrain_recommender_incremental(topn=3)
+    assert _manifest(retrain)["mode"] == "full"
+
+    monkeypatch.setattr(retrain, "RETRAIN_MAX_VOCAB_DRIFT", 0.0)
+    _new_vote(3, job_title="welding inspector")
+    assert retrain.retrain_recommender_incremental(topn=3)
+    assert _manifest(retrain)["mode"] == "full"
+    assert "welding" in joblib.load(retrain.VECTORIZER_PATH).vocabulary_
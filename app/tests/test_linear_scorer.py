@@ -0,0 +1,87 @@
+import os
+import sys
+
+import joblib
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.ml_recommender import LinearSkillScorer
+from app.tests.test_model_registry import _registry, _write_artifacts
+
+SKILLS = {
+    "software developer": ["python", "sql", "teamwork"],
+    "data engineer": ["python", "spark", "sql", "teamwork"],
+    "accountant": ["budgeting", "excel", "teamwork"],
+    "nurse": ["patient care", "teamwork"],
+    "sales": ["negotiation", "excel", "teamwork"],
+}
+
+
+def _fitted(base):
+    _write_artifacts(base, SKILLS)
+    return joblib.load(os.path.join(base, "model.pkl")), joblib.load(os.path.join(base, "vectorizer.pkl"))
+
+
+def test_scorer_matches_sklearn(tmp_path):
+    clf, vectorizer = _fitted(str(tmp_path))
+    X = vectorizer.transform(list(SKILLS) + ["senior python developer", "unknown title"])
+    scorer = LinearSkillScorer.from_estimator(clf)
+    expected = clf.predict_proba(X)
+    # "teamwork" is in every row, which sklearn predicts with a constant estimator
+    assert np.allclose(scorer.predict_proba(X), expected, atol=1e-5)
+    top, probs = scorer.top_k(X, 3)
+    assert np.allclose(probs, np.take_along_axis(expected, top, axis=1), atol=1e-5)
+    # same ranking as sklearn, up to the order of tied labels
+    assert np.allclose(probs, -np.sort(-expected, axis=1)[:, :3], atol=1e-5)
+    assert scorer.ranking_agreement(clf, X, 3) == 1.0
+
+    quantized = scorer.quantized()
+    assert quantized.coef.dtype == np.int8
+    assert np.allclose(quantized.predict_proba(X), expected, atol=0.02)
+
+
+def test_compile_validates_against_sklearn(tmp_path):
+    from app.ml_feedback_training import compile_linear_scorer
+
+    clf, vectorizer = _fitted(str(tmp_path))
+    scorer, info = compile_linear_scorer(clf, vectorizer.transform(list(SKILLS)), topn=3, quantize=True)
+    assert info["exported"] and info["agreement"] == 1.0
+    assert scorer.coef.dtype == np.float32
+    assert "int8_agreement" in info
+
+
+def test_registry_compiles_scorer_from_pickles(tmp_path):
+    base = str(tmp_path)
+    _fitted(base)
+    registry = _registry(base)
+    registry.int8 = True
+    artifacts = registry.get()
+    assert artifacts.format == "pickle"
+    assert artifacts.scorer.coef.dtype == np.int8
+    assert artifacts.scorer.version == artifacts.version
+
+
+def test_constant_labels_compile_to_finite_logits():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.multiclass import OneVsRestClassifier
+
+    X = TfidfVectorizer().fit_transform(list(SKILLS))
+    # columns: always present, never present, then a regular label
+    Y = np.array([[1, 0, int("python" in skills)] for skills in SKILLS.values()])
+    clf = OneVsRestClassifier(LogisticRegression(solver="liblinear")).fit(X, Y)
+    scorer = LinearSkillScorer.from_estimator(clf)
+    assert np.isfinite(scorer.intercept).all()
+    for compiled in (scorer, scorer.quantized()):
+        proba = compiled.predict_proba(X)
+        assert np.isfinite(proba).all()
+        assert np.allclose(proba[:, :2], clf.predict_proba(X)[:, :2], atol=1e-6)
+        top, probs = compiled.top_k(X, 3)
+        assert (top[:, 0] == 0).all() and (top[:, 2] == 1).all()
+        assert np.isfinite(probs).all()
+    # artifacts compiled with infinite intercepts are clamped on load
+    legacy = LinearSkillScorer(scorer.coef, np.array([np.inf, -np.inf, 0.0], dtype=np.float32))
+    assert np.isfinite(legacy.quantized().predict_proba(X)).all()
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import mysql.connector
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import migrations
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def execute(self, sql, params=None):
+        self.db.executed.append(sql)
+        if sql.startswith("SELECT version"):
+            self.result = [(v,) for v in self.db.versions]
+        elif sql.startswith("INSERT INTO schema_migrations"):
+            self.db.versions.add(params[0])
+        elif sql.startswith("EXPLAIN"):
+            self.result = self.db.plans.get(sql[len("EXPLAIN "):], [])
+        elif sql in self.db.failing:
+            raise mysql.connector.Error(msg="fail", errno=self.db.failing[sql])
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self, versions=(), failing=None, plans=None):
+        self.versions = set(versions)
+        self.failing = failing or {}
+        self.plans = plans or {}
+        self.executed = []
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+def test_migrate_applies_pending_once():
+    db = FakeDB()
+    assert migrations.migrate(db, log=lambda *_: None) == [1, 2]
+    assert {1, 2} <= db.versions
+    assert migrations.migrate(db, log=lambda *_: None) == []
+
+
+def test_existing_index_is_skipped_but_other_errors_stop():
+    first = migrations.MIGRATIONS[0][2][0]
+    db = FakeDB(failing={first: migrations.ER_DUP_KEYNAME})
+    assert migrations.migrate(db, log=lambda *_: None) == [1, 2]
+    db = FakeDB(failing={first: 1146})
+    with pytest.raises(migrations.MigrationError):
+        migrations.migrate(db, log=lambda *_: None)
+    assert 1 not in db.versions
+
+
+def test_explain_check_flags_unindexed_full_scans():
+    name, query, _ = migrations.HOT_QUERIES[0]
+    db = FakeDB(plans={query: [{"type": "ALL", "table": "users", "possible_keys": None, "rows": 5000}]})
+    assert migrations.explain_hot_queries(db) == [
+        {"query": name, "table": "users", "possible_keys": None, "rows": 5000}
+    ]
+    db = FakeDB(plans={query: [{"type": "ALL", "table": "users", "possible_keys": "idx_users_email", "rows": 3}]})
+    assert migrations.explain_hot_queries(db) == []
+    assert len(migrations.explain_hot_queries(db, strict=True)) == 1
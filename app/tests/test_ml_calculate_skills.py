@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+from fastapi import HTTPException
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def test_failed_skill_need_write_is_an_error(sqlite_app, monkeypatch):
+    import app.database as database
+    from app.database import fetch_results
+    from app.ml_recommender import HybridRecommender
+    from app.models.employee import ml_calculate_and_insert_skills
+    from app.recommendation_cache import recommendation_cache
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    recommendation_cache.invalidate()
+    monkeypatch.setattr(HybridRecommender, "fetch_trending_skills_from_web", lambda self, topn, employee_id: [
+        {"preferred_label": "Underwater welding", "recommendation_score": 90},
+    ])
+    monkeypatch.setattr(database, "bulk_upsert", fail)
+    before = fetch_results("SELECT skill_id FROM skill_need WHERE employee_id = %s ORDER BY skill_id", (2,))
+    with pytest.raises(HTTPException) as excinfo:
+        ml_calculate_and_insert_skills(2, topn=1)
+    assert excinfo.value.status_code == 500
+    # the transaction was rolled back: previous recommendations and the catalog are intact
+    assert fetch_results("SELECT skill_id FROM skill_need WHERE employee_id = %s ORDER BY skill_id", (2,)) == before
+    assert not fetch_results("SELECT id FROM skill WHERE preferred_label = %s", ("Underwater welding",))
+
+
+def test_cache_hit_still_rewrites_skill_need(sqlite_app, monkeypatch):
+    from app.database import execute_query, fetch_results
+    from app.ml_recommender import HybridRecommender
+    from app.models.employee import ml_calculate_and_insert_skills
+    from app.recommendation_cache import recommendation_cache
+    from app.skill_catalog import skill_catalog
+
+    calls = []
+
+    def recommend(self, topn, employee_id):
+        calls.append(employee_id)
+        return [{"preferred_label": "Underwater welding", "recommendation_score": 90}]
+
+    recommendation_cache.invalidate()
+    skill_catalog.invalidate()
+    monkeypatch.setattr(HybridRecommender, "fetch_trending_skills_from_web", recommend)
+    query = "SELECT s.preferred_label FROM skill_need sn JOIN skill s ON s.id = sn.skill_id WHERE sn.employee_id = %s"
+    ml_calculate_and_insert_skills(2, topn=1)  # adds the skill, bumping the catalog version
+    first = ml_calculate_and_insert_skills(2, topn=1)
+    assert len(calls) == 2
+    execute_query("DELETE FROM skill_need WHERE employee_id = %s", (2,))
+    assert ml_calculate_and_insert_skills(2, topn=1) == first
+    assert len(calls) == 2  # served from the cache...
+    assert [r['preferred_label'] for r in fetch_results(query, (2,))] == ["Underwater welding"]  # ...but written
+    skill_catalog.invalidate()
+    ml_calculate_and_insert_skills(2, topn=1)
+    assert len(calls) == 3  # a catalog reload changes the key
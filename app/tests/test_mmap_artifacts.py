@@ -0,0 +1,53 @@
+import os
+import sys
+
+import joblib
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.ml_recommender import LinearSkillScorer, rank_skills
+from app.mmap_artifacts import load_artifacts, prune_artifacts, write_artifacts
+from app.tests.test_linear_scorer import SKILLS, _fitted
+from app.tests.test_model_registry import _registry
+
+
+def test_mmap_artifacts_round_trip(tmp_path):
+    base = str(tmp_path)
+    clf, vectorizer = _fitted(base)
+    mlb = joblib.load(os.path.join(base, "mlb.pkl"))
+    scorer = LinearSkillScorer.from_estimator(clf)
+    path = os.path.join(base, "mmap", "v1")
+    write_artifacts(path, "v1", vectorizer, mlb.classes_, {"python": 1.4}, scorer, quantize=True)
+
+    version, vec, classes, weights, loaded = load_artifacts(path)
+    assert version == "v1" and weights == {"python": 1.4}
+    assert isinstance(loaded.coef, np.memmap)
+    assert list(classes) == list(mlb.classes_)
+    assert classes[len(classes) - 1] == mlb.classes_[-1]
+    titles = list(SKILLS) + ["python developer"]
+    assert abs(vec.transform(titles) - vectorizer.transform(titles)).max() < 1e-12
+    assert np.allclose(loaded.predict_proba(vec.transform(titles)), clf.predict_proba(vectorizer.transform(titles)), atol=1e-5)
+    assert load_artifacts(path, int8=True)[4].coef.dtype == np.int8
+
+
+def test_registry_prefers_mmap_version(tmp_path):
+    base = str(tmp_path)
+    clf, vectorizer = _fitted(base)
+    registry = _registry(base)
+    pickled = registry.get()
+    assert pickled.format == "pickle"
+
+    # write the memory-mapped copy of the current version, then a new version without one
+    path = os.path.join(registry.artifacts_dir, pickled.version)
+    write_artifacts(path, pickled.version, vectorizer, pickled.classes, {}, LinearSkillScorer.from_estimator(clf))
+    registry._signature = None
+    mapped = registry.get()
+    assert mapped.format == "mmap" and mapped.clf is None
+    assert rank_skills(mapped, ["data engineer"], 3) == rank_skills(pickled, ["data engineer"], 3)
+
+    os.makedirs(os.path.join(registry.artifacts_dir, "old.tmp"))
+    prune_artifacts(registry.artifacts_dir, keep={pickled.version})
+    assert os.listdir(registry.artifacts_dir) == [pickled.version]
@@ -0,0 +1,102 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from app.model_registry import ModelRegistry, dump_atomic, write_manifest
+
+
+def _write_artifacts(base, skills_per_title, weights=None):
+    titles = list(skills_per_title)
+    vectorizer = TfidfVectorizer()
+    X = vectorizer.fit_transform(titles)
+    mlb = MultiLabelBinarizer()
+    Y = mlb.fit_transform([skills_per_title[t] for t in titles])
+    clf = OneVsRestClassifier(LogisticRegression(solver="liblinear")).fit(X, Y)
+    dump_atomic(clf, os.path.join(base, "model.pkl"))
+    dump_atomic(vectorizer, os.path.join(base, "vectorizer.pkl"))
+    dump_atomic(mlb, os.path.join(base, "mlb.pkl"))
+    dump_atomic(weights or {}, os.path.join(base, "weights.pkl"))
+    return write_manifest(path=os.path.join(base, "manifest.json"))
+
+
+def _registry(base):
+    return ModelRegistry(
+        model_path=os.path.join(base, "model.pkl"),
+        vectorizer_path=os.path.join(base, "vectorizer.pkl"),
+        mlb_path=os.path.join(base, "mlb.pkl"),
+        weights_path=os.path.join(base, "weights.pkl"),
+        manifest_path=os.path.join(base, "manifest.json"),
+        check_interval=0,
+        artifacts_dir=os.path.join(base, "mmap"),
+    )
+
+
+def test_registry_loads_once_and_swaps_on_new_manifest(tmp_path):
+    base = str(tmp_path)
+    registry = _registry(base)
+    assert registry.get() is None
+
+    first = _write_artifacts(base, {"software developer": ["python", "sql"], "accountant": ["budgeting"]})
+    artifacts = registry.get()
+    assert artifacts.version == first["version"]
+    assert registry.get() is artifacts
+    assert registry.stats()["loads"] == 1
+
+    second = _write_artifacts(base, {"software developer": ["python"], "nurse": ["patient care"]}, {"python": 1.2})
+    swapped = registry.get()
+    assert swapped is not artifacts
+    assert swapped.version == second["version"]
+    assert "patient care" in swapped.classes
+    assert swapped.skill_weights == {"python": 1.2}
+    # the old snapshot handed to an in-flight request is left intact
+    assert "nurse" not in artifacts.vectorizer.vocabulary_
+
+
+def test_registry_keeps_current_model_when_load_fails(tmp_path):
+    base = str(tmp_path)
+    registry = _registry(base)
+    _write_artifacts(base, {"software developer": ["python", "sql"], "accountant": ["budgeting"]})
+    artifacts = registry.get()
+    with open(os.path.join(base, "model.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+    write_manifest(path=os.path.join(base, "manifest.json"))
+    assert registry.get() is artifacts
+    assert registry.stats()["load_failures"] == 1
+
+
+def test_concurrent_writers_use_separate_temp_files(tmp_path):
+    import json
+    import threading
+    import joblib
+    from app.model_registry import publish_lock
+
+    path = str(tmp_path / "model.pkl")
+    manifest = str(tmp_path / "manifest.json")
+    inside, overlaps = [], []
+
+    def publish(i):
+        with publish_lock(manifest):
+            inside.append(i)
+            if len(inside) > 1:
+                overlaps.append(i)
+            dump_atomic({"run": i, "payload": list(range(20000))}, path)
+            write_manifest(f"v{i}", path=manifest, run=i)
+            inside.remove(i)
+
+    threads = [threading.Thread(target=publish, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not overlaps
+    assert sorted(os.listdir(tmp_path)) == ["manifest.json", "manifest.json.lock", "model.pkl"]
+    with open(manifest) as f:
+        assert joblib.load(path)["run"] == json.load(f)["run"]
@@ -0,0 +1,56 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.occupation_index import OccupationSkillIndex, get_occupation_index, reset_occupation_index
+
+CSV = (
+    "occupationUri,occupationLabel,relationType,skillType,skillUri,skillLabel\n"
+    "u1,software developer,essential,skill,s1,python\n"
+    "u2,accountant,essential,skill,s2,budgeting\n"
+    "u1,software developer,essential,skill,s3,sql\n"
+    "u1,software developer,optional,skill,s4,testing\n"
+    "u2,accountant,optional,skill,s5,auditing\n"
+)
+
+
+def test_index_roundtrip_matches_csv_order(tmp_path):
+    csv_path = tmp_path / "relations.csv"
+    csv_path.write_text(CSV)
+    index_path = str(tmp_path / "index.npz")
+    OccupationSkillIndex.build(str(csv_path)).save(index_path)
+    index = OccupationSkillIndex.load(index_path)
+    assert index.skills_for("software developer") == ["python", "sql", "testing"]
+    assert index.lookup("accountant", 1) == ["budgeting"]
+    # fuzzy match on the precomputed choice list
+    assert index.lookup("software developers", 2) == ["python", "sql"]
+    assert index.lookup("astronaut", 5) == []
+
+
+def test_concurrent_saves_do_not_collide(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    csv_path = tmp_path / "relations.csv"
+    csv_path.write_text(CSV)
+    index = OccupationSkillIndex.build(str(csv_path))
+    index_path = str(tmp_path / "index.npz")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: index.save(index_path), range(8)))
+    assert sorted(os.listdir(tmp_path)) == ["index.npz", "relations.csv"]
+    assert OccupationSkillIndex.load(index_path).skills_for("accountant") == index.skills_for("accountant")
+
+
+def test_get_index_builds_and_persists_once(tmp_path):
+    csv_path = tmp_path / "relations.csv"
+    csv_path.write_text(CSV)
+    index_path = tmp_path / "index.npz"
+    reset_occupation_index()
+    try:
+        index = get_occupation_index(str(csv_path), str(index_path))
+        assert index_path.exists()
+        assert get_occupation_index(str(csv_path), str(index_path)) is index
+    finally:
+        reset_occupation_index()
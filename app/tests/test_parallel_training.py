@@ -0,0 +1,80 @@
+import os
+import sys
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.parallel_training import fit_one_vs_rest
+from app.tests.test_linear_scorer import SKILLS
+
+
+def _training_data():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import MultiLabelBinarizer
+
+    titles = list(SKILLS) + ["senior software developer", "big data engineer", "staff nurse"]
+    skills = list(SKILLS.values()) + [SKILLS["software developer"], SKILLS["data engineer"], SKILLS["nurse"]]
+    return TfidfVectorizer().fit_transform(titles), MultiLabelBinarizer().fit_transform(skills)
+
+
+def _assert_identical(clf, expected):
+    assert list(clf.classes_) == list(expected.classes_)
+    assert len(clf.estimators_) == len(expected.estimators_)
+    for est, ref in zip(clf.estimators_, expected.estimators_):
+        assert type(est) is type(ref)
+        if hasattr(ref, "coef_"):
+            assert np.array_equal(est.coef_, ref.coef_)
+            assert np.array_equal(est.intercept_, ref.intercept_)
+
+
+def test_sharded_fit_matches_serial():
+    X, Y = _training_data()
+    estimator = LogisticRegression(max_iter=2000, C=10, solver='liblinear')
+    expected = OneVsRestClassifier(estimator).fit(X, Y)
+
+    serial = fit_one_vs_rest(estimator, X, Y, workers=1, shard_size=4, progress=None)
+    _assert_identical(serial, expected)
+    assert np.array_equal(serial.predict_proba(X), expected.predict_proba(X))
+
+    lines = []
+    parallel = fit_one_vs_rest(estimator, X, Y, workers=2, shard_size=3, progress=lines.append)
+    _assert_identical(parallel, expected)
+    assert np.array_equal(parallel.predict_proba(X), expected.predict_proba(X))
+    assert any("on 2 worker(s)" in line for line in lines)
+    assert any(f"{Y.shape[1]}/{Y.shape[1]} labels (100%)" in line for line in lines)
+
+
+def test_fallback_without_sklearn_fit_binary(monkeypatch):
+    from app import parallel_training
+    from app.ml_recommender import LinearSkillScorer
+
+    X, Y = _training_data()
+    # one label present in every row and one in none, as in the ESCO relations
+    Y = np.hstack([Y, np.ones((Y.shape[0], 1), dtype=Y.dtype), np.zeros((Y.shape[0], 1), dtype=Y.dtype)])
+    estimator = LogisticRegression(max_iter=2000, C=10, solver='liblinear')
+    expected = fit_one_vs_rest(estimator, X, Y, workers=1, progress=None)
+
+    monkeypatch.setattr(parallel_training, "_fit_binary", None)
+    clf = fit_one_vs_rest(estimator, X, Y, workers=1, progress=None)
+    for est, ref in zip(clf.estimators_, expected.estimators_):
+        if hasattr(ref, "coef_"):
+            assert np.array_equal(est.coef_, ref.coef_)
+        else:
+            assert np.array_equal(est.y_, ref.y_)
+    assert np.array_equal(clf.predict_proba(X), expected.predict_proba(X))
+    proba = LinearSkillScorer.from_estimator(clf).quantized().predict_proba(X)
+    assert np.allclose(proba[:, -2:], [1, 0])
+
+
+def test_memory_cap_limits_workers():
+    X, Y = _training_data()
+    lines = []
+    clf = fit_one_vs_rest(LogisticRegression(solver='liblinear'), X, Y, workers=4, shard_size=2,
+                          max_memory_mb=1e-6, progress=lines.append)
+    assert any("on 1 worker(s)" in line for line in lines)
+    assert len(clf.estimators_) == Y.shape[1]
@@ -0,0 +1,60 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.principal_cache import PrincipalCache
+
+
+def test_lru_eviction_and_hit_rate():
+    cache = PrincipalCache(maxsize=2, ttl=60)
+    cache.put("a@example.com", 1, {"id": 1})
+    cache.put("b@example.com", 1, {"id": 2})
+    assert cache.get("a@example.com", 1) == {"id": 1}
+    cache.put("c@example.com", 1, {"id": 3})  # evicts b, the least recently used
+    assert cache.get("b@example.com", 1) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 1, 1, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_entries_expire_with_token_and_invalidate_by_subject():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put("a@example.com", 1, {"id": 1}, token_expires_in=0)
+    assert cache.get("a@example.com", 1) is None
+    cache.put("a@example.com", 2, {"id": 1})
+    cache.put("a@example.com", 3, {"id": 1})
+    cache.put("b@example.com", 1, {"id": 2})
+    cache.invalidate("a@example.com")
+    assert cache.get("a@example.com", 2) is None
+    assert cache.get("b@example.com", 1) == {"id": 2}
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_protected_requests_skip_users_lookup(sqlite_app):
+    from fastapi.testclient import TestClient
+    from app.database import instrumentation
+    from app.models.auth import principal_cache
+
+    users_lookup = "SELECT * FROM users WHERE email = ?"
+
+    def lookups():
+        return sum(q["count"] for q in instrumentation.snapshot()["queries"] if q["fingerprint"] == users_lookup)
+
+    principal_cache.invalidate()
+    with TestClient(sqlite_app) as client:
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        before = lookups()
+        for _ in range(3):
+            assert client.get("/employee/1", headers=headers).status_code == 200
+        assert lookups() == before + 1
+
+        response = client.post(
+            "/change-password", json={"current_password": "admin", "new_password": "admin2"}, headers=headers,
+        )
+        assert response.status_code == 200
+        assert client.get("/employee/1", headers=headers).status_code == 200
+        assert lookups() == before + 2  # change-password hit the cache, then dropped the entry
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.tests.test_model_registry import _registry, _write_artifacts
+
+
+def test_top_k_indices_matches_full_sort():
+    from app.ml_recommender import top_k_indices
+
+    scores = np.random.default_rng(0).random((6, 40))
+    expected = np.argsort(-scores, axis=1)[:, :5]
+    assert (top_k_indices(scores, 5) == expected).all()
+    assert top_k_indices(scores, 100).shape == (6, 40)
+
+
+def test_recommend_batch_matches_single_calls(sqlite_app, tmp_path, monkeypatch):
+    import app.ml_recommender as ml
+    from app.database import fetch_results
+    from app.skill_catalog import skill_catalog
+
+    labels = [r["preferred_label"] for r in skill_catalog.rows()]
+    employees = fetch_results("SELECT id, job_title, department FROM employee", ())
+    titles = sorted({ml.HybridRecommender.preprocess_job_title(e["job_title"], e["department"]) for e in employees})
+    # every title gets a few catalog skills so scores differ per title
+    _write_artifacts(str(tmp_path), {t: labels[i % 10:i % 10 + 4] for i, t in enumerate(titles)})
+    monkeypatch.setattr(ml, "model_registry", _registry(str(tmp_path)))
+    monkeypatch.setattr(ml, "BATCH_LOOKUP_SIZE", 7)
+
+    recommender = ml.HybridRecommender()
+    ids = [e["id"] for e in employees] + [employees[0]["id"]]
+    batch = recommender.recommend_batch(ids, topn=3)
+    assert list(batch) == [e["id"] for e in employees]
+    for e in employees:
+        single = recommender.fetch_trending_skills_from_web(topn=3, employee_id=e["id"])
+        assert single
+        assert batch[e["id"]] == single
+    # employees sharing a title get their own copies of the result dicts
+    result_ids = [id(s) for skills in batch.values() for s in skills]
+    assert len(result_ids) == len(set(result_ids))
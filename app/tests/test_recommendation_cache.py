@@ -0,0 +1,73 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.recommendation_cache import RecommendationCache
+
+
+def test_keys_follow_model_and_data_versions():
+    cache = RecommendationCache(maxsize=2, ttl=60)
+    key = cache.key("ml-calculate", 1, 10, "v1")
+    cache.put(key, ["a"])
+    assert cache.get(key) == ["a"]
+    assert cache.get(cache.key("ml-calculate", 1, 10, "v2")) is None
+
+    # a result computed before a change is stored under a key that is never looked up again
+    stale = cache.key("ml-calculate", 1, 10, "v1")
+    cache.employee_changed(1)
+    cache.put(stale, ["old"])
+    assert cache.get(cache.key("ml-calculate", 1, 10, "v1")) is None
+
+    # skill_need rewrites only invalidate results that read skill_need
+    computed = cache.key("ml-calculate", 2, 10, "v1")
+    suggested = cache.key("suggested-skills", 2, None, "v1", with_skill_need=True)
+    cache.put(computed, ["b"])
+    cache.put(suggested, ["c"])
+    cache.skill_need_changed(2)
+    assert cache.get(computed) == ["b"]
+    assert cache.get(cache.key("suggested-skills", 2, None, "v1", with_skill_need=True)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 3, 1)
+
+
+def test_data_versions_stay_bounded():
+    cache = RecommendationCache(maxsize=2, ttl=60)
+    stale = {employee_id: cache.key("ml-calculate", employee_id, 10, "v1") for employee_id in range(5)}
+    for employee_id in range(5):
+        cache.employee_changed(employee_id)
+        cache.skill_need_changed(employee_id)
+    assert cache.stats()["tracked_versions"] == 4
+    # employees whose version was dropped never get back a key from before their change
+    for employee_id, key in stale.items():
+        cache.put(key, ["old"])
+        assert cache.get(cache.key("ml-calculate", employee_id, 10, "v1")) is None
+    fresh = cache.key("ml-calculate", 0, 10, "v1")
+    cache.put(fresh, ["new"])
+    assert cache.get(cache.key("ml-calculate", 0, 10, "v1")) == ["new"]
+    cache.employee_changed(5)
+    # dropping employee 3's version moved the floor: a miss, never a stale hit
+    assert cache.get(cache.key("ml-calculate", 0, 10, "v1")) is None
+
+
+def test_suggested_skills_cached_until_feedback(sqlite_app):
+    from fastapi.testclient import TestClient
+    from app.recommendation_cache import recommendation_cache
+
+    recommendation_cache.invalidate()
+    before = recommendation_cache.stats()
+    with TestClient(sqlite_app) as client:
+        headers = {"Authorization": "Bearer " + client.post(
+            "/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]}
+        first = client.get("/employee/3/suggested-skills", headers=headers).json()
+        assert client.get("/employee/3/suggested-skills", headers=headers).json() == first
+        assert first["suggested_skills"]
+        assert recommendation_cache.stats()["hits"] == before["hits"] + 1
+
+        response = client.post("/employee/3/skill-feedback", json={"skill_id": 1, "vote": "up"}, headers=headers)
+        assert response.status_code == 200
+        client.get("/employee/3/suggested-skills", headers=headers)
+        assert recommendation_cache.stats()["misses"] == before["misses"] + 2
+        assert client.get("/admin/recommendation-cache", headers=headers).json()["hits"] == before["hits"] + 1
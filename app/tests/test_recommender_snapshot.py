@@ -0,0 +1,129 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _fit_from_db():
+    import app.ml_recommender as ml
+
+    recommender = ml.HybridRecommender()
+    recommender.fit(ml.get_employees(None), ml.get_trainings(None), ml.get_employee_skills(None),
+                    ml.get_training_history(None), ml.get_training_need(None))
+    return recommender
+
+
+def _assert_same_state(a, b):
+    assert a._employee_pos == b._employee_pos
+    assert a.training_ids == b.training_ids
+    assert list(a.skill_ids) == list(b.skill_ids)
+    for name in a._MATRICES:
+        assert abs(getattr(a, name) - getattr(b, name)).max() < 1e-6, name
+
+
+def test_save_load_round_trip(sqlite_app, tmp_path):
+    from app.ml_recommender import HybridRecommender
+
+    recommender = _fit_from_db()
+    path = str(tmp_path / "snapshot.npz")
+    recommender.save(path)
+    loaded = HybridRecommender.load(path)
+    _assert_same_state(recommender, loaded)
+    assert len(loaded.training_need) == len(recommender.training_need)
+    assert [name for name in os.listdir(tmp_path) if name.startswith("snapshot")] == ["snapshot.npz"]
+    for employee_id in (1, 2, 3):
+        assert loaded.recommend_trainings(employee_id) == recommender.recommend_trainings(employee_id)
+
+
+def test_concurrent_saves_do_not_share_a_temp_file(sqlite_app, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.ml_recommender import HybridRecommender
+
+    recommender = _fit_from_db()
+    path = str(tmp_path / "snapshot.npz")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: recommender.save(path), range(8)))
+    assert [name for name in os.listdir(tmp_path) if name.startswith("snapshot")] == ["snapshot.npz"]
+    _assert_same_state(recommender, HybridRecommender.load(path))
+
+
+def test_incremental_updates_match_refit(sqlite_app):
+    from app.database import execute_query, fetch_results
+    from app.models.training import assign_employee_to_training, remove_employee_from_training
+    from app.recommender_snapshot import recommender_snapshot
+
+    original = recommender_snapshot.get()
+    original_history = original.user_item_matrix.copy()
+    taken = {(r['employee_id'], r['training_id']) for r in fetch_results("SELECT employee_id, training_id FROM employee_training", ())}
+    new = next((e, t) for e in (1, 2, 3) for t in (1, 2, 3, 4, 5) if (e, t) not in taken)
+    assign_employee_to_training(*new)
+    remove_employee_from_training(*sorted(taken)[0])
+    # employee_skill has no endpoints; writers call the snapshot hooks directly
+    skill = fetch_results("SELECT MAX(id) AS id FROM skill", ())[0]['id']
+    execute_query("INSERT INTO employee_skill (employee_id, skill_id, proficiency_level) VALUES (%s, %s, %s)", (4, skill, 2))
+    recommender_snapshot.skill_added(4, skill)
+    assert recommender_snapshot.stats()["incremental_updates"] == 3
+    snapshot = recommender_snapshot.get()
+    _assert_same_state(snapshot, _fit_from_db())
+    # updates are published as a new object; a reader holding the old one is unaffected
+    assert snapshot is not original
+    assert abs(original.user_item_matrix - original_history).max() == 0
+
+    # new employees are picked up by the endpoint, deleted ones are dropped
+    execute_query("INSERT INTO employee (first_name, last_name, email, job_title) VALUES (%s, %s, %s, %s)",
+                  ("New", "Hire", "new.hire@example.com", "Engineer"))
+    new_id = fetch_results("SELECT id FROM employee WHERE email = %s", ("new.hire@example.com",))[0]['id']
+    from fastapi import HTTPException
+    from app.models.recommendation import get_recommendations
+    assert get_recommendations(new_id).recommended_trainings is not None
+    with pytest.raises(HTTPException):
+        get_recommendations(999999)
+    assert recommender_snapshot.get().has_employee(new_id)
+    assert not snapshot.has_employee(new_id)
+    recommender_snapshot.employee_removed(new_id)
+    assert not recommender_snapshot.get().has_employee(new_id)
+    assert recommender_snapshot.stats()["fits"] >= 1
+    assert np.all(recommender_snapshot.get().user_item_matrix.data == 1)
+
+
+def test_set_entry_splices_binary_entries():
+    from scipy import sparse
+    from app.ml_recommender import _set_entry
+
+    rng = np.random.default_rng(0)
+    dense = (rng.random((6, 5)) < 0.4).astype(np.float32)
+    matrix = sparse.csr_matrix(dense)
+    for row, col in np.ndindex(dense.shape):
+        for present in (True, False):
+            expected = dense.copy()
+            expected[row, col] = float(present)
+            updated = _set_entry(matrix, row, col, present)
+            assert np.array_equal(updated.toarray(), expected)
+            assert updated.has_sorted_indices
+    assert np.array_equal(matrix.toarray(), dense)
+
+
+def test_recommendations_endpoint_returns_trainings(sqlite_app):
+    from fastapi.testclient import TestClient
+    from app.database import fetch_results
+    from app.recommender_snapshot import recommender_snapshot
+
+    with TestClient(sqlite_app) as client:
+        assert client.get("/recommendation/recommendations/1").status_code == 401
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        response = client.get("/recommendation/recommendations/1", params={"topn": 3},
+                              headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    trainings = response.json()["recommended_trainings"]
+    expected = recommender_snapshot.get().recommend_trainings(1, topn=3)
+    assert trainings
+    assert {t["id"]: t["recommendation_score"] for t in trainings} == {r["id"]: r["recommendation_score"] for r in expected}
+    scores = [t["recommendation_score"] for t in trainings]
+    assert scores == sorted(scores, reverse=True)
+    titles = {r['id']: r['title'] for r in fetch_results("SELECT id, title FROM training", ())}
+    assert all(t["title"] == titles[t["id"]] for t in trainings)
@@ -0,0 +1,36 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def test_catalog_loads_once_and_tracks_inserts(sqlite_app, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.database import execute_query
+    from app.skill_catalog import skill_catalog
+
+    assert len(skill_catalog.rows()) == 30
+    version = skill_catalog.version
+    before = skill_catalog.stats()
+    with TestClient(sqlite_app) as client:
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        response = client.post(
+            "/skill/", json={"preferred_label": "Quantum Computing", "skill_type": "knowledge"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+    row = skill_catalog.get_by_label("quantum computing")
+    assert row["skill_type"] == "knowledge"
+    assert skill_catalog.id_map()[row["id"]] is row
+    assert skill_catalog.version == version + 1
+
+    # rows inserted elsewhere are picked up by the incremental refresh
+    execute_query("INSERT INTO skill (preferred_label) VALUES (%s)", ("Welding",))
+    monkeypatch.setattr(skill_catalog, "_next_refresh", 0.0)
+    assert skill_catalog.get_by_label("welding") is not None
+    stats = skill_catalog.stats()
+    assert stats["full_loads"] == before["full_loads"]
+    assert stats["incremental_refreshes"] == before["incremental_refreshes"] + 1
+    assert stats["size"] == 32
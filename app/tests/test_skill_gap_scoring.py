@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _reference(employee_id, topn, cf_scores, weight):
+    """The per-skill loop recommend() used before scoring was vectorized."""
+    from app.database import fetch_results
+
+    rows = fetch_results("SELECT id, preferred_label, skill_type FROM skill ORDER BY id", ())
+    held = {s['skill_id']: int(s['proficiency_level']) if s['proficiency_level'] is not None else 1
+            for s in fetch_results("SELECT skill_id, proficiency_level FROM employee_skill WHERE employee_id = %s", (employee_id,))}
+    scored = []
+    for s in rows:
+        if s['id'] not in held:
+            score = 100
+        else:
+            if held[s['id']] >= 5:
+                continue
+            score = max(0, 100 - (held[s['id']] - 1) * 25)
+        if cf_scores:
+            score = int(round((1 - weight) * score + weight * 100 * cf_scores.get(s['id'], 0.0)))
+        scored.append({"id": s['id'], "preferred_label": s['preferred_label'], "skill_type": s['skill_type'],
+                       "recommendation_score": score})
+    return sorted(scored, key=lambda x: x["recommendation_score"], reverse=True)[:topn]
+
+
+@pytest.mark.parametrize("blend_weight", [0.0, 0.3])
+def test_vectorized_gap_scores_match_reference(sqlite_app, monkeypatch, blend_weight):
+    import app.ml_recommender as ml
+    from app.database import execute_query
+
+    # a fully proficient skill is skipped, a low one ranks below missing skills
+    execute_query("UPDATE employee_skill SET proficiency_level = 5 WHERE employee_id = 1 AND skill_id IN "
+                  "(SELECT skill_id FROM employee_skill WHERE employee_id = 1 LIMIT 1)")
+    execute_query("UPDATE employee_skill SET proficiency_level = NULL WHERE employee_id = 2")
+    monkeypatch.setattr(ml, "CF_BLEND_WEIGHT", blend_weight)
+    recommender = ml.HybridRecommender()
+    recommender.fit(
+        ml.get_employees(None), ml.get_trainings(None), ml.get_employee_skills(None),
+        ml.get_training_history(None), pd.DataFrame({"employee_id": [1], "skill_id": [1], "recommendation_score": [1]}),
+    )
+    for employee_id in (1, 2, 3):
+        cf_scores = recommender.collaborative_skill_scores(employee_id)
+        assert cf_scores
+        for topn in (3, 30, 100):
+            expected = _reference(employee_id, topn, cf_scores, ml.CF_BLEND_WEIGHT)
+            assert recommender.recommend(employee_id, topn=topn) == expected
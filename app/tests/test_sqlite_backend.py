@@ -0,0 +1,70 @@
+import os
+import sys
+
+import mysql.connector
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.database import database, sqlite_backend
+from app.database.sqlite_backend import translate
+
+
+def test_translate_mysql_dialect():
+    assert translate("SELECT * FROM users WHERE email = %s") == "SELECT * FROM users WHERE email = ?"
+    assert translate("SELECT DATE_FORMAT(f.feedback_date, '%Y-%m') AS month FROM feedback f") == (
+        "SELECT strftime('%Y-%m', f.feedback_date) AS month FROM feedback f"
+    )
+    assert translate("SELECT COUNT(*) FROM training WHERE start_date > CURDATE()") == (
+        "SELECT COUNT(*) FROM training WHERE start_date > DATE('now', 'localtime')"
+    )
+    assert translate("INSERT IGNORE INTO t (a) VALUES (%s)") == "INSERT OR IGNORE INTO t (a) VALUES (?)"
+    assert translate(
+        "INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE recommendation_score = VALUES(recommendation_score)"
+    ).endswith("ON CONFLICT DO UPDATE SET recommendation_score = excluded.recommendation_score")
+
+
+def test_translate_nested_concat_keeps_string_literals():
+    sql = translate("SELECT GROUP_CONCAT(DISTINCT CONCAT(t.title, ' (', t.category, ')') ORDER BY t.title) FROM t")
+    assert "(t.title || ' (' || t.category || ')')" in sql
+    assert sql.startswith("SELECT group_concat(DISTINCT ")
+    # placeholders inside string literals are left alone
+    assert translate("SELECT '%s' WHERE a = %s") == "SELECT '%s' WHERE a = ?"
+
+
+def test_connection_mimics_mysql_connector(tmp_path):
+    conn = sqlite_backend.connect(str(tmp_path / "hr.db"))
+    sqlite_backend.create_schema(conn)
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("INSERT INTO skill (preferred_label, skill_type) VALUES (%s, %s)", ("python", "knowledge"))
+    assert cursor.lastrowid == 1
+    cursor.execute("INSERT INTO employee (first_name, email) VALUES (%s, %s)", ("Ann", "ann@example.com"))
+    cursor.execute("INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s)", (1, 1, 5))
+    cursor.execute(
+        "INSERT INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE recommendation_score = VALUES(recommendation_score)",
+        (1, 1, 9),
+    )
+    cursor.execute("SELECT skill_id, recommendation_score FROM skill_need")
+    assert cursor.fetchall() == [{"skill_id": 1, "recommendation_score": 9}]
+    with pytest.raises(mysql.connector.Error):
+        cursor.execute("SELECT * FROM missing_table")
+    conn.close()
+    assert not conn.is_connected()
+
+
+def test_api_runs_against_seeded_sqlite(sqlite_app):
+    from fastapi.testclient import TestClient
+
+    assert database.get_backend() == "sqlite"
+    with TestClient(sqlite_app) as client:
+        login = client.post("/login", data={"username": "admin@example.com", "password": "admin"})
+        assert login.status_code == 200
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        for path in ("/employee/1", "/employee/1/suggested-skills", "/analytics/overview", "/analytics/trainings"):
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, (path, response.text)
+        assert client.get("/analytics/overview", headers=headers).json()["employee_count"] == 20
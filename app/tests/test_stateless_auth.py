@@ -0,0 +1,62 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.token_revocation import TokenRevocation
+
+
+def test_revocation_versions_and_epoch(sqlite_app):
+    revocation = TokenRevocation()
+    old = {"sub": "a@example.com", **revocation.claims("a@example.com")}
+    other = {"sub": "b@example.com", **revocation.claims("b@example.com")}
+    revocation.revoke_subject("a@example.com")
+    assert revocation.is_revoked(old)
+    assert not revocation.is_revoked(other)
+    assert not revocation.is_revoked({"sub": "a@example.com", **revocation.claims("a@example.com")})
+    revocation.revoke_all()
+    assert revocation.is_revoked(other)
+    assert revocation.stats()["rejected_tokens"] == 2
+    assert revocation.stats()["shared"]
+
+
+def test_revocations_reach_other_workers_and_survive_restarts(sqlite_app):
+    worker_a = TokenRevocation(refresh_interval=60)
+    worker_b = TokenRevocation(refresh_interval=60)
+    token = {"sub": "a@example.com", **worker_b.claims("a@example.com")}
+    everyone = {"sub": "b@example.com", **worker_b.claims("b@example.com")}
+    worker_a.revoke_subject("a@example.com")
+    worker_a.revoke_all()
+    # worker_b still uses its copy until the refresh interval passes
+    assert not worker_b.is_revoked(token)
+    worker_b.refresh(force=True)
+    assert worker_b.is_revoked(token)
+    assert worker_b.is_revoked(everyone)
+
+    restarted = TokenRevocation(epoch=1)
+    assert restarted.is_revoked(token)
+    assert restarted.epoch == 2  # AUTH_REVOCATION_EPOCH is added to the stored epoch
+    assert not restarted.is_revoked({"sub": "a@example.com", **restarted.claims("a@example.com")})
+
+
+def test_stateless_mode_skips_db_and_honours_forced_logout(sqlite_app, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.database import instrumentation
+    from app.models import auth
+
+    monkeypatch.setattr(auth, "STATELESS_AUTH", True)
+    with TestClient(sqlite_app) as client:
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        instrumentation.reset()
+        me = client.get("/me", headers=headers)
+        assert me.status_code == 200
+        assert me.json()["email"] == "admin@example.com"
+        assert instrumentation.snapshot()["queries"] == []
+
+        assert client.post("/admin/revoke-tokens", params={"email": "admin@example.com"}, headers=headers).status_code == 200
+        assert client.get("/me", headers=headers).status_code == 401
+        fresh = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        assert client.get("/me", headers={"Authorization": f"Bearer {fresh}"}).status_code == 200
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import sys
+
+import mysql.connector
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app import streaming
+
+
+def _rows(n, closed, fail=False):
+    try:
+        if fail:
+            raise mysql.connector.errors.PoolError(msg="pool exhausted")
+        for i in range(n):
+            yield {"id": i}
+    finally:
+        closed.append(True)
+
+
+def test_query_errors_become_http_500(sqlite_app, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.models import employee
+
+    monkeypatch.setattr(employee, "fetch_iter", lambda *a, **k: _rows(3, [], fail=True))
+    with TestClient(sqlite_app, raise_server_exceptions=False) as client:
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        assert client.get("/employee/", headers={"Authorization": f"Bearer {token}"}).status_code == 500
+
+
+def test_streams_rows_and_closes_iterator(sqlite_app):
+    from fastapi.testclient import TestClient
+    from app.database import fetch_results
+
+    with TestClient(sqlite_app) as client:
+        token = client.post("/login", data={"username": "admin@example.com", "password": "admin"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        employees = client.get("/employee/", headers=headers).json()["employee"]
+        assert len(employees) == len(fetch_results("SELECT id FROM employee", ()))
+        export = client.get("/analytics/export", headers=headers)
+        assert export.status_code == 200
+        assert export.text.startswith("EMPLOYEES")
+    from app.database import pool_stats
+    assert pool_stats()["checked_out"] == 0
+
+
+@pytest.mark.parametrize("spec_version", ["2.0", "2.4"])
+def test_iterator_closed_on_client_disconnect(spec_version):
+    closed = []
+    response = streaming.json_stream_response(_rows(5000, closed))
+    assert not closed
+
+    async def receive():
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError("client went away")
+
+    scope = {"type": "http", "asgi": {"spec_version": spec_version}}
+    with pytest.raises(Exception):
+        asyncio.run(response(scope, receive, send))
+    assert closed == [True]
@@ -0,0 +1,153 @@
+"""
+Token revocation for the HR Management API.
+
+Access tokens carry two small integers: ``ver`` (the subject's token version
+when it was issued) and ``epoch`` (the global revocation epoch). A token is
+rejected when either is older than the current value, so forcing a logout
+is a counter bump.
+
+The counters live in the ``token_revocation`` table (one row per revoked
+subject, plus the ``*`` row for the global epoch), so a revocation reaches
+every worker and survives restarts. Each process keeps a copy and reloads
+it at most every ``AUTH_REVOCATION_REFRESH`` seconds, so checking a token
+needs no database access on the hot path; a revocation made in another
+worker takes effect within that interval. Without the table (migration 2
+not applied) the counters stay per process.
+
+``AUTH_REVOCATION_EPOCH`` is added to the stored epoch, so raising it (e.g.
+on deploy) revokes every outstanding token.
+"""
+
+import os
+import threading
+import time
+
+import mysql.connector
+
+from app.database import execute_query, fetch_results
+
+# Seconds between reloads of the shared revocation counters
+AUTH_REVOCATION_REFRESH = float(os.getenv("AUTH_REVOCATION_REFRESH", "5"))
+
+# token_revocation row holding the global epoch (never a valid email)
+EPOCH_SUBJECT = "*"
+
+
+class TokenRevocation:
+    """Per-subject token versions plus a global epoch, shared through the database."""
+
+    def __init__(self, epoch=0, refresh_interval=AUTH_REVOCATION_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._base_epoch = epoch
+        self._epoch = epoch
+        self._versions = {}
+        self._next_refresh = 0.0
+        self._shared = False
+        self._refreshes = 0
+        self._rejected = 0
+
+    def _load(self):
+        rows = fetch_results("SELECT subject, version FROM token_revocation", ())
+        versions = {row['subject']: int(row['version']) for row in rows}
+        epoch = self._base_epoch + versions.pop(EPOCH_SUBJECT, 0)
+        with self._lock:
+            self._epoch, self._versions = epoch, versions
+            self._shared = True
+            self._refreshes += 1
+
+    def refresh(self, force=False):
+        """Reload the shared counters if the refresh interval has passed (or ``force``)."""
+        if not force and time.monotonic() < self._next_refresh:
+            return
+        # One thread reloads; the others keep checking against the current copy
+        if not self._refresh_lock.acquire(blocking=force):
+            return
+        try:
+            if force or time.monotonic() >= self._next_refresh:
+                self._next_refresh = time.monotonic() + self.refresh_interval
+                try:
+                    self._load()
+                except mysql.connector.Error as e:
+                    if self._shared or not self._refreshes:
+                        print(f"[WARNING] Could not load token revocations: {e}. Using per-process state.")
+                    self._shared = False
+                    self._refreshes += 1
+        finally:
+            self._refresh_lock.release()
+
+    def invalidate(self):
+        """Reload from the database on next use (e.g. after switching databases)."""
+        with self._lock:
+            self._epoch, self._versions = self._base_epoch, {}
+            self._next_refresh = 0.0
+
+    @property
+    def epoch(self):
+        self.refresh()
+        return self._epoch
+
+    def version(self, subject):
+        """Return the token version new tokens for ``subject`` must carry."""
+        self.refresh()
+        return self._versions.get(subject, 0)
+
+    def claims(self, subject):
+        """Claims to embed in a token issued now for ``subject``."""
+        self.refresh()
+        with self._lock:
+            return {"ver": self._versions.get(subject, 0), "epoch": self._epoch}
+
+    def is_revoked(self, payload):
+        """True when the token's version or epoch predates a revocation."""
+        self.refresh()
+        with self._lock:
+            revoked = (
+                payload.get("epoch", 0) < self._epoch
+                or payload.get("ver", 0) < self._versions.get(payload.get("sub"), 0)
+            )
+            if revoked:
+                self._rejected += 1
+        return revoked
+
+    def _bump(self, subject):
+        try:
+            execute_query(
+                "INSERT INTO token_revocation (subject, version) VALUES (%s, 1) "
+                "ON DUPLICATE KEY UPDATE version = version + 1",
+                (subject,),
+            )
+        except mysql.connector.Error as e:
+            print(f"[WARNING] Could not store token revocation for {subject}: {e}. Revoking in this process only.")
+            with self._lock:
+                if subject == EPOCH_SUBJECT:
+                    self._epoch += 1
+                else:
+                    self._versions[subject] = self._versions.get(subject, 0) + 1
+            return
+        self.refresh(force=True)
+
+    def revoke_subject(self, subject):
+        """Invalidate every token issued so far for ``subject``."""
+        self._bump(subject)
+        return self._versions.get(subject, 0)
+
+    def revoke_all(self):
+        """Invalidate every token issued so far."""
+        self._bump(EPOCH_SUBJECT)
+        return self._epoch
+
+    def stats(self):
+        with self._lock:
+            return {
+                "epoch": self._epoch,
+                "revoked_subjects": len(self._versions),
+                "rejected_tokens": self._rejected,
+                "shared": self._shared,
+                "refreshes": self._refreshes,
+                "refresh_interval": self.refresh_interval,
+            }
+
+
+revocation = TokenRevocation(epoch=int(os.getenv("AUTH_REVOCATION_EPOCH", "0")))
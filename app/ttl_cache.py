@@ -0,0 +1,102 @@
+"""
+Thread-safe TTL + LRU cache shared by the principal and recommendation caches.
+
+Entries live in an ``OrderedDict`` in least-recently-used order. Lookups move
+an entry to the end, inserts beyond ``maxsize`` evict from the front, and an
+entry past its expiry time is dropped when it is next looked up. Hit, miss,
+eviction, expiration and invalidation counters back ``stats()``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe TTL + LRU cache.
+
+    Args:
+        maxsize: maximum number of entries; 0 disables the cache.
+        ttl: seconds an entry stays valid after it was stored.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key):
+        """Return the cached value, or None on a miss."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value, lifetime=None):
+        """Cache ``value`` for ``ttl`` seconds, or ``lifetime`` if that is shorter."""
+        if not self.enabled:
+            return
+        lifetime = self.ttl if lifetime is None else min(self.ttl, lifetime)
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _drop_locked(self, predicate):
+        """Drop the entries whose key matches ``predicate``; caller holds ``_lock``."""
+        keys = [k for k in self._entries if predicate(k)]
+        for k in keys:
+            del self._entries[k]
+        self._invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = self._misses = self._evictions = self._expirations = self._invalidations = 0
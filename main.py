@@ -1,6 +1,6 @@
 
-from fastapi import FastAPI, Depends
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -15,6 +15,11 @@ from app.models.feedback import router as feedback_router
 
 from app.models.analytics import router as analytics_router
 from app.models.recommendation import router as recommendation_router
+from app.models.admin import router as admin_router
+from app.database.async_database import close_async_pool
+from app.database.instrumentation import QueryCountMiddleware
+from app.database import ReadYourWritesMiddleware
+from app.hashing_pool import hashing_pool, HashingOverloaded
 
 app = FastAPI()
 
@@ -37,6 +42,10 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
+# Count DB statements per request and flag handlers that issue too many
+app.add_middleware(QueryCountMiddleware)
+# Reads after a write in the same request go to the primary (no-op without replicas)
+app.add_middleware(ReadYourWritesMiddleware)
 
 protected = [Depends(get_current_user)]
 
@@ -51,7 +60,21 @@ app.include_router(feedback_router, prefix="/feedback", tags=["feedback"], depen
 
 app.include_router(analytics_router, prefix="/analytics", tags=["analytics"], dependencies=protected)
 
-#app.include_router(recommendation_router, prefix="/recommendation", tags=["recommendation"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"], dependencies=protected)
+
+app.include_router(recommendation_router, prefix="/recommendation", tags=["recommendation"], dependencies=protected)
+
+
+@app.exception_handler(HashingOverloaded)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloaded):
+    # bcrypt pool is saturated (e.g. a login storm); shed load instead of queueing
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.on_event("shutdown")
+async def shutdown_database():
+    await close_async_pool()
+    hashing_pool.shutdown()
 
 @app.get("/")
 def read_root():
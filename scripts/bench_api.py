@@ -0,0 +1,116 @@
+"""Benchmark API endpoints in-process against a seeded SQLite database.
+
+Seeds a throwaway SQLite file (or uses ``--db``), points the app at it via
+``DATABASE_URL=sqlite:///...``, logs in and drives the hottest endpoints
+through the ASGI app, reporting latency percentiles per endpoint. No MySQL
+server or network is needed, so results are repeatable across runs.
+
+Usage:
+  python scripts/bench_api.py --employees 1000 --iterations 200
+  python scripts/bench_api.py --db data/hr_bench.db --profile bench.prof
+"""
+import argparse
+import asyncio
+import cProfile
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+
+ENDPOINTS = [
+    "/me",
+    "/employee/1",
+    "/employee/?limit=50",
+    "/employee/1/suggested-skills",
+    "/employee/db-skills/1",
+    "/feedback/1",
+    "/manager/1/team",
+    "/manager/1/team-analytics",
+    "/training/",
+    "/analytics/overview",
+    "/analytics/trainings",
+    "/analytics/feedback",
+    "/analytics/skills",
+    "/search-employee?query=First1",
+]
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run(app, endpoints, iterations, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        login = await client.post("/login", data={"username": "admin@example.com", "password": "admin"})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(path):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return (time.perf_counter() - start) * 1000, response.status_code
+
+        results = {}
+        for path in endpoints:
+            await client.get(path, headers=headers)  # warm-up
+            samples = await asyncio.gather(*(timed(path) for _ in range(iterations)))
+            results[path] = samples
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="existing seeded SQLite file (default: seed a temporary one)")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--endpoint", action="append", help="endpoint path to benchmark (repeatable)")
+    parser.add_argument("--profile", help="write cProfile stats for the whole run to this file")
+    parser.add_argument("--verbose", action="store_true", help="keep slow-query / N+1 warnings")
+    args = parser.parse_args()
+    if not args.verbose:
+        logging.getLogger("app.database.queries").setLevel(logging.ERROR)
+
+    path = args.db
+    if path is None:
+        from scripts.seed_sqlite import seed
+        path = os.path.join(tempfile.mkdtemp(prefix="hr_bench_"), "hr_bench.db")
+        seed(path, employees=args.employees, log=lambda *_: None)
+    for key in ("JAWSDB_URL", "CLEARDB_DATABASE_URL", "DATABASE_REPLICA_URLS"):
+        os.environ.pop(key, None)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+
+    from main import app
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    results = asyncio.run(run(app, args.endpoint or ENDPOINTS, args.iterations, args.concurrency))
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    print(f"{'endpoint':40s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'mean ms':>8s} {'errors':>7s}")
+    for path, samples in results.items():
+        latencies = [ms for ms, _ in samples]
+        errors = sum(1 for _, code in samples if code >= 400)
+        print(
+            f"{path:40s} {_percentile(latencies, 50):8.2f} {_percentile(latencies, 95):8.2f} "
+            f"{_percentile(latencies, 99):8.2f} {statistics.mean(latencies):8.2f} {errors:7d}"
+        )
+    if profiler:
+        print(f"cProfile stats written to {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare sync vs async route handlers under I/O-bound database load.
+
+Mounts two routes on a throwaway FastAPI app -- one sync ``def`` using
+``app.database.fetch_results`` and one ``async def`` using
+``app.database.async_fetch_results`` -- and fires N concurrent requests at
+each, every request running ``SELECT SLEEP(delay)`` on the configured DB.
+Sync handlers are capped by FastAPI's threadpool (40 threads by default);
+async handlers are capped only by the database pool size.
+
+Usage:
+  # uses the same DB env vars as the app (JAWSDB_URL / DATABASE_URL / DB_*)
+  DB_POOL_SIZE=50 DB_POOL_MAX_OVERFLOW=150 python scripts/bench_async_db.py --requests 200 --delay 0.2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from fastapi import FastAPI
+
+from app.database import fetch_results, async_fetch_results
+
+
+def build_app(delay: float):
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_route():
+        return fetch_results("SELECT SLEEP(%s) AS slept", (delay,))
+
+    @app.get("/async")
+    async def async_route():
+        return await async_fetch_results("SELECT SLEEP(%s) AS slept", (delay,))
+
+    return app
+
+
+async def run(path: str, app, n: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # warm up pools so connection setup is not measured
+        await client.get(path)
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(n)))
+        elapsed = time.perf_counter() - start
+    failures = sum(1 for r in responses if r.status_code != 200)
+    return elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds each query sleeps on the server")
+    args = parser.parse_args()
+
+    app = build_app(args.delay)
+    serial = args.requests * args.delay
+    print(f"{args.requests} concurrent requests, {args.delay:.3f}s per query (serial time {serial:.1f}s)")
+    for path in ("/sync", "/async"):
+        elapsed, failures = asyncio.run(run(path, app, args.requests))
+        print(
+            f"{path:7s} {elapsed:7.2f}s  {args.requests / elapsed:8.1f} req/s  "
+            f"effective concurrency {serial / elapsed:6.1f}  failures {failures}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure how label-sharded one-vs-rest training scales with worker processes.
+
+Builds a synthetic job-title/skill dataset shaped like the ESCO training set
+(short titles, a few dozen skills per title, a long tail of rare skills),
+fits it with ``app.parallel_training.fit_one_vs_rest`` at 1..N workers and
+reports wall time, speedup over one worker, peak child memory, and whether
+every fitted estimator is identical to the serial fit.
+
+Usage:
+  python scripts/bench_training.py --titles 3000 --labels 2000 --max-workers 4
+  TRAIN_TMP_DIR=/dev/shm python scripts/bench_training.py --shard-size 128
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from app.parallel_training import fit_one_vs_rest
+
+
+def build_dataset(n_titles, n_labels, n_words, skills_per_title, seed=0):
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(n_words)]
+    # Zipf-like label popularity, like ESCO's transversal vs specialist skills
+    popularity = 1.0 / np.arange(1, n_labels + 1)
+    popularity /= popularity.sum()
+    titles, skills = [], []
+    for _ in range(n_titles):
+        titles.append(" ".join(rng.choice(words, size=rng.integers(2, 6))))
+        skills.append([f"skill {i}" for i in rng.choice(n_labels, size=skills_per_title, replace=False, p=popularity)])
+    X = TfidfVectorizer(analyzer='word', ngram_range=(1, 1)).fit_transform(titles)
+    Y = MultiLabelBinarizer().fit_transform(skills)
+    return X, Y
+
+
+def same_model(a, b):
+    if list(a.classes_) != list(b.classes_) or len(a.estimators_) != len(b.estimators_):
+        return False
+    for ea, eb in zip(a.estimators_, b.estimators_):
+        if type(ea) is not type(eb):
+            return False
+        if hasattr(ea, "coef_"):
+            if not (np.array_equal(ea.coef_, eb.coef_) and np.array_equal(ea.intercept_, eb.intercept_)):
+                return False
+        elif not np.array_equal(ea.y_, eb.y_):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=3000)
+    parser.add_argument("--labels", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--skills-per-title", type=int, default=30)
+    parser.add_argument("--shard-size", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    X, Y = build_dataset(args.titles, args.labels, args.words, args.skills_per_title)
+    print(f"{X.shape[0]} titles x {X.shape[1]} features, {Y.shape[1]} labels, {os.cpu_count()} CPUs")
+    estimator = LogisticRegression(max_iter=2000, C=10, solver='liblinear')
+    baseline = reference = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        clf = fit_one_vs_rest(estimator, X, Y, workers=workers, shard_size=args.shard_size, progress=None)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            baseline, reference = elapsed, clf
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(
+            f"workers {workers:2d}  {elapsed:7.2f}s  speedup {baseline / elapsed:5.2f}x  "
+            f"peak worker RSS {peak:6.0f} MB  identical {same_model(reference, clf)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Build the occupation -> skills index used by the recommender's fallback path.
+
+Parses data/occupationSkillRelations_en.csv once and writes
+data/occupation_skill_index.npz. The app also rebuilds the index on first
+use when the CSV is newer, so running this is only needed to prebuild it
+(e.g. in a deploy step).
+
+Usage:
+  python scripts/build_occupation_index.py [--csv PATH] [--out PATH]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.occupation_index import OccupationSkillIndex, CSV_PATH, INDEX_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--out", default=INDEX_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = OccupationSkillIndex.build(args.csv)
+    index.save(args.out)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    OccupationSkillIndex.load(args.out)
+    loaded = time.perf_counter() - start
+    print(
+        f"{len(index.occupation_labels)} occupations, {len(index.skill_labels)} skills -> {args.out} "
+        f"({os.path.getsize(args.out) / 1024:.0f} KiB); built in {built:.2f}s, loads in {loaded * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Create and seed a SQLite database for local load testing.
+
+Builds the full schema (see ``app/database/sqlite_backend.py``) and fills it
+with deterministic synthetic data: employees with managers, skills, employee
+skills and skill needs, trainings with participants, and feedback. A login
+user ``admin@example.com`` / ``admin`` is created; every employee's password
+is ``1234`` (the app's default).
+
+Usage:
+  python scripts/seed_sqlite.py data/hr_bench.db --employees 2000
+  DATABASE_URL=sqlite:///data/hr_bench.db uvicorn main:app
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database.sqlite_backend import connect, create_schema
+from app.models.auth import hash_password
+
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Finance", "HR", "Support"]
+JOB_TITLES = [
+    "software developer", "data analyst", "sales manager", "accountant",
+    "human resources officer", "marketing specialist", "support technician", "project manager",
+]
+SKILL_WORDS = [
+    "python", "sql", "negotiation", "budgeting", "recruiting", "copywriting", "networking",
+    "statistics", "leadership", "scheduling", "testing", "cloud computing", "customer service",
+]
+CATEGORIES = ["Technical", "Soft Skills", "Compliance", "Management"]
+PROFICIENCY = ["1", "2", "3", "4", "5"]
+VOTES = ["up", "down"]
+
+
+def seed(path, employees=500, skills=200, trainings=50, feedback_per_employee=3, seed_value=42, log=print):
+    """Create the schema in ``path`` and insert synthetic rows. Returns row counts per table."""
+    rng = random.Random(seed_value)
+    employee_hash = hash_password("1234")
+    today = datetime.date.today()
+
+    conn = connect(path)
+    create_schema(conn)
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "INSERT INTO users (email, hashed_password, role) VALUES (%s, %s, %s)",
+        ("admin@example.com", hash_password("admin"), "admin"),
+    )
+
+    skill_rows = [
+        (f"{rng.choice(SKILL_WORDS)} {i}", rng.choice(["skill/competence", "knowledge"]), "cross-sector", "")
+        for i in range(skills)
+    ]
+    cursor.executemany(
+        "INSERT INTO skill (preferred_label, skill_type, reuse_level, alt_labels) VALUES (%s, %s, %s, %s)",
+        skill_rows,
+    )
+
+    manager_count = max(1, employees // 10)
+    employee_rows = []
+    for i in range(employees):
+        manager_id = None if i < manager_count else rng.randint(1, manager_count)
+        employee_rows.append((
+            f"First{i}", f"Last{i}", f"employee{i}@example.com",
+            today - datetime.timedelta(days=rng.randint(30, 3650)),
+            rng.choice(DEPARTMENTS), rng.choice(JOB_TITLES), "",
+            employee_hash, "manager" if i < manager_count else "employee", manager_id,
+        ))
+    cursor.executemany(
+        "INSERT INTO employee (first_name, last_name, email, hire_date, department, job_title, details, "
+        "hashed_password, role, manager_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        employee_rows,
+    )
+
+    employee_skill_rows, skill_need_rows = [], []
+    for emp_id in range(1, employees + 1):
+        owned = rng.sample(range(1, skills + 1), k=min(skills, rng.randint(2, 8)))
+        employee_skill_rows.extend((emp_id, s, rng.choice(PROFICIENCY)) for s in owned)
+        needed = rng.sample(range(1, skills + 1), k=min(skills, 5))
+        skill_need_rows.extend((s, emp_id, rng.randint(1, 100)) for s in needed)
+    cursor.executemany(
+        "INSERT INTO employee_skill (employee_id, skill_id, proficiency_level) VALUES (%s, %s, %s)",
+        employee_skill_rows,
+    )
+    cursor.executemany(
+        "INSERT OR IGNORE INTO skill_need (skill_id, employee_id, recommendation_score) VALUES (%s, %s, %s)",
+        skill_need_rows,
+    )
+
+    training_rows = []
+    for i in range(trainings):
+        start = today + datetime.timedelta(days=rng.randint(-365, 120))
+        training_rows.append((
+            f"Training {i}", f"Synthetic training {i}",
+            start, start + datetime.timedelta(days=rng.randint(1, 30)), rng.choice(CATEGORIES),
+        ))
+    cursor.executemany(
+        "INSERT INTO training (title, description, start_date, end_date, category) VALUES (%s, %s, %s, %s, %s)",
+        training_rows,
+    )
+    employee_training_rows = [
+        (emp_id, rng.randint(1, trainings), rng.choice(["assigned", "completed"]))
+        for emp_id in range(1, employees + 1)
+        for _ in range(rng.randint(0, 3))
+    ] if trainings else []
+    cursor.executemany(
+        "INSERT INTO employee_training (employee_id, training_id, status) VALUES (%s, %s, %s)",
+        employee_training_rows,
+    )
+
+    feedback_rows = [
+        (emp_id, today - datetime.timedelta(days=rng.randint(0, 365)), round(rng.uniform(-1, 1), 3), "Synthetic feedback")
+        for emp_id in range(1, employees + 1)
+        for _ in range(feedback_per_employee)
+    ]
+    cursor.executemany(
+        "INSERT INTO feedback (employee_id, feedback_date, sentiment_score, comments) VALUES (%s, %s, %s, %s)",
+        feedback_rows,
+    )
+    skill_feedback_rows = [
+        (emp_id, rng.randint(1, skills), rng.choice(VOTES))
+        for emp_id in range(1, employees + 1, 4)
+    ] if skills else []
+    cursor.executemany(
+        "INSERT INTO skill_feedback (employee_id, skill_id, vote) VALUES (%s, %s, %s)",
+        skill_feedback_rows,
+    )
+    conn.commit()
+
+    counts = {}
+    for table in ("users", "employee", "skill", "employee_skill", "skill_need", "training",
+                  "employee_training", "feedback", "skill_feedback"):
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    conn.close()
+    for table, n in counts.items():
+        log(f"{table:18s} {n:8d}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="SQLite database file to create")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--trainings", type=int, default=50)
+    parser.add_argument("--feedback-per-employee", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="overwrite an existing database file")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        if not args.force:
+            parser.error(f"{args.path} exists; pass --force to overwrite")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+    seed(args.path, args.employees, args.skills, args.trainings, args.feedback_per_employee, args.seed)
+    print(f"Seeded {args.path}. Run the API with DATABASE_URL=sqlite:///{args.path}")
+
+
+if __name__ == "__main__":
+    main()